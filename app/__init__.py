@@ -4,6 +4,7 @@ Assembles middleware, static files, and all route modules.
 """
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,7 +12,10 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from app.config import CORS_ORIGINS, APP_TITLE, APP_VERSION, STATIC_DIR, LOG_LEVEL
-from app.routes import sorting, graph, health
+from app.routes import sorting, graph, health, traces, jobs, play
+from app.services.executor import warm_process_pool, shutdown_process_pool, solve_executor
+from app.services.jobs import job_manager
+from app.services.playback import shutdown_race_pool
 
 # --- Logging ---
 logging.basicConfig(
@@ -21,8 +25,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# --- Lifespan ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Inline deployments run time trials and sweeps inline too, so they need no pool
+    if solve_executor.kind != "inline":
+        warm_process_pool()
+    yield
+    job_manager.shutdown()
+    shutdown_race_pool()
+    solve_executor.shutdown()
+    shutdown_process_pool()
+
+
 # --- App ---
-app = FastAPI(title=APP_TITLE, version=APP_VERSION)
+app = FastAPI(title=APP_TITLE, version=APP_VERSION, lifespan=lifespan)
 
 # --- CORS ---
 app.add_middleware(
@@ -37,6 +54,9 @@ app.add_middleware(
 app.include_router(sorting.router)
 app.include_router(graph.router)
 app.include_router(health.router)
+app.include_router(traces.router)
+app.include_router(jobs.router)
+app.include_router(play.router)
 
 
 # --- Static file serving ---
@@ -0,0 +1,265 @@
+"""
+Compact binary trace encoding (media type application/x-trace).
+
+Layout, little-endian:
+
+    b"VTR1" | u32 meta length | meta (UTF-8 JSON) | columns
+
+`meta` carries the response fields other than the steps, the string table
+(step types, descriptions and graph node labels are stored as indices into
+it) and the column directory: name, dtype and length of each packed column,
+in the order they follow. Every column starts on an 8-byte boundary.
+
+Sort descriptions follow the request's verbosity: a `description` column of
+formatted strings (full), `template` plus `params` columns (summary), or
+nothing (none).
+
+Variable-length step fields (indices, writes, params, node and edge lists) use a
+`<field>_offsets` column of steps + 1 entries into a flat values column, and
+a per-step `present` bitmask records which optional fields a step has.
+"""
+
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Tuple
+
+from app.algorithms.descriptions import render
+from app.algorithms.trace import RANGE_TYPES, Trace, range_fields
+
+TRACE_MEDIA_TYPE = "application/x-trace"
+MAGIC = b"VTR1"
+
+# dtype name -> array typecode
+DTYPES = {"u8": "B", "u32": "I", "i32": "i", "f64": "d"}
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+# Graph step fields by shape; the bit of each field in `present` is its position here
+GRAPH_FIELDS: List[Tuple[str, str]] = [
+    ("current", "node"), ("neighbor", "node"), ("from_node", "node"), ("target", "node"),
+    ("weight", "number"), ("total_weight", "number"), ("final_distance", "number"), ("coalesced", "number"),
+    ("visited", "nodes"), ("queue", "nodes"), ("path", "nodes"),
+    ("edges", "edges"), ("mst_edges", "edges"), ("path_edges", "edges"),
+    ("distances", "distances"),
+    # Delta-format changes (see app.algorithms.graph_trace)
+    ("queue_pop", "number"), ("visited_add", "nodes"), ("queue_push", "nodes"), ("mst_add", "edges"),
+    ("distances_set", "distances"),
+    # Depth-first extras
+    ("depth_limit", "number"), ("pre_order", "distances"), ("post_order", "distances"),
+    # Targeted searches; direction ("forward" / "backward") goes through the string table like a node label
+    ("settled", "number"), ("direction", "node"),
+]
+GRAPH_FIELD_BITS = {name: 1 << bit for bit, (name, _) in enumerate(GRAPH_FIELDS)}
+NO_NODE = -1
+
+
+class _Writer:
+    """String table plus named typed columns."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.columns: Dict[str, array] = {}
+        self.dtypes: Dict[str, str] = {}
+
+    def string(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def column(self, name: str, dtype: str) -> array:
+        if name not in self.columns:
+            self.columns[name] = array(DTYPES[dtype])
+            self.dtypes[name] = dtype
+        return self.columns[name]
+
+    def add(self, name: str, dtype: str, values) -> array:
+        """Whole column at once; arrays already of the right type are used as-is."""
+        typecode = DTYPES[dtype]
+        column = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+        self.columns[name] = column
+        self.dtypes[name] = dtype
+        return column
+
+    def values(self, name: str, values) -> array:
+        """Integer column that widens to f64 if any value does not fit in an int32."""
+        fits = not values or (min(values) >= INT32_MIN and max(values) <= INT32_MAX)
+        return self.add(name, "i32" if fits else "f64", values)
+
+    def encode(self, meta: Dict[str, Any]) -> bytes:
+        meta = {
+            **meta,
+            "strings": self.strings,
+            "columns": [{"name": n, "dtype": self.dtypes[n], "length": len(c)} for n, c in self.columns.items()],
+        }
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        parts = [MAGIC, struct.pack("<I", len(meta_bytes)), meta_bytes]
+        size = 8 + len(meta_bytes)
+        for column in self.columns.values():
+            parts.append(b"\0" * (-size % 8))
+            size += -size % 8
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            data = column.tobytes()
+            parts.append(data)
+            size += len(data)
+        return b"".join(parts)
+
+
+def encode_sort_trace(trace: Trace, meta: Dict[str, Any], verbosity: str = "full") -> bytes:
+    """Encode a recorded sort straight from its columns; clients replay writes from `initial`."""
+    w = _Writer()
+    # Step types go first in the string table, so op codes are already string indices
+    for step_type in trace.types:
+        w.string(step_type)
+    w.add("type", "u8", trace.ops)
+    if verbosity == "full":
+        w.add("description", "u32", [w.string(render(trace.description(i))) for i in range(len(trace))])
+    elif verbosity == "summary":
+        templates = [w.string(template) for template in trace.templates]
+        w.add("template", "u32", [templates[t] for t in trace.template_ops])
+        w.add("params_offsets", "u32", trace.param_offsets)
+        w.values("params", trace.params)
+    w.add("level", "i32", trace.levels)
+    w.add("level_key", "u8", trace.level_keys)
+    w.add("indices_offsets", "u32", trace.index_offsets)
+    w.add("writes_offsets", "u32", trace.write_offsets)
+    w.add("indices", "i32", trace.indices)
+    w.add("write_index", "i32", trace.write_index)
+    w.values("write_value", trace.write_value)
+    w.values("initial", trace.initial)
+    if trace.spans is not None:
+        w.add("spans", "u32", trace.spans)
+
+    meta = {k: v for k, v in meta.items() if k not in ("steps", "initial")}
+    meta.update(kind="sort", steps=len(trace), level_keys=list(Trace.LEVEL_KEYS), verbosity=verbosity)
+    return w.encode(meta)
+
+
+def encode_graph_trace(result: Dict[str, Any]) -> bytes:
+    w = _Writer()
+    steps = result["steps"]
+    types = w.column("type", "u32")
+    descriptions = w.column("description", "u32")
+    present = w.column("present", "u32")
+    for name, shape in GRAPH_FIELDS:
+        if shape == "node":
+            w.column(name, "i32")
+        elif shape == "number":
+            w.column(name, "f64")
+        else:
+            w.column(f"{name}_offsets", "u32").append(0)
+            w.column(name, "i32")
+            if shape == "distances":
+                w.column(f"{name}_values", "f64")
+
+    def node(label):
+        return NO_NODE if label is None else w.string(label)
+
+    for step in steps:
+        unknown = set(step) - GRAPH_FIELD_BITS.keys() - {"type", "description"}
+        if unknown:
+            raise ValueError(f"Graph step fields without a binary encoding: {sorted(unknown)}")
+        types.append(w.string(step["type"]))
+        descriptions.append(w.string(step.get("description", "")))
+        mask = 0
+        for name, shape in GRAPH_FIELDS:
+            value = step.get(name)
+            if name in step:
+                mask |= GRAPH_FIELD_BITS[name]
+            if shape == "node":
+                w.columns[name].append(node(value))
+            elif shape == "number":
+                w.columns[name].append(math.nan if value is None else float(value))
+            else:
+                column = w.columns[name]
+                if shape == "nodes":
+                    column.extend(node(label) for label in value or ())
+                elif shape == "edges":
+                    for edge in value or ():
+                        if len(edge) != 2:
+                            raise ValueError(f"Edges in '{name}' must be node pairs")
+                        column.extend((node(edge[0]), node(edge[1])))
+                else:
+                    for label, distance in (value or {}).items():
+                        column.append(node(label))
+                        w.columns[f"{name}_values"].append(math.inf if distance == "∞" else float(distance))
+                w.columns[f"{name}_offsets"].append(len(column) // (2 if shape == "edges" else 1))
+        present.append(mask)
+
+    meta = {k: v for k, v in result.items() if k != "steps"}
+    meta.update(kind="graph", steps=len(steps), fields=[list(field) for field in GRAPH_FIELDS])
+    return w.encode(meta)
+
+
+def decode_trace(data: bytes) -> Tuple[Dict[str, Any], Dict[str, array]]:
+    """Split an encoded trace into its meta and typed columns."""
+    magic, meta_length = struct.unpack_from("<4sI", data)
+    if magic != MAGIC:
+        raise ValueError("Not a binary trace")
+    meta = json.loads(data[8:8 + meta_length])
+    offset = 8 + meta_length
+    columns = {}
+    for spec in meta["columns"]:
+        offset += -offset % 8
+        column = array(DTYPES[spec["dtype"]])
+        size = spec["length"] * column.itemsize
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns[spec["name"]] = column
+        offset += size
+    return meta, columns
+
+
+def decode_steps(data: bytes) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Rebuild step dicts from a binary trace (sort steps come back without keyframes)."""
+    meta, c = decode_trace(data)
+    strings = meta["strings"]
+    steps = []
+    for i in range(meta["steps"]):
+        step = {"type": strings[c["type"][i]]}
+        if "description" in c:
+            step["description"] = strings[c["description"][i]]
+        elif "template" in c:
+            step["template"] = strings[c["template"][i]]
+            step["params"] = [int(p) for p in c["params"][c["params_offsets"][i]:c["params_offsets"][i + 1]]]
+        if meta["kind"] == "sort":
+            if c["level_key"][i]:
+                step[meta["level_keys"][c["level_key"][i] - 1]] = c["level"][i]
+            if "spans" in c and c["spans"][i] > 1:
+                step["coalesced"] = c["spans"][i]
+            indices = list(c["indices"][c["indices_offsets"][i]:c["indices_offsets"][i + 1]])
+            if step["type"] in RANGE_TYPES:
+                step.update(range_fields(indices))
+                indices = [indices[2]]
+            step["indices"] = indices
+            lo, hi = c["writes_offsets"][i], c["writes_offsets"][i + 1]
+            step["writes"] = [[c["write_index"][k], c["write_value"][k]] for k in range(lo, hi)]
+        else:
+            mask = c["present"][i]
+            for bit, (name, shape) in enumerate(meta["fields"]):
+                if not mask & (1 << bit):
+                    continue
+                if shape == "node":
+                    step[name] = None if c[name][i] == NO_NODE else strings[c[name][i]]
+                elif shape == "number":
+                    step[name] = c[name][i]
+                else:
+                    lo, hi = c[f"{name}_offsets"][i], c[f"{name}_offsets"][i + 1]
+                    if shape == "nodes":
+                        step[name] = [strings[k] for k in c[name][lo:hi]]
+                    elif shape == "edges":
+                        step[name] = [[strings[c[name][2 * k]], strings[c[name][2 * k + 1]]] for k in range(lo, hi)]
+                    else:
+                        step[name] = {
+                            strings[c[name][k]]: "∞" if math.isinf(c[f"{name}_values"][k]) else c[f"{name}_values"][k]
+                            for k in range(lo, hi)
+                        }
+        steps.append(step)
+    return meta, steps
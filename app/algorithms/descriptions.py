@@ -0,0 +1,63 @@
+"""
+Step description templates.
+Sorting events describe themselves as (template id, *params) with integer
+params instead of a formatted string, so nothing is formatted unless a
+response asks for it. Clients can fetch DESCRIPTION_TEMPLATES once and
+format descriptions themselves (verbosity "summary").
+"""
+
+from typing import Any, Dict, Tuple
+
+# none: no descriptions, summary: template id + params, full: formatted strings
+VERBOSITIES = ("none", "summary", "full")
+
+Description = Tuple[Any, ...]
+
+DESCRIPTION_TEMPLATES: Dict[str, str] = {
+    # Bubble
+    "compare_adjacent": "Comparing {0} and {1} at positions {2} and {3}",
+    "swapped": "Swapped {0} and {1}",
+    "final_position": "Element {0} is now in final position {1}",
+    "bubble_pass": "Pass {0}: bubbled {1} up through positions 0–{2} ({3} swaps)",
+    "bubble_done": "Bubble sort completed!",
+    # Selection
+    "find_minimum": "Finding minimum from position {0} onwards",
+    "compare_minimum": "Current min {0} vs {1}",
+    "minimum_scan": "Scanned positions {0}–{1}: minimum {2} at position {3}",
+    "swapped_minimum": "Swapped minimum {0} to position {1}",
+    "final_place": "Position {0} now has {1} in final place",
+    "selection_done": "Selection sort completed!",
+    # Insertion
+    "inserting": "Inserting {0} into sorted portion",
+    "shifting": "{0} > {1}, shifting right",
+    "inserted": "Inserted {0} at position {1}",
+    "insertion_done": "Insertion sort completed!",
+    # Merge and counting
+    "merging": "Merging subarrays [{0}..{1}] and [{2}..{3}]",
+    "placed": "Placed {0} at position {1}",
+    "merge_done": "Merge sort completed!",
+    "counting_done": "Counting sort completed!",
+    # Quick
+    "pivot_selected": "Pivot selected: {0}",
+    "compare_pivot": "Comparing {0} with pivot {1}",
+    "pivot_placed": "Pivot {0} in final position {1}",
+    "quick_done": "Quick sort completed!",
+    # Heap
+    "heapify_swap": "Heapifying: swapped {0} and {1}",
+    "extracted": "Extracted {0} to position {1}",
+    "heap_done": "Heap sort completed!",
+}
+
+
+def render(description: Description) -> str:
+    return DESCRIPTION_TEMPLATES[description[0]].format(*description[1:])
+
+
+def describe(step: Dict[str, Any], description: Description, verbosity: str = "full") -> Dict[str, Any]:
+    """Add the description fields for `verbosity` to a step dict."""
+    if verbosity == "full":
+        step["description"] = render(description)
+    elif verbosity == "summary":
+        step["template"] = description[0]
+        step["params"] = list(description[1:])
+    return step
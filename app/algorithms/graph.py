@@ -1,317 +1,833 @@
 """
 Graph Algorithms with step-by-step visualization support.
-Each algorithm returns a list of step dicts for frontend animation.
+Algorithms run on a CSRGraph (integer ids, flat adjacency arrays; see
+app.algorithms.graph_csr) and return a GraphTrace whose steps record only
+what changed, with ids mapped back to labels (see
+app.algorithms.graph_trace); given a Progress, every recorded step is also
+a cancellation checkpoint.
 """
 
-import heapq
+import math
 from collections import deque
-from typing import Dict, Any, Optional, List
+from typing import Any, Dict, List, Optional
+
+from app.algorithms.graph_csr import CSRGraph
+from app.algorithms.graph_trace import GraphTrace
+from app.algorithms.indexed_heap import priority_queue
+from app.config import GRAPH_HEAP_ARITY, GRAPH_MST_QUEUE, GRAPH_SHORTEST_PATH_QUEUE
+
+
+def _shown(distance):
+    return "∞" if distance == float('inf') else distance
+
+
+def _whole(distance):
+    return int(distance) if distance == int(distance) else distance
+
+
+def _trace_back(prev: List[int], node: int) -> List[int]:
+    """`node`, prev[node], ... up to the node whose prev is -1."""
+    chain = []
+    while node >= 0:
+        chain.append(node)
+        node = prev[node]
+    return chain
+
+
+def _path_edges(path: List[str]) -> List[List[str]]:
+    return [[path[i], path[i + 1]] for i in range(len(path) - 1)]
+
+
+# Distance between two (x, y) node positions, per A* heuristic
+HEURISTICS = {
+    "zero": lambda a, b: 0.0,
+    "euclidean": lambda a, b: math.hypot(a[0] - b[0], a[1] - b[1]),
+    "manhattan": lambda a, b: abs(a[0] - b[0]) + abs(a[1] - b[1]),
+}
+
+
+def _heuristic_values(graph: CSRGraph, positions: Optional[Dict[str, Any]], heuristic: str,
+                      goal: int) -> List[float]:
+    """
+    Lower bounds on each node's distance to `goal`. Positions are in canvas
+    units, not weight units, so the geometric distance is scaled by the
+    smallest weight per unit length over all edges. No edge is then shorter
+    than the estimate, which keeps the heuristic consistent: A* never
+    reopens a settled node.
+    """
+    if heuristic == "zero" or goal < 0:
+        return [0.0] * len(graph)
+    metric = HEURISTICS[heuristic]
+    points = [positions[label] for label in graph.labels]
+    scale = None
+    for node in range(len(graph)):
+        for neighbor, weight in graph.neighbors(node):
+            length = metric(points[node], points[neighbor])
+            if length > 0:
+                ratio = max(weight, 0.0) / length
+                scale = ratio if scale is None or ratio < scale else scale
+    return [(scale or 0.0) * metric(point, points[goal]) for point in points]
+
+
+class _Search:
+    """One direction of a bidirectional Dijkstra: distances, tree links and queue."""
+
+    __slots__ = ("graph", "dist", "prev", "closed", "pq")
+
+    def __init__(self, graph: CSRGraph, source: int):
+        self.graph = graph
+        self.dist = [float('inf')] * len(graph)
+        self.dist[source] = 0
+        # Forward: the previous node from the start; backward: the next node towards the target
+        self.prev = [-1] * len(graph)
+        self.closed = bytearray(len(graph))
+        self.pq = priority_queue(GRAPH_SHORTEST_PATH_QUEUE, len(graph), GRAPH_HEAP_ARITY)
+        self.pq.push(source, 0)
+
+
+def _depth_first(graph: CSRGraph, source: int, steps: GraphTrace, limit: Optional[int] = None,
+                 goal: int = -1) -> Dict[str, Any]:
+    """
+    Depth-first search from `source` with an explicit stack, recording the
+    visit / explore_edge / skip / backtrack steps of the recursive version in
+    the same order, so path-shaped graphs are not bound by the recursion
+    limit. With a depth `limit`, a node at the limit is not expanded (a
+    "cutoff" step), and a node is entered again when reached by a shorter
+    path, so every node within the limit is reached. Stops once `goal` is
+    visited.
+    Returns the traversal order, pre/post-order timestamps by label, whether
+    the limit cut anything off, and the path to the goal (or None).
+    """
+    labels, offsets, targets = graph.labels, graph.offsets, graph.sorted_targets
+    # Depth each node was last entered at, -1 if never
+    depth_of = [-1] * len(graph)
+    pre: Dict[str, int] = {}
+    post: Dict[str, int] = {}
+    order: List[str] = []
+    clock = 0
+    cut_off = False
+    # Frames: [node, position of the next neighbour in its sorted row, depth]
+    stack: List[List[int]] = []
+
+    def worth_entering(neighbor, depth):
+        seen = depth_of[neighbor]
+        return seen < 0 or (limit is not None and depth + 1 < seen)
+
+    def enter(node, depth):
+        nonlocal clock, cut_off
+        label = labels[node]
+        depth_of[node] = depth
+        order.append(label)
+        pre[label] = clock
+        clock += 1
+        steps.append({
+            "type": "visit",
+            "current": label,
+            "visited_add": [label],
+            "edges": [],
+            "description": f"Visiting node {label} (depth: {len(order)})"
+        })
+        position, end = offsets[node], offsets[node + 1]
+        if limit is not None and depth >= limit:
+            if any(worth_entering(neighbor, depth) for neighbor in targets[position:end]):
+                cut_off = True
+                steps.append({
+                    "type": "cutoff",
+                    "current": label,
+                    "edges": [],
+                    "description": f"Depth limit {limit} reached at {label}; not going deeper"
+                })
+            position = end
+        stack.append([node, position, depth])
+
+    enter(source, 0)
+    while stack:
+        frame = stack[-1]
+        node, position, depth = frame
+        if node == goal:
+            break
+        label = labels[node]
+        if position < offsets[node + 1]:
+            frame[1] = position + 1
+            neighbor = targets[position]
+            neighbor_label = labels[neighbor]
+            if worth_entering(neighbor, depth):
+                steps.append({
+                    "type": "explore_edge",
+                    "current": label,
+                    "neighbor": neighbor_label,
+                    "edges": [[label, neighbor_label]],
+                    "description": f"Exploring edge {label} → {neighbor_label}"
+                })
+                enter(neighbor, depth + 1)
+            else:
+                steps.append({
+                    "type": "skip",
+                    "current": label,
+                    "neighbor": neighbor_label,
+                    "edges": [[label, neighbor_label]],
+                    "description": f"Node {neighbor_label} already visited, skipping."
+                })
+        else:
+            stack.pop()
+            post[label] = clock
+            clock += 1
+            if stack:
+                parent = labels[stack[-1][0]]
+                steps.append({
+                    "type": "backtrack",
+                    "current": parent,
+                    "edges": [],
+                    "description": f"Backtracking to node {parent}"
+                })
+
+    path = [labels[frame[0]] for frame in stack] if stack else None
+    return {"order": order, "pre": pre, "post": post, "cut_off": cut_off, "path": path}
 
 
 class GraphAlgorithms:
+    """Each algorithm takes a CSRGraph, or an adjacency dict to ingest, and a start label."""
 
     @staticmethod
-    def bfs(graph, start, directed):
-        steps = []
-        visited = set()
-        queue = deque([start])
-        visited.add(start)
+    def bfs(graph, start, directed, progress=None):
+        graph = CSRGraph.of(graph)
+        labels = graph.labels
+        steps = GraphTrace(len(graph), ("visited", "queue"), progress)
+        source = graph.ids[start]
+        visited = bytearray(len(graph))
+        queue = deque([source])
+        visited[source] = 1
         order = []
 
         steps.append({
             "type": "start",
             "current": start,
-            "visited": [start],
-            "queue": list(queue),
+            "visited_add": [start],
+            "queue_push": [start],
             "edges": [],
             "description": f"Starting BFS from node {start}. Add {start} to queue."
         })
 
         while queue:
             node = queue.popleft()
-            order.append(node)
+            label = labels[node]
+            order.append(label)
 
             steps.append({
                 "type": "visit",
-                "current": node,
-                "visited": list(visited),
-                "queue": list(queue),
+                "current": label,
+                "queue_pop": 1,
                 "edges": [],
-                "description": f"Dequeued and visiting node {node}"
+                "description": f"Dequeued and visiting node {label}"
             })
 
-            neighbors = sorted(graph.get(node, {}).keys())
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            for neighbor in graph.sorted_neighbors(node):
+                neighbor_label = labels[neighbor]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
                     queue.append(neighbor)
                     steps.append({
                         "type": "explore_edge",
-                        "current": node,
-                        "neighbor": neighbor,
-                        "visited": list(visited),
-                        "queue": list(queue),
-                        "edges": [[node, neighbor]],
-                        "description": f"Discovered {neighbor} via {node} → {neighbor}. Added to queue."
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "visited_add": [neighbor_label],
+                        "queue_push": [neighbor_label],
+                        "edges": [[label, neighbor_label]],
+                        "description": f"Discovered {neighbor_label} via {label} → {neighbor_label}. Added to queue."
                     })
                 else:
                     steps.append({
                         "type": "skip",
-                        "current": node,
-                        "neighbor": neighbor,
-                        "visited": list(visited),
-                        "queue": list(queue),
-                        "edges": [[node, neighbor]],
-                        "description": f"Node {neighbor} already visited, skipping."
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "edges": [[label, neighbor_label]],
+                        "description": f"Node {neighbor_label} already visited, skipping."
                     })
 
         steps.append({
             "type": "done",
-            "visited": list(visited),
             "description": f"BFS complete! Traversal order: {' → '.join(order)}"
         })
         return steps
 
     @staticmethod
-    def dfs(graph, start, directed):
-        steps = []
-        visited = set()
-        order = []
+    def dfs(graph, start, directed, depth_limit=None, progress=None):
+        graph = CSRGraph.of(graph)
+        steps = GraphTrace(len(graph), ("visited",), progress)
 
         steps.append({
             "type": "start",
             "current": start,
-            "visited": [],
             "edges": [],
             "description": f"Starting DFS from node {start}"
+                           + (f" with depth limit {depth_limit}" if depth_limit is not None else "")
         })
 
-        def dfs_helper(node):
-            visited.add(node)
-            order.append(node)
+        search = _depth_first(graph, graph.ids[start], steps, depth_limit)
 
-            steps.append({
-                "type": "visit",
-                "current": node,
-                "visited": list(visited),
-                "edges": [],
-                "description": f"Visiting node {node} (depth: {len(order)})"
-            })
-
-            neighbors = sorted(graph.get(node, {}).keys())
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    steps.append({
-                        "type": "explore_edge",
-                        "current": node,
-                        "neighbor": neighbor,
-                        "visited": list(visited),
-                        "edges": [[node, neighbor]],
-                        "description": f"Exploring edge {node} → {neighbor}"
-                    })
-                    dfs_helper(neighbor)
-                    steps.append({
-                        "type": "backtrack",
-                        "current": node,
-                        "visited": list(visited),
-                        "edges": [],
-                        "description": f"Backtracking to node {node}"
-                    })
-                else:
-                    steps.append({
-                        "type": "skip",
-                        "current": node,
-                        "neighbor": neighbor,
-                        "visited": list(visited),
-                        "edges": [[node, neighbor]],
-                        "description": f"Node {neighbor} already visited, skipping."
-                    })
+        cut_note = f" (depth limit {depth_limit} cut some branches off)" if search["cut_off"] else ""
+        steps.append({
+            "type": "done",
+            "pre_order": search["pre"],
+            "post_order": search["post"],
+            "description": f"DFS complete! Traversal order: {' → '.join(search['order'])}{cut_note}"
+        })
+        return steps
 
-        dfs_helper(start)
+    @staticmethod
+    def iddfs(graph, start, directed, target=None, depth_limit=None, progress=None):
+        """
+        Depth-limited DFS rounds with limits 0, 1, 2, ... until the target is
+        found, or a round cuts nothing off or reaches no node the previous
+        one missed. A round reaches exactly the nodes within its limit, so
+        the rounds stop one past the start's eccentricity.
+        """
+        graph = CSRGraph.of(graph)
+        steps = GraphTrace(len(graph), ("visited",), progress)
+        source = graph.ids[start]
+        goal = graph.ids.get(target, -1) if target else -1
+        # No simple path is longer than V - 1 edges, so the last round never cuts anything off
+        max_depth = len(graph) - 1 if depth_limit is None else depth_limit
 
+        target_msg = f" to target {target}" if target else ""
         steps.append({
-            "type": "done",
-            "visited": list(visited),
-            "description": f"DFS complete! Traversal order: {' → '.join(order)}"
+            "type": "start",
+            "current": start,
+            "edges": [],
+            "description": f"Starting iterative deepening DFS from node {start}{target_msg}"
         })
+
+        limit = 0
+        reached = -1
+        while True:
+            steps.append({
+                "type": "deepen",
+                "current": start,
+                "depth_limit": limit,
+                # Each round starts over with nothing visited
+                "visited": [],
+                "edges": [],
+                "description": f"Depth limit {limit}: restarting DFS from {start}"
+            })
+            search = _depth_first(graph, source, steps, limit, goal)
+            done = {"type": "done", "depth_limit": limit, "pre_order": search["pre"], "post_order": search["post"]}
+
+            if search["path"]:
+                path = search["path"]
+                steps.append({
+                    **done,
+                    "path": path,
+                    "path_edges": [[path[i], path[i + 1]] for i in range(len(path) - 1)],
+                    "target": target,
+                    "description": f"✅ Found {target} at depth {len(path) - 1}: {' → '.join(path)}"
+                })
+                return steps
+            # Nothing new within this limit: every reachable node is within the previous one
+            exhausted = not search["cut_off"] or len(search["pre"]) == reached
+            if exhausted or limit >= max_depth:
+                break
+            reached = len(search["pre"])
+            limit += 1
+
+        if not exhausted:
+            outcome = f"Stopped at depth limit {limit}" + (f" without reaching {target}" if target else "")
+        elif target:
+            outcome = f"❌ Target {target} is unreachable from {start}"
+        else:
+            outcome = f"IDDFS complete at depth limit {limit}! Traversal order: {' → '.join(search['order'])}"
+        steps.append({**done, **({"target": target} if target else {}), "description": outcome + "."})
         return steps
 
     @staticmethod
-    def dijkstra(graph, start, directed, target=None):
-        steps = []
-        dist = {node: float('inf') for node in graph}
-        dist[start] = 0
-        visited = set()
-        prev = {}
-        pq = [(0, start)]
+    def dijkstra(graph, start, directed, target=None, progress=None, queue=GRAPH_SHORTEST_PATH_QUEUE,
+                 arity=GRAPH_HEAP_ARITY):
+        graph = CSRGraph.of(graph)
+        labels = graph.labels
+        steps = GraphTrace(len(graph), ("distances", "visited"), progress)
+        source = graph.ids[start]
+        # Ids follow label order, so heap ties break as they would on labels
+        goal = graph.ids.get(target) if target else None
+        dist = [float('inf')] * len(graph)
+        dist[source] = 0
+        visited = bytearray(len(graph))
+        prev = [-1] * len(graph)
+        pq = priority_queue(queue, len(graph), arity)
+        pq.push(source, 0)
+        settled = 0
 
         target_msg = f" to target {target}" if target else ""
         steps.append({
             "type": "start",
             "current": start,
-            "distances": {k: v if v != float('inf') else "∞" for k, v in dist.items()},
-            "visited": [],
+            "distances_set": {labels[v]: _shown(dist[v]) for v in graph.order},
             "edges": [],
             "description": f"Starting Dijkstra from node {start}{target_msg}. Distance to {start} = 0, all others = ∞"
         })
 
         while pq:
-            d, node = heapq.heappop(pq)
-            if node in visited:
-                continue
-
-            visited.add(node)
+            d, node = pq.pop()
+            visited[node] = 1
+            settled += 1
+            label = labels[node]
             steps.append({
                 "type": "visit",
-                "current": node,
-                "distances": {k: v if v != float('inf') else "∞" for k, v in dist.items()},
-                "visited": list(visited),
-                "edges": [[prev.get(node), node]] if node in prev else [],
-                "description": f"Visiting node {node} with distance {d}"
+                "current": label,
+                "visited_add": [label],
+                "edges": [[labels[prev[node]], label]] if prev[node] >= 0 else [],
+                "description": f"Visiting node {label} with distance {d}"
             })
 
             # Early termination if target reached
-            if target and node == target:
-                # Reconstruct path
-                path = []
-                cur = target
-                while cur is not None:
-                    path.append(cur)
-                    cur = prev.get(cur)
-                path.reverse()
-                path_edges = [[path[i], path[i+1]] for i in range(len(path)-1)]
-                final_distance = int(d) if d == int(d) else d
+            if node == goal:
+                path = [labels[v] for v in reversed(_trace_back(prev, goal))]
+                final_distance = _whole(d)
                 steps.append({
                     "type": "done",
-                    "distances": {k: v if v != float('inf') else "∞" for k, v in dist.items()},
-                    "visited": list(visited),
                     "path": path,
-                    "path_edges": path_edges,
+                    "path_edges": _path_edges(path),
                     "target": target,
                     "final_distance": final_distance,
-                    "description": f"✅ Shortest path from {start} → {target}: {' → '.join(path)} | Total distance: {final_distance}"
+                    "settled": settled,
+                    "description": f"✅ Shortest path from {start} → {target}: {' → '.join(path)} | Total distance: {final_distance} | Settled {settled} of {len(graph)} nodes"
                 })
                 return steps
 
-            neighbors = graph.get(node, {})
-            for neighbor, weight in neighbors.items():
+            for neighbor, weight in graph.neighbors(node):
+                neighbor_label = labels[neighbor]
                 new_dist = d + weight
                 steps.append({
                     "type": "explore_edge",
-                    "current": node,
-                    "neighbor": neighbor,
+                    "current": label,
+                    "neighbor": neighbor_label,
                     "weight": weight,
-                    "distances": {k: v if v != float('inf') else "∞" for k, v in dist.items()},
-                    "visited": list(visited),
-                    "edges": [[node, neighbor]],
-                    "description": f"Edge {node} → {neighbor} (weight {weight}). New distance = {d} + {weight} = {new_dist}"
+                    "edges": [[label, neighbor_label]],
+                    "description": f"Edge {label} → {neighbor_label} (weight {weight}). New distance = {d} + {weight} = {new_dist}"
                 })
 
                 if new_dist < dist[neighbor]:
                     old_dist = dist[neighbor]
                     dist[neighbor] = new_dist
                     prev[neighbor] = node
-                    heapq.heappush(pq, (new_dist, neighbor))
+                    # A settled node (only reachable through a negative weight) stays out of the queue
+                    queued = "relax"
+                    if not visited[neighbor]:
+                        queued = "relax" if pq.push_or_decrease(neighbor, new_dist) == "push" else "decrease_key"
                     steps.append({
-                        "type": "relax",
-                        "current": node,
-                        "neighbor": neighbor,
-                        "distances": {k: v if v != float('inf') else "∞" for k, v in dist.items()},
-                        "visited": list(visited),
-                        "edges": [[node, neighbor]],
-                        "description": f"Relaxed {neighbor}: {old_dist if old_dist != float('inf') else '∞'} → {new_dist}"
+                        "type": queued,
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "distances_set": {neighbor_label: new_dist},
+                        "edges": [[label, neighbor_label]],
+                        "description": f"Relaxed {neighbor_label}: {_shown(old_dist)} → {new_dist}"
+                        + (" (decrease-key in the queue)" if queued == "decrease_key" else "")
                     })
 
-        final_dist = {k: v if v != float('inf') else "∞" for k, v in dist.items()}
         if target:
             steps.append({
                 "type": "done",
-                "distances": final_dist,
-                "visited": list(visited),
                 "target": target,
+                "settled": settled,
                 "description": f"❌ Dijkstra complete! Target {target} is unreachable from {start}."
             })
         else:
-            dist_summary = ", ".join(f"{k}: {v}" for k, v in sorted(final_dist.items()))
+            dist_summary = ", ".join(f"{labels[v]}: {_shown(dist[v])}" for v in range(len(graph)))
             steps.append({
                 "type": "done",
-                "distances": final_dist,
-                "visited": list(visited),
+                "settled": settled,
                 "description": f"✅ Dijkstra complete! Shortest distances from {start} → {{ {dist_summary} }}"
             })
         return steps
 
     @staticmethod
-    def prim(graph, start, directed):
-        steps = []
-        visited = set()
-        mst_edges = []
+    def astar(graph, start, directed, target=None, heuristic=None, positions=None, progress=None):
+        graph = CSRGraph.of(graph)
+        labels = graph.labels
+        steps = GraphTrace(len(graph), ("distances", "visited"), progress)
+        source = graph.ids[start]
+        goal = graph.ids.get(target, -1) if target else -1
+        heuristic = heuristic or ("euclidean" if positions else "zero")
+        h = _heuristic_values(graph, positions, heuristic, goal)
+        # Distances are g (cost from start); the queue is keyed by f = g + h
+        dist = [float('inf')] * len(graph)
+        dist[source] = 0
+        closed = bytearray(len(graph))
+        prev = [-1] * len(graph)
+        pq = priority_queue(GRAPH_SHORTEST_PATH_QUEUE, len(graph), GRAPH_HEAP_ARITY)
+        pq.push(source, h[source])
+        settled = 0
+
+        steps.append({
+            "type": "start",
+            "current": start,
+            "distances_set": {labels[v]: _shown(dist[v]) for v in graph.order},
+            "edges": [],
+            "description": f"Starting A* from node {start}" + (f" to target {target}" if target else "")
+            + f" with the {heuristic} heuristic. g({start}) = 0, h({start}) = {round(h[source], 2)}"
+        })
+
+        while pq:
+            f, node = pq.pop()
+            closed[node] = 1
+            settled += 1
+            d = dist[node]
+            label = labels[node]
+            steps.append({
+                "type": "visit",
+                "current": label,
+                "visited_add": [label],
+                "edges": [[labels[prev[node]], label]] if prev[node] >= 0 else [],
+                "description": f"Visiting node {label}: g = {d}, h = {round(h[node], 2)}, f = {round(f, 2)}"
+            })
+
+            if node == goal:
+                path = [labels[v] for v in reversed(_trace_back(prev, goal))]
+                final_distance = _whole(d)
+                steps.append({
+                    "type": "done",
+                    "path": path,
+                    "path_edges": _path_edges(path),
+                    "target": target,
+                    "final_distance": final_distance,
+                    "settled": settled,
+                    "description": f"✅ A* path from {start} → {target}: {' → '.join(path)} | Total distance: {final_distance} | Settled {settled} of {len(graph)} nodes"
+                })
+                return steps
+
+            for neighbor, weight in graph.neighbors(node):
+                neighbor_label = labels[neighbor]
+                new_dist = d + weight
+                steps.append({
+                    "type": "explore_edge",
+                    "current": label,
+                    "neighbor": neighbor_label,
+                    "weight": weight,
+                    "edges": [[label, neighbor_label]],
+                    "description": f"Edge {label} → {neighbor_label} (weight {weight}). g = {d} + {weight} = {new_dist}, f = {round(new_dist + h[neighbor], 2)}"
+                })
+
+                if new_dist < dist[neighbor]:
+                    old_dist = dist[neighbor]
+                    dist[neighbor] = new_dist
+                    prev[neighbor] = node
+                    queued = "relax"
+                    if not closed[neighbor]:
+                        queued = "relax" if pq.push_or_decrease(neighbor, new_dist + h[neighbor]) == "push" else "decrease_key"
+                    steps.append({
+                        "type": queued,
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "distances_set": {neighbor_label: new_dist},
+                        "edges": [[label, neighbor_label]],
+                        "description": f"Relaxed {neighbor_label}: {_shown(old_dist)} → {new_dist}"
+                        + (" (decrease-key in the queue)" if queued == "decrease_key" else "")
+                    })
+
+        steps.append({
+            "type": "done",
+            "settled": settled,
+            **({"target": target} if target else {}),
+            "description": f"❌ A* complete! Target {target} is unreachable from {start}." if target
+            else f"✅ A* complete without a target (plain Dijkstra). Settled {settled} nodes."
+        })
+        return steps
+
+    @staticmethod
+    def bidirectional_dijkstra(graph, start, directed, target=None, progress=None):
+        graph = CSRGraph.of(graph)
+        if not target or target not in graph.ids:
+            return GraphAlgorithms.dijkstra(graph, start, directed, target=target, progress=progress)
+        labels = graph.labels
+        # `distances` shows the forward search; backward distances are in the step descriptions
+        steps = GraphTrace(len(graph), ("distances", "visited"), progress)
+        source, goal = graph.ids[start], graph.ids[target]
+        forward, backward = _Search(graph, source), _Search(graph.reversed(), goal)
+        # Best start → target length found so far, through the edge meet[0] → meet[1]
+        best, meet = (0, (source, goal)) if source == goal else (float('inf'), None)
+        settled = 0
+
+        steps.append({
+            "type": "start",
+            "current": start,
+            "distances_set": {labels[v]: _shown(forward.dist[v]) for v in graph.order},
+            "edges": [],
+            "description": f"Starting bidirectional Dijkstra: forward from {start}, backward from {target}"
+        })
+
+        while forward.pq and backward.pq:
+            top_forward, top_backward = forward.pq.peek()[0], backward.pq.peek()[0]
+            # Any path not yet found is at least as long as the two frontiers' radii together
+            if top_forward + top_backward >= best:
+                break
+            side, other = (forward, backward) if top_forward <= top_backward else (backward, forward)
+            direction = "forward" if side is forward else "backward"
+            d, node = side.pq.pop()
+            side.closed[node] = 1
+            settled += 1
+            label = labels[node]
+            prev_label = labels[side.prev[node]] if side.prev[node] >= 0 else None
+            steps.append({
+                "type": "visit",
+                "current": label,
+                "direction": direction,
+                "visited_add": [label],
+                "edges": [] if prev_label is None else [[prev_label, label] if side is forward else [label, prev_label]],
+                "description": f"Visiting node {label} at distance {d} " + (f"from {start}" if side is forward else f"to {target}")
+                + f" ({direction})"
+            })
+
+            for neighbor, weight in side.graph.neighbors(node):
+                neighbor_label = labels[neighbor]
+                new_dist = d + weight
+                # The graph edge itself: node → neighbor forward, neighbor → node backward
+                edge = [label, neighbor_label] if side is forward else [neighbor_label, label]
+                steps.append({
+                    "type": "explore_edge",
+                    "current": label,
+                    "neighbor": neighbor_label,
+                    "weight": weight,
+                    "direction": direction,
+                    "edges": [edge],
+                    "description": f"Edge {edge[0]} → {edge[1]} (weight {weight}). New {direction} distance = {d} + {weight} = {new_dist}"
+                })
+
+                if new_dist < side.dist[neighbor]:
+                    old_dist = side.dist[neighbor]
+                    side.dist[neighbor] = new_dist
+                    side.prev[neighbor] = node
+                    queued = "relax"
+                    if not side.closed[neighbor]:
+                        queued = "relax" if side.pq.push_or_decrease(neighbor, new_dist) == "push" else "decrease_key"
+                    steps.append({
+                        "type": queued,
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "direction": direction,
+                        **({"distances_set": {neighbor_label: new_dist}} if side is forward else {}),
+                        "edges": [edge],
+                        "description": f"Relaxed {neighbor_label} ({direction}): {_shown(old_dist)} → {new_dist}"
+                        + (" (decrease-key in the queue)" if queued == "decrease_key" else "")
+                    })
+
+                if new_dist + other.dist[neighbor] < best:
+                    best = new_dist + other.dist[neighbor]
+                    meet = (node, neighbor) if side is forward else (neighbor, node)
+                    steps.append({
+                        "type": "meet",
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "direction": direction,
+                        "edges": [edge],
+                        "description": f"Searches meet across {edge[0]} → {edge[1]}: a path of length {_whole(best)}"
+                    })
+
+        if meet is None:
+            steps.append({
+                "type": "done",
+                "target": target,
+                "settled": settled,
+                "description": f"❌ Bidirectional Dijkstra complete! Target {target} is unreachable from {start}."
+            })
+            return steps
+        path = list(reversed(_trace_back(forward.prev, meet[0])))
+        # Start and target coincide: the meeting "edge" is that one node, listed once
+        path += _trace_back(backward.prev, meet[1])[meet[0] == meet[1]:]
+        path = [labels[v] for v in path]
+        final_distance = _whole(best)
+        steps.append({
+            "type": "done",
+            "path": path,
+            "path_edges": _path_edges(path),
+            "target": target,
+            "final_distance": final_distance,
+            "settled": settled,
+            "description": f"✅ Shortest path from {start} → {target}: {' → '.join(path)} | Total distance: {final_distance} | Settled {settled} of {len(graph)} nodes"
+        })
+        return steps
+
+    @staticmethod
+    def bidirectional_bfs(graph, start, directed, target=None, progress=None):
+        graph = CSRGraph.of(graph)
+        if not target or target not in graph.ids:
+            return GraphAlgorithms.bfs(graph, start, directed, progress=progress)
+        labels = graph.labels
+        steps = GraphTrace(len(graph), ("visited",), progress)
+        source, goal = graph.ids[start], graph.ids[target]
+        # Per direction: rows to follow, nodes seen, tree links (as in _Search) and the current layer
+        rows = (graph, graph.reversed())
+        seen = (bytearray(len(graph)), bytearray(len(graph)))
+        parent = ([-1] * len(graph), [-1] * len(graph))
+        layers = [[source], [goal]]
+        seen[0][source] = seen[1][goal] = 1
+        meet = source if source == goal else -1
+        settled = 0
+
+        steps.append({
+            "type": "start",
+            "current": start,
+            "visited_add": list(dict.fromkeys([start, target])),
+            "edges": [],
+            "description": f"Starting bidirectional BFS: forward from {start}, backward from {target}"
+        })
+
+        while meet < 0 and layers[0] and layers[1]:
+            # Expand the smaller frontier by one whole layer
+            side = 0 if len(layers[0]) <= len(layers[1]) else 1
+            direction = ("forward", "backward")[side]
+            next_layer = []
+            for node in layers[side]:
+                settled += 1
+                label = labels[node]
+                steps.append({
+                    "type": "visit",
+                    "current": label,
+                    "direction": direction,
+                    "edges": [],
+                    "description": f"Expanding node {label} ({direction})"
+                })
+                for neighbor in rows[side].sorted_neighbors(node):
+                    neighbor_label = labels[neighbor]
+                    edge = [label, neighbor_label] if side == 0 else [neighbor_label, label]
+                    if seen[side][neighbor]:
+                        steps.append({
+                            "type": "skip",
+                            "current": label,
+                            "neighbor": neighbor_label,
+                            "direction": direction,
+                            "edges": [edge],
+                            "description": f"Node {neighbor_label} already reached {direction}, skipping."
+                        })
+                        continue
+                    seen[side][neighbor] = 1
+                    parent[side][neighbor] = node
+                    next_layer.append(neighbor)
+                    steps.append({
+                        "type": "explore_edge",
+                        "current": label,
+                        "neighbor": neighbor_label,
+                        "direction": direction,
+                        "visited_add": [neighbor_label],
+                        "edges": [edge],
+                        "description": f"Discovered {neighbor_label} via {edge[0]} → {edge[1]} ({direction})."
+                    })
+                    # Layers so far were disjoint, so the first node both sides reach lies on a shortest path
+                    if seen[1 - side][neighbor]:
+                        meet = neighbor
+                        steps.append({
+                            "type": "meet",
+                            "current": neighbor_label,
+                            "direction": direction,
+                            "edges": [edge],
+                            "description": f"Searches meet at {neighbor_label}"
+                        })
+                        break
+                if meet >= 0:
+                    break
+            layers[side] = next_layer
+
+        if meet < 0:
+            steps.append({
+                "type": "done",
+                "target": target,
+                "settled": settled,
+                "description": f"❌ Bidirectional BFS complete! Target {target} is unreachable from {start}."
+            })
+            return steps
+        path = list(reversed(_trace_back(parent[0], meet))) + _trace_back(parent[1], meet)[1:]
+        path = [labels[v] for v in path]
+        steps.append({
+            "type": "done",
+            "path": path,
+            "path_edges": _path_edges(path),
+            "target": target,
+            "final_distance": len(path) - 1,
+            "settled": settled,
+            "description": f"✅ Fewest-edge path from {start} → {target}: {' → '.join(path)} | {len(path) - 1} edges | Expanded {settled} of {len(graph)} nodes"
+        })
+        return steps
+
+    @staticmethod
+    def prim(graph, start, directed, progress=None, queue=GRAPH_MST_QUEUE, arity=GRAPH_HEAP_ARITY):
+        graph = CSRGraph.of(graph)
+        labels = graph.labels
+        steps = GraphTrace(len(graph), ("visited", "mst_edges"), progress)
+        visited = bytearray(len(graph))
         total_weight = 0
-        pq = [(0, start, None)]  # (weight, node, from_node)
+        # Queued nodes keyed by their cheapest known edge from the tree, which starts at `via`
+        via = [-1] * len(graph)
+        pq = priority_queue(queue, len(graph), arity)
+        pq.push(graph.ids[start], 0)
 
         steps.append({
             "type": "start",
             "current": start,
-            "visited": [],
-            "mst_edges": [],
             "edges": [],
             "description": f"Starting Prim's MST from node {start}"
         })
 
         while pq:
-            weight, node, from_node = heapq.heappop(pq)
-            if node in visited:
-                continue
-
-            visited.add(node)
+            weight, node = pq.pop()
+            visited[node] = 1
+            label = labels[node]
+            from_node = labels[via[node]] if via[node] >= 0 else None
             if from_node is not None:
-                mst_edges.append([from_node, node, weight])
                 total_weight += weight
 
             steps.append({
                 "type": "visit",
-                "current": node,
+                "current": label,
                 "from_node": from_node,
                 "weight": weight,
-                "visited": list(visited),
-                "mst_edges": [e[:2] for e in mst_edges],
-                "edges": [[from_node, node]] if from_node else [],
-                "description": f"Adding node {node} to MST" + (f" via edge {from_node}→{node} (weight {weight})" if from_node else "")
+                "visited_add": [label],
+                "mst_add": [[from_node, label]] if from_node is not None else [],
+                "edges": [[from_node, label]] if from_node else [],
+                "description": f"Adding node {label} to MST" + (f" via edge {from_node}→{label} (weight {weight})" if from_node else "")
             })
 
-            neighbors = graph.get(node, {})
-            for neighbor, w in neighbors.items():
-                if neighbor not in visited:
-                    heapq.heappush(pq, (w, neighbor, node))
-                    steps.append({
-                        "type": "explore_edge",
-                        "current": node,
-                        "neighbor": neighbor,
-                        "weight": w,
-                        "visited": list(visited),
-                        "mst_edges": [e[:2] for e in mst_edges],
-                        "edges": [[node, neighbor]],
-                        "description": f"Edge {node}→{neighbor} (weight {w}) added to priority queue"
-                    })
+            for neighbor, w in graph.neighbors(node):
+                if visited[neighbor]:
+                    continue
+                neighbor_label = labels[neighbor]
+                if neighbor not in pq:
+                    step_type = "explore_edge"
+                    description = f"Edge {label}→{neighbor_label} (weight {w}) added to priority queue"
+                    pq.push(neighbor, w)
+                    via[neighbor] = node
+                elif w < pq.key(neighbor):
+                    old_key = pq.key(neighbor)
+                    if pq.push_or_decrease(neighbor, w) == "decrease_key":
+                        step_type = "decrease_key"
+                        description = f"Edge {label}→{neighbor_label} (weight {w}) lowers {neighbor_label}'s key from {old_key} to {w}"
+                    else:
+                        # A lazy queue pushes a duplicate and leaves the old entry to go stale
+                        step_type = "explore_edge"
+                        description = f"Edge {label}→{neighbor_label} (weight {w}) is cheaper than {neighbor_label}'s key {old_key}; pushed again"
+                    via[neighbor] = node
+                else:
+                    step_type = "explore_edge"
+                    description = f"Edge {label}→{neighbor_label} (weight {w}) is no cheaper than {neighbor_label}'s key {pq.key(neighbor)}"
+                steps.append({
+                    "type": step_type,
+                    "current": label,
+                    "neighbor": neighbor_label,
+                    "weight": w,
+                    "edges": [[label, neighbor_label]],
+                    "description": description
+                })
 
         steps.append({
             "type": "done",
-            "visited": list(visited),
-            "mst_edges": [e[:2] for e in mst_edges],
             "total_weight": total_weight,
             "description": f"Prim's MST complete! Total weight: {total_weight}"
         })
         return steps
 
     @staticmethod
-    def kruskal(graph, start, directed):
-        steps = []
-        parent = {}
-        rank = {}
-
-        for node in graph:
-            parent[node] = node
-            rank[node] = 0
+    def kruskal(graph, start, directed, progress=None):
+        graph = CSRGraph.of(graph)
+        labels = graph.labels
+        steps = GraphTrace(len(graph), ("visited", "mst_edges"), progress)
+        parent = list(range(len(graph)))
+        rank = [0] * len(graph)
 
         def find(x):
             while parent[x] != x:
@@ -330,11 +846,11 @@ class GraphAlgorithms:
                 rank[ra] += 1
             return True
 
-        # Collect all edges
+        # Collect all edges; sorting ids orders equal weights by label
         edges = []
         seen = set()
-        for u in graph:
-            for v, w in graph[u].items():
+        for u in graph.order:
+            for v, w in graph.neighbors(u):
                 key = (min(u, v), max(u, v))
                 if key not in seen:
                     edges.append((w, u, v))
@@ -343,57 +859,48 @@ class GraphAlgorithms:
 
         steps.append({
             "type": "start",
-            "visited": list(graph.keys()),
-            "mst_edges": [],
+            "visited_add": [labels[node] for node in graph.order],
             "edges": [],
             "description": f"Starting Kruskal's MST. {len(edges)} edges sorted by weight."
         })
 
-        mst_edges = []
         total_weight = 0
 
         for w, u, v in edges:
+            u_label, v_label = labels[u], labels[v]
             steps.append({
                 "type": "explore_edge",
-                "current": u,
-                "neighbor": v,
+                "current": u_label,
+                "neighbor": v_label,
                 "weight": w,
-                "visited": list(graph.keys()),
-                "mst_edges": [e[:2] for e in mst_edges],
-                "edges": [[u, v]],
-                "description": f"Considering edge {u}→{v} (weight {w})"
+                "edges": [[u_label, v_label]],
+                "description": f"Considering edge {u_label}→{v_label} (weight {w})"
             })
 
             if find(u) != find(v):
                 union(u, v)
-                mst_edges.append([u, v, w])
                 total_weight += w
                 steps.append({
                     "type": "add_edge",
-                    "current": u,
-                    "neighbor": v,
+                    "current": u_label,
+                    "neighbor": v_label,
                     "weight": w,
-                    "visited": list(graph.keys()),
-                    "mst_edges": [e[:2] for e in mst_edges],
-                    "edges": [[u, v]],
-                    "description": f"Added edge {u}→{v} (weight {w}) to MST. Total: {total_weight}"
+                    "mst_add": [[u_label, v_label]],
+                    "edges": [[u_label, v_label]],
+                    "description": f"Added edge {u_label}→{v_label} (weight {w}) to MST. Total: {total_weight}"
                 })
             else:
                 steps.append({
                     "type": "reject_edge",
-                    "current": u,
-                    "neighbor": v,
+                    "current": u_label,
+                    "neighbor": v_label,
                     "weight": w,
-                    "visited": list(graph.keys()),
-                    "mst_edges": [e[:2] for e in mst_edges],
-                    "edges": [[u, v]],
-                    "description": f"Rejected edge {u}→{v} (would create cycle)"
+                    "edges": [[u_label, v_label]],
+                    "description": f"Rejected edge {u_label}→{v_label} (would create cycle)"
                 })
 
         steps.append({
             "type": "done",
-            "visited": list(graph.keys()),
-            "mst_edges": [e[:2] for e in mst_edges],
             "total_weight": total_weight,
             "description": f"Kruskal's MST complete! Total weight: {total_weight}"
         })
@@ -402,9 +909,26 @@ class GraphAlgorithms:
 
 # --- Algorithm Registry ---
 GRAPH_REGISTRY = {
-    "bfs": lambda graph, start, directed, **kw: GraphAlgorithms.bfs(graph, start, directed),
-    "dfs": lambda graph, start, directed, **kw: GraphAlgorithms.dfs(graph, start, directed),
-    "dijkstra": lambda graph, start, directed, **kw: GraphAlgorithms.dijkstra(graph, start, directed, target=kw.get("target")),
-    "prim": lambda graph, start, directed, **kw: GraphAlgorithms.prim(graph, start, directed),
-    "kruskal": lambda graph, start, directed, **kw: GraphAlgorithms.kruskal(graph, start, directed),
+    "bfs": lambda graph, start, directed, **kw: GraphAlgorithms.bfs(graph, start, directed, progress=kw.get("progress")),
+    "dfs": lambda graph, start, directed, **kw: GraphAlgorithms.dfs(
+        graph, start, directed, depth_limit=kw.get("depth_limit"), progress=kw.get("progress")),
+    "iddfs": lambda graph, start, directed, **kw: GraphAlgorithms.iddfs(
+        graph, start, directed, target=kw.get("target"), depth_limit=kw.get("depth_limit"),
+        progress=kw.get("progress")),
+    "dijkstra": lambda graph, start, directed, **kw: GraphAlgorithms.dijkstra(
+        graph, start, directed, target=kw.get("target"), progress=kw.get("progress")),
+    "astar": lambda graph, start, directed, **kw: GraphAlgorithms.astar(
+        graph, start, directed, target=kw.get("target"), heuristic=kw.get("heuristic"),
+        positions=kw.get("positions"), progress=kw.get("progress")),
+    "bidirectional_dijkstra": lambda graph, start, directed, **kw: GraphAlgorithms.bidirectional_dijkstra(
+        graph, start, directed, target=kw.get("target"), progress=kw.get("progress")),
+    "bidirectional_bfs": lambda graph, start, directed, **kw: GraphAlgorithms.bidirectional_bfs(
+        graph, start, directed, target=kw.get("target"), progress=kw.get("progress")),
+    "prim": lambda graph, start, directed, **kw: GraphAlgorithms.prim(graph, start, directed, progress=kw.get("progress")),
+    "kruskal": lambda graph, start, directed, **kw: GraphAlgorithms.kruskal(graph, start, directed, progress=kw.get("progress")),
 }
+
+# Algorithms that take a depth_limit
+DEPTH_LIMITED = ("dfs", "iddfs")
+# Point-to-point searches, which need a target
+TARGETED = ("astar", "bidirectional_dijkstra", "bidirectional_bfs")
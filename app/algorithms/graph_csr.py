@@ -0,0 +1,80 @@
+"""
+Compressed sparse row graphs for the graph engine.
+Request graphs arrive as {label: {neighbour label: weight}} dicts. A
+CSRGraph ingests one once: labels get dense integer ids, and adjacency
+becomes flat `array` columns — row offsets, target ids and float weights in
+the request's neighbour order, plus each row's targets pre-sorted for the
+traversals that visit neighbours in label order. Ids follow sorted label
+order, so comparing ids (heap ties, edge sorting) orders nodes exactly as
+comparing labels does. Algorithms run on ids and turn them back into labels
+only when they record a step.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, Tuple, Union
+
+
+class CSRGraph:
+
+    __slots__ = ("labels", "ids", "order", "offsets", "targets", "weights", "sorted_targets")
+
+    def __init__(self, adjacency: Dict[str, Dict[str, Any]]):
+        # Adjacency keys, then nodes only named as neighbours, in first-seen order
+        seen = dict.fromkeys(adjacency)
+        for neighbours in adjacency.values():
+            seen.update(dict.fromkeys(neighbours))
+        self.labels = sorted(seen)
+        self.ids = {label: node for node, label in enumerate(self.labels)}
+        self.order = array("i", (self.ids[label] for label in seen))
+
+        rows = [None] * len(self.labels)
+        for label, neighbours in adjacency.items():
+            rows[self.ids[label]] = neighbours
+        self.offsets = array("I", [0])
+        self.targets = array("i")
+        self.weights = array("d")
+        self.sorted_targets = array("i")
+        lookup = self.ids.__getitem__
+        for neighbours in rows:
+            if neighbours:
+                row = list(map(lookup, neighbours))
+                self.targets.extend(row)
+                self.weights.extend(map(float, neighbours.values()))
+                row.sort()
+                self.sorted_targets.extend(row)
+            self.offsets.append(len(self.targets))
+
+    @classmethod
+    def of(cls, graph: Union["CSRGraph", Dict[str, Dict[str, Any]]]) -> "CSRGraph":
+        return graph if isinstance(graph, CSRGraph) else cls(graph)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def reversed(self) -> "CSRGraph":
+        """The transpose, for searching backward from a target: row v lists the edges u → v."""
+        rows = [[] for _ in self.labels]
+        for node in range(len(self.labels)):
+            for target, weight in self.neighbors(node):
+                rows[target].append((node, weight))
+        transpose = CSRGraph.__new__(CSRGraph)
+        transpose.labels, transpose.ids, transpose.order = self.labels, self.ids, self.order
+        transpose.offsets = array("I", [0])
+        transpose.targets = array("i")
+        transpose.weights = array("d")
+        transpose.sorted_targets = array("i")
+        for row in rows:
+            transpose.targets.extend(source for source, _ in row)
+            transpose.weights.extend(weight for _, weight in row)
+            transpose.sorted_targets.extend(sorted(source for source, _ in row))
+            transpose.offsets.append(len(transpose.targets))
+        return transpose
+
+    def neighbors(self, node: int) -> Iterator[Tuple[int, float]]:
+        """(target, weight) pairs in the request's order."""
+        lo, hi = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def sorted_neighbors(self, node: int) -> array:
+        """Target ids in label order."""
+        return self.sorted_targets[self.offsets[node]:self.offsets[node + 1]]
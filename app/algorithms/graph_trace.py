@@ -0,0 +1,410 @@
+"""
+Delta-recorded graph traces.
+Graph algorithms record each step with only what it changed: nodes visited
+(visited_add), queue pushes and pops (queue_push, queue_pop), distances
+updated (distances_set) and edges added to the MST (mst_add). A GraphTrace
+replays those changes into the state snapshots (visited, queue, distances,
+mst_edges) on request:
+
+- "full" steps carry every state field the algorithm keeps, as graph
+  traces always have;
+- "delta" steps carry their changes, and a snapshot instead of them every
+  keyframe_interval(V) steps and on the first step of a window, so a trace
+  grows with steps + V rather than steps × V.
+
+A client applies a delta step by replacing each state field the step
+carries, then applying its changes (see GraphState.apply). Besides
+keyframes, a step may carry a state field to reset it, as iterative
+deepening does between rounds. Steps are stored in typed columns, like
+app.algorithms.trace.Trace, and rebuilt as dicts when read.
+"""
+
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.algorithms.progress import Progress
+from app.algorithms.trace import GRAPH_DROP_ORDER, keyframe_interval, plan_frames
+
+STATE_FIELDS = ("visited", "queue", "distances", "mst_edges")
+DELTA_FIELDS = frozenset({"visited_add", "queue_push", "queue_pop", "distances_set", "mst_add"})
+
+
+class GraphState:
+    """Visited set, queue, distances and MST edges, replayed step by step."""
+
+    __slots__ = STATE_FIELDS
+
+    def __init__(self):
+        # Insertion-ordered, so snapshots list nodes in visiting order
+        self.visited: Dict[str, None] = {}
+        self.queue: deque = deque()
+        self.distances: Dict[str, Any] = {}
+        self.mst_edges: List[List[str]] = []
+
+    def copy(self) -> "GraphState":
+        state = GraphState()
+        state.visited = dict(self.visited)
+        state.queue = deque(self.queue)
+        state.distances = dict(self.distances)
+        state.mst_edges = list(self.mst_edges)
+        return state
+
+    def apply(self, step: Dict[str, Any]):
+        """Snapshot fields replace that part of the state, then the step's changes are applied."""
+        if "visited" in step:
+            self.visited = dict.fromkeys(step["visited"])
+        if "queue" in step:
+            self.queue = deque(step["queue"])
+        if "distances" in step:
+            self.distances = dict(step["distances"])
+        if "mst_edges" in step:
+            self.mst_edges = [list(edge) for edge in step["mst_edges"]]
+        self.visited.update(dict.fromkeys(step.get("visited_add", ())))
+        # Pushes before pops: the queue is FIFO, so folded steps (see select) replay the same
+        self.queue.extend(step.get("queue_push", ()))
+        for _ in range(step.get("queue_pop", 0)):
+            self.queue.popleft()
+        self.distances.update(step.get("distances_set", ()))
+        self.mst_edges.extend(step.get("mst_add", ()))
+
+    def snapshot(self, fields: Tuple[str, ...]) -> Dict[str, Any]:
+        views = {
+            "visited": lambda: list(self.visited),
+            "queue": lambda: list(self.queue),
+            "distances": lambda: dict(self.distances),
+            "mst_edges": lambda: [list(edge) for edge in self.mst_edges],
+        }
+        return {field: views[field]() for field in fields}
+
+
+# Changes that a snapshot of each state field supersedes
+SUPERSEDED = {
+    "visited": ("visited_add",),
+    "queue": ("queue_push", "queue_pop"),
+    "distances": ("distances_set",),
+    "mst_edges": ("mst_add",),
+}
+
+
+def fold_changes(into: Dict[str, Any], step: Dict[str, Any]):
+    """Add the changes of `step` to those already collected in `into`."""
+    for field, changes in SUPERSEDED.items():
+        # A step that resets a field (see iddfs) drops the changes before it
+        if field in step:
+            into[field] = step[field]
+            for change in changes:
+                into.pop(change, None)
+    for field in ("visited_add", "queue_push", "mst_add"):
+        if field in step:
+            into[field] = into.get(field, []) + list(step[field])
+    if "queue_pop" in step:
+        into["queue_pop"] = into.get("queue_pop", 0) + step["queue_pop"]
+    if "distances_set" in step:
+        into["distances_set"] = {**into.get("distances_set", {}), **step["distances_set"]}
+
+
+# How step keys are encoded into a step's run of the `ids` column; other keys are stored as given.
+# DIRECTION: a tag code. NODE: a label id. NODES: count, then label ids. EDGES: count, then two ids per
+# edge. COUNT: the value itself. DISTANCES: count, then label ids, with values in the number columns.
+# WEIGHT: nothing in `ids`, one entry in the number columns.
+DIRECTION, NODE, NODES, EDGES, COUNT, DISTANCES, WEIGHT, TYPE, DESCRIPTION, OTHER = range(10)
+KEY_FORMS = {
+    "type": TYPE, "description": DESCRIPTION,
+    "direction": DIRECTION,
+    "current": NODE, "neighbor": NODE, "from_node": NODE, "target": NODE,
+    "visited_add": NODES, "queue_push": NODES,
+    "edges": EDGES, "mst_add": EDGES,
+    "queue_pop": COUNT,
+    "distances_set": DISTANCES,
+    "weight": WEIGHT,
+}
+# Number kinds, so values replay with the type they were recorded with
+FLOAT, INT, SHOWN_INFINITY = 0, 1, 2
+INFINITY = "∞"
+LARGEST_EXACT = 2 ** 53
+LARGEST_ID = 2 ** 31 - 1
+
+
+def _number_kind(value) -> int:
+    """Kind of a value the number column holds exactly, or -1."""
+    if type(value) is float:
+        return FLOAT
+    if type(value) is int and -LARGEST_EXACT <= value <= LARGEST_EXACT:
+        return INT
+    return SHOWN_INFINITY if value == INFINITY else -1
+
+
+def _shown_number(value: float, kind: int):
+    if kind == SHOWN_INFINITY:
+        return INFINITY
+    return int(value) if kind == INT else value
+
+
+def _is_edge(edge) -> bool:
+    return type(edge) is list and len(edge) == 2 and type(edge[0]) is str and type(edge[1]) is str
+
+
+class GraphTrace:
+    """
+    Columnar recording of a graph run, as recorded (changes only).
+    Each appended step dict becomes an op code, a run of int32 ids (node
+    labels, tags and counts, see KEY_FORMS) and a run of float64 numbers
+    with their kinds (distances, edge weights), with labels, tags and each
+    step's key order interned once; descriptions are kept as strings. Keys
+    outside KEY_FORMS, mostly on start and done steps, go in a sparse
+    per-step dict. record(i) rebuilds step i exactly. Iterating or
+    indexing gives full steps, like the step lists graph algorithms used
+    to return; iter_steps/steps serve either format. Given a Progress,
+    every append is a cancellation checkpoint.
+    """
+
+    __slots__ = (
+        "fields", "interval", "progress", "types", "_op_codes", "ops", "tags", "_tag_codes", "labels",
+        "_label_codes", "id_offsets", "ids", "number_offsets", "numbers", "kinds", "descriptions",
+        "layouts", "layout_forms", "_layout_codes", "layout_ops", "extras", "_checkpoints",
+    )
+
+    def __init__(self, nodes: int, fields: Tuple[str, ...], progress: Optional[Progress] = None):
+        # State fields this algorithm keeps, snapshotted on full steps and keyframes
+        self.fields = fields
+        self.interval = keyframe_interval(nodes)
+        self.progress = progress
+        self.types: List[str] = []
+        self._op_codes: Dict[str, int] = {}
+        self.ops = array("B")
+        self.tags: List[str] = []
+        self._tag_codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        self.id_offsets = array("I", [0])
+        self.ids = array("i")
+        self.number_offsets = array("I", [0])
+        self.numbers = array("d")
+        self.kinds = array("B")
+        self.descriptions: List[Optional[str]] = []
+        self.layouts: List[Tuple[str, ...]] = []
+        self.layout_forms: List[Tuple[int, ...]] = []
+        self._layout_codes: Dict[Tuple[str, ...], int] = {}
+        self.layout_ops = array("H")
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        self._checkpoints: Optional[List[GraphState]] = None
+
+    def _label(self, label: str) -> int:
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def append(self, step: Dict[str, Any]):
+        if self.progress is not None:
+            self.progress.checkpoint()
+        layout = tuple(step)
+        code = self._layout_codes.get(layout)
+        if code is None:
+            code = self._layout_codes[layout] = len(self.layouts)
+            self.layouts.append(layout)
+            self.layout_forms.append(tuple(KEY_FORMS.get(key, OTHER) for key in layout))
+        codes = self._label_codes
+        label = self._label
+        ids: List[int] = []
+        numbers: List[float] = []
+        kinds: List[int] = []
+        extra: Dict[str, Any] = {}
+        description = None
+        for key, form, value in zip(layout, self.layout_forms[code], step.values()):
+            # Node fields intern whatever they hold (labels, or None where a step has no such node)
+            if form == NODE:
+                ids.append(codes[value] if value in codes else label(value))
+            elif form == DESCRIPTION and type(value) is str:
+                description = value
+            elif form == EDGES:
+                ids.append(len(value))
+                for u, v in value:
+                    ids.append(codes[u] if u in codes else label(u))
+                    ids.append(codes[v] if v in codes else label(v))
+            elif form == NODES:
+                ids.append(len(value))
+                ids.extend(map(label, value))
+            elif form == DISTANCES and type(value) is dict and all(
+                    type(node) is str and _number_kind(distance) >= 0 for node, distance in value.items()):
+                ids.append(len(value))
+                for node, distance in value.items():
+                    ids.append(label(node))
+                    kind = _number_kind(distance)
+                    numbers.append(0.0 if kind == SHOWN_INFINITY else distance)
+                    kinds.append(kind)
+            elif form == WEIGHT and _number_kind(value) >= 0:
+                kind = _number_kind(value)
+                numbers.append(0.0 if kind == SHOWN_INFINITY else value)
+                kinds.append(kind)
+            elif form == COUNT and type(value) is int and 0 <= value <= LARGEST_ID:
+                ids.append(value)
+            elif form == DIRECTION and type(value) is str:
+                tag = self._tag_codes.get(value)
+                if tag is None:
+                    tag = self._tag_codes[value] = len(self.tags)
+                    self.tags.append(value)
+                ids.append(tag)
+            elif form != TYPE:
+                extra[key] = value
+
+        step_type = step["type"]
+        op = self._op_codes.get(step_type)
+        if op is None:
+            op = self._op_codes[step_type] = len(self.types)
+            self.types.append(step_type)
+        if extra:
+            self.extras[len(self.ops)] = extra
+        self.ops.append(op)
+        self.layout_ops.append(code)
+        if ids:
+            self.ids.extend(ids)
+        self.id_offsets.append(len(self.ids))
+        if numbers:
+            self.numbers.extend(numbers)
+            self.kinds.extend(kinds)
+        self.number_offsets.append(len(self.numbers))
+        self.descriptions.append(description)
+        self._checkpoints = None
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Step `i` as it was appended."""
+        extra = self.extras.get(i, ())
+        labels, ids, numbers, kinds = self.labels, self.ids, self.numbers, self.kinds
+        at = self.id_offsets[i]
+        number = self.number_offsets[i]
+        step = {}
+        layout = self.layout_ops[i]
+        for key, form in zip(self.layouts[layout], self.layout_forms[layout]):
+            if key in extra:
+                step[key] = extra[key]
+            elif form == TYPE:
+                step[key] = self.types[self.ops[i]]
+            elif form == DESCRIPTION:
+                step[key] = self.descriptions[i]
+            elif form == NODE:
+                step[key] = labels[ids[at]]
+                at += 1
+            elif form == NODES:
+                count = ids[at]
+                step[key] = [labels[node] for node in ids[at + 1:at + 1 + count]]
+                at += 1 + count
+            elif form == EDGES:
+                count = ids[at]
+                step[key] = [[labels[ids[e]], labels[ids[e + 1]]] for e in range(at + 1, at + 1 + 2 * count, 2)]
+                at += 1 + 2 * count
+            elif form == DISTANCES:
+                count = ids[at]
+                step[key] = {labels[ids[at + 1 + k]]: _shown_number(numbers[number + k], kinds[number + k])
+                             for k in range(count)}
+                at += 1 + count
+                number += count
+            elif form == WEIGHT:
+                step[key] = _shown_number(numbers[number], kinds[number])
+                number += 1
+            elif form == COUNT:
+                step[key] = ids[at]
+                at += 1
+            else:
+                step[key] = self.tags[ids[at]]
+                at += 1
+        return step
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def step_types(self) -> List[str]:
+        return [self.types[op] for op in self.ops]
+
+    def state_at(self, frame: int) -> GraphState:
+        """State after `frame` (-1 for the empty state before the first step)."""
+        interval = self.interval
+        k = (frame + 1) // interval
+        if k == 0:
+            # Within the first interval (reading from the start): no checkpoints needed
+            state = GraphState()
+            for i in range(frame + 1):
+                state.apply(self.record(i))
+            return state
+        if self._checkpoints is None:
+            # State before every interval-th step, built once on first seek
+            state = GraphState()
+            checkpoints = [state.copy()]
+            for i in range(1, len(self) + 1):
+                state.apply(self.record(i - 1))
+                if i % interval == 0:
+                    checkpoints.append(state.copy())
+            self._checkpoints = checkpoints
+        state = self._checkpoints[k].copy()
+        for i in range(k * interval, frame + 1):
+            state.apply(self.record(i))
+        return state
+
+    def _step(self, record: Dict[str, Any], state: GraphState, snapshot: bool) -> Dict[str, Any]:
+        if not snapshot:
+            return dict(record)
+        step = {key: value for key, value in record.items() if key not in DELTA_FIELDS}
+        step.update(state.snapshot(self.fields))
+        return step
+
+    def iter_steps(self, trace_format: str = "full", start: int = 0,
+                   stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Step dicts for steps [start, stop); a delta window opens with a snapshot, so it stands alone."""
+        delta = trace_format == "delta"
+        state = self.state_at(start - 1)
+        for i in range(start, len(self) if stop is None else min(stop, len(self))):
+            record = self.record(i)
+            state.apply(record)
+            yield self._step(record, state, not delta or i == start or i % self.interval == 0)
+
+    def steps(self, trace_format: str = "full", start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_steps(trace_format, start, stop))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_steps()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, stride = key.indices(len(self))
+            if stride != 1:
+                raise ValueError("Trace slices must be contiguous")
+            return self.steps("full", start, stop)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("Trace step out of range")
+        return self.steps("full", key, key + 1)[0]
+
+    def select(self, keep: List[int]) -> "GraphTrace":
+        """
+        A new trace with only the steps in `keep` (ascending, ending with the
+        last step). Changes of dropped steps fold into the next kept step,
+        so replaying the result reaches the same state at kept steps.
+        """
+        selected = GraphTrace(0, self.fields)
+        selected.interval = self.interval
+        previous = -1
+        for i in keep:
+            kept = self.record(i)
+            record = {}
+            for dropped in range(previous + 1, i):
+                fold_changes(record, self.record(dropped))
+            if record:
+                fold_changes(record, kept)
+                record = {**kept, **record}
+            else:
+                record = kept
+            if i - previous > 1:
+                span = sum(self.extras.get(j, {}).get("coalesced", 1) for j in range(previous + 1, i + 1))
+                record["coalesced"] = span
+            selected.append(record)
+            previous = i
+        return selected
+
+    def downsample(self, max_frames: Optional[int]) -> "GraphTrace":
+        if max_frames is None or len(self) <= max_frames:
+            return self
+        return self.select(plan_frames(self.step_types, max_frames, GRAPH_DROP_ORDER))
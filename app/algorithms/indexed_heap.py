@@ -0,0 +1,199 @@
+"""
+Priority queues over dense integer ids for the graph engine.
+IndexedHeap is an indexed d-ary min-heap.
+Each id is in the heap at most once, and `pos` tracks where, so lowering a
+queued id's key moves it in place (decrease-key) instead of pushing a
+duplicate to be discarded later. The heap stays O(V) however many edges
+improve a key. Entries order by (key, id), the order heapq gives
+(key, id) tuples, so ties break on ids and hence on labels (see
+app.algorithms.graph_csr). A wider heap (arity d) is shallower, making
+decrease-key cheaper and pops costlier: pops scan d children per level.
+LazyHeap offers the same interface on heapq: a lower key pushes a
+duplicate and the stale entry is skipped when it surfaces, so
+push_or_decrease always answers "push". It pops in the same order, and as
+heapq runs in C it can be faster where few entries go stale, at the cost
+of a queue that grows with every improved key.
+"""
+
+import heapq
+from array import array
+from typing import Any, List, Optional, Tuple
+
+# Positions of ids not (or no longer) in the heap
+ABSENT = -1
+
+
+class IndexedHeap:
+
+    __slots__ = ("arity", "heap", "pos", "keys")
+
+    def __init__(self, capacity: int, arity: int = 4):
+        if arity < 2:
+            raise ValueError("Heap arity must be at least 2")
+        self.arity = arity
+        self.heap: List[int] = []
+        self.pos = array("i", [ABSENT]) * capacity
+        self.keys: List[Any] = [None] * capacity
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self.pos[item] != ABSENT
+
+    def key(self, item: int) -> Any:
+        return self.keys[item]
+
+    def push(self, item: int, key: Any):
+        if self.pos[item] != ABSENT:
+            raise ValueError(f"Id {item} is already in the heap")
+        self.keys[item] = key
+        self.heap.append(item)
+        self._sift_up(len(self.heap) - 1)
+
+    def decrease_key(self, item: int, key: Any):
+        if self.pos[item] == ABSENT:
+            raise KeyError(item)
+        if key > self.keys[item]:
+            raise ValueError(f"New key {key} is larger than {self.keys[item]}")
+        self.keys[item] = key
+        self._sift_up(self.pos[item])
+
+    def push_or_decrease(self, item: int, key: Any) -> str:
+        """Push `item`, or lower its key if queued: "push" or "decrease_key"."""
+        if self.pos[item] == ABSENT:
+            self.push(item, key)
+            return "push"
+        self.decrease_key(item, key)
+        return "decrease_key"
+
+    def peek(self) -> Tuple[Any, int]:
+        """(key, id) of the smallest entry, left in place."""
+        top = self.heap[0]
+        return self.keys[top], top
+
+    def pop(self) -> Tuple[Any, int]:
+        """(key, id) of the smallest entry."""
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = ABSENT
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return self.keys[top], top
+
+    def _sift_up(self, i: int):
+        heap, pos, keys, arity = self.heap, self.pos, self.keys, self.arity
+        item = heap[i]
+        key = keys[item]
+        while i:
+            parent = (i - 1) // arity
+            above = heap[parent]
+            above_key = keys[above]
+            if above_key < key or (above_key == key and above < item):
+                break
+            heap[i] = above
+            pos[above] = i
+            i = parent
+        heap[i] = item
+        pos[item] = i
+
+    def _sift_down(self, i: int):
+        heap, pos, keys, arity = self.heap, self.pos, self.keys, self.arity
+        size = len(heap)
+        item = heap[i]
+        key = keys[item]
+        while True:
+            first = i * arity + 1
+            if first >= size:
+                break
+            # Smallest of up to `arity` children
+            best = heap[first]
+            best_key = keys[best]
+            best_at = first
+            for c in range(first + 1, min(first + arity, size)):
+                child = heap[c]
+                child_key = keys[child]
+                if child_key < best_key or (child_key == best_key and child < best):
+                    best, best_key, best_at = child, child_key, c
+            if key < best_key or (key == best_key and item < best):
+                break
+            heap[i] = best
+            pos[best] = i
+            i = best_at
+        heap[i] = item
+        pos[item] = i
+
+
+class LazyHeap:
+
+    __slots__ = ("heap", "keys", "size")
+
+    def __init__(self, capacity: int, arity: Optional[int] = None):
+        # arity is accepted for a common signature with IndexedHeap
+        self.heap: List[Tuple[Any, int]] = []
+        # Key of each queued id's live entry, None for ids not (or no longer) queued
+        self.keys: List[Any] = [None] * capacity
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, item: int) -> bool:
+        return self.keys[item] is not None
+
+    def key(self, item: int) -> Any:
+        return self.keys[item]
+
+    def push(self, item: int, key: Any):
+        if self.keys[item] is not None:
+            raise ValueError(f"Id {item} is already in the heap")
+        self.keys[item] = key
+        self.size += 1
+        heapq.heappush(self.heap, (key, item))
+
+    def decrease_key(self, item: int, key: Any):
+        """Lower a queued id's key by pushing a duplicate entry; the old one goes stale."""
+        if self.keys[item] is None:
+            raise KeyError(item)
+        if key > self.keys[item]:
+            raise ValueError(f"New key {key} is larger than {self.keys[item]}")
+        self.keys[item] = key
+        heapq.heappush(self.heap, (key, item))
+
+    def push_or_decrease(self, item: int, key: Any) -> str:
+        """Push `item`, or a duplicate with the lower key if queued: always "push"."""
+        if self.keys[item] is None:
+            self.push(item, key)
+        else:
+            self.decrease_key(item, key)
+        return "push"
+
+    def _drop_stale(self):
+        heap, keys = self.heap, self.keys
+        while heap and keys[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+
+    def peek(self) -> Tuple[Any, int]:
+        """(key, id) of the smallest entry, left in place."""
+        self._drop_stale()
+        return self.heap[0]
+
+    def pop(self) -> Tuple[Any, int]:
+        """(key, id) of the smallest entry."""
+        self._drop_stale()
+        key, item = heapq.heappop(self.heap)
+        self.keys[item] = None
+        self.size -= 1
+        return key, item
+
+
+QUEUES = {"heapq": LazyHeap, "indexed": IndexedHeap}
+
+
+def priority_queue(kind: str, capacity: int, arity: int):
+    """A QUEUES queue for ids below `capacity`; arity only applies to the indexed heap."""
+    if kind not in QUEUES:
+        raise ValueError(f"Unknown priority queue: {kind}")
+    return QUEUES[kind](capacity, arity)
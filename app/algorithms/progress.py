@@ -0,0 +1,47 @@
+"""
+Progress reporting and cooperative cancellation for long-running solves.
+A Progress is shared between a solve and whoever watches it: every step the
+solve produces is counted, and is also a checkpoint where a cancelled solve
+stops with Cancelled. Sorting algorithms are generators, so each yielded
+event is a checkpoint (see checkpointed); for graph algorithms, so is every
+step appended to their GraphTrace.
+"""
+
+import threading
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Cancelled(Exception):
+    """Raised at a checkpoint once the solve has been cancelled."""
+
+
+class Progress:
+
+    def __init__(self):
+        self.steps = 0
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def checkpoint(self):
+        """Count one step, stopping the solve here if it was cancelled."""
+        if self._cancelled.is_set():
+            raise Cancelled()
+        self.steps += 1
+
+
+def checkpointed(events: Iterable[T], progress: Optional[Progress]) -> Iterator[T]:
+    """Pass events through, with a checkpoint before each one."""
+    if progress is None:
+        yield from events
+        return
+    for event in events:
+        progress.checkpoint()
+        yield event
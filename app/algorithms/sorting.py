@@ -1,184 +1,170 @@
 """
 Sorting Algorithms with step-by-step visualization support.
-Each algorithm returns a list of step dicts for frontend animation.
+Each algorithm is a generator of trace events (see app.algorithms.trace);
+the *_sort wrappers expand them into the legacy list of step dicts.
+Bubble and selection sort also have coarse generators that emit one range
+event per pass or scan instead of one step per comparison. Descriptions are
+(template id, *params) tuples; see app.algorithms.descriptions.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+
+from app.algorithms.trace import SortEvent, expand_sort_steps
 
 
 class SortingAlgorithms:
 
     @staticmethod
-    def bubble_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def bubble_events(arr: List[int]) -> Iterator[SortEvent]:
         arr = arr.copy()
         n = len(arr)
 
         for i in range(n):
+            level = ("pass_number", i + 1)
             swapped = False
             for j in range(0, n - i - 1):
-                steps.append({
-                    "type": "compare",
-                    "indices": [j, j + 1],
-                    "array": arr.copy(),
-                    "description": f"Comparing {arr[j]} and {arr[j+1]} at positions {j} and {j+1}",
-                    "pass_number": i + 1
-                })
+                yield ("compare", (j, j + 1), (),
+                       ("compare_adjacent", arr[j], arr[j + 1], j, j + 1), level)
 
                 if arr[j] > arr[j + 1]:
                     arr[j], arr[j + 1] = arr[j + 1], arr[j]
                     swapped = True
-                    steps.append({
-                        "type": "swapping",
-                        "indices": [j, j + 1],
-                        "array": arr.copy(),
-                        "description": f"Swapped {arr[j+1]} and {arr[j]}",
-                        "pass_number": i + 1
-                    })
-
-            steps.append({
-                "type": "sorted",
-                "indices": [n - i - 1],
-                "array": arr.copy(),
-                "description": f"Element {arr[n-i-1]} is now in final position {n-i-1}",
-                "pass_number": i + 1
-            })
+                    yield ("swapping", (j, j + 1), ((j, arr[j]), (j + 1, arr[j + 1])),
+                           ("swapped", arr[j + 1], arr[j]), level)
+
+            yield ("sorted", (n - i - 1,), (),
+                   ("final_position", arr[n - i - 1], n - i - 1), level)
 
             if not swapped:
                 break
 
-        steps.append({
-            "type": "done",
-            "array": arr,
-            "description": "Bubble sort completed!",
-            "total_comparisons": len([s for s in steps if s["type"] == "compare"]),
-            "total_swaps": len([s for s in steps if s["type"] == "swapping"])
-        })
+        yield "done", None, (), ("bubble_done",), None
+
+    @staticmethod
+    def bubble_pass_events(arr: List[int]) -> Iterator[SortEvent]:
+        """Coarse bubble sort: one range event per pass, carrying all of its swaps."""
+        arr = arr.copy()
+        n = len(arr)
+
+        for i in range(n):
+            level = ("pass_number", i + 1)
+            end = n - i - 1
+            writes = []
+            swaps = 0
+            for j in range(0, end):
+                if arr[j] > arr[j + 1]:
+                    arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                    writes.append((j, arr[j]))
+                    writes.append((j + 1, arr[j + 1]))
+                    swaps += 1
+
+            if end > 0:
+                yield ("pass", (0, end, end, swaps), writes,
+                       ("bubble_pass", i + 1, arr[end], end, swaps), level)
+            yield ("sorted", (end,), (),
+                   ("final_position", arr[end], end), level)
+
+            if not swaps:
+                break
 
-        return steps
+        yield "done", None, (), ("bubble_done",), None
 
     @staticmethod
-    def selection_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def selection_events(arr: List[int]) -> Iterator[SortEvent]:
         arr = arr.copy()
         n = len(arr)
 
         for i in range(n):
+            level = ("pass_number", i + 1)
             min_idx = i
 
-            steps.append({
-                "type": "compare",
-                "indices": [i],
-                "array": arr.copy(),
-                "description": f"Finding minimum from position {i} onwards",
-                "pass_number": i + 1
-            })
+            yield "compare", (i,), (), ("find_minimum", i), level
 
             for j in range(i + 1, n):
-                steps.append({
-                    "type": "compare",
-                    "indices": [min_idx, j],
-                    "array": arr.copy(),
-                    "description": f"Current min {arr[min_idx]} vs {arr[j]}",
-                    "pass_number": i + 1
-                })
+                yield "compare", (min_idx, j), (), ("compare_minimum", arr[min_idx], arr[j]), level
 
                 if arr[j] < arr[min_idx]:
                     min_idx = j
 
             if min_idx != i:
                 arr[i], arr[min_idx] = arr[min_idx], arr[i]
-                steps.append({
-                    "type": "swapping",
-                    "indices": [i, min_idx],
-                    "array": arr.copy(),
-                    "description": f"Swapped minimum {arr[i]} to position {i}",
-                    "pass_number": i + 1
-                })
-
-            steps.append({
-                "type": "sorted",
-                "indices": [i],
-                "array": arr.copy(),
-                "description": f"Position {i} now has {arr[i]} in final place",
-                "pass_number": i + 1
-            })
-
-        steps.append({
-            "type": "done",
-            "array": arr,
-            "description": "Selection sort completed!",
-            "total_comparisons": len([s for s in steps if s["type"] == "compare"]),
-            "total_swaps": len([s for s in steps if s["type"] == "swapping"])
-        })
-
-        return steps
+                yield ("swapping", (i, min_idx), ((i, arr[i]), (min_idx, arr[min_idx])),
+                       ("swapped_minimum", arr[i], i), level)
+
+            yield "sorted", (i,), (), ("final_place", i, arr[i]), level
+
+        yield "done", None, (), ("selection_done",), None
 
     @staticmethod
-    def insertion_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def selection_scan_events(arr: List[int]) -> Iterator[SortEvent]:
+        """Coarse selection sort: one range event per minimum scan."""
         arr = arr.copy()
         n = len(arr)
 
+        for i in range(n):
+            level = ("pass_number", i + 1)
+            min_idx = i
+            for j in range(i + 1, n):
+                if arr[j] < arr[min_idx]:
+                    min_idx = j
+
+            if i < n - 1:
+                yield ("scan", (i, n - 1, min_idx), (),
+                       ("minimum_scan", i, n - 1, arr[min_idx], min_idx), level)
+
+            if min_idx != i:
+                arr[i], arr[min_idx] = arr[min_idx], arr[i]
+                yield ("swapping", (i, min_idx), ((i, arr[i]), (min_idx, arr[min_idx])),
+                       ("swapped_minimum", arr[i], i), level)
+
+            yield "sorted", (i,), (), ("final_place", i, arr[i]), level
+
+        yield "done", None, (), ("selection_done",), None
+
+    @staticmethod
+    def insertion_events(arr: List[int]) -> Iterator[SortEvent]:
+        arr = arr.copy()
+        n = len(arr)
+        pending = ()
+
         for i in range(1, n):
+            level = ("pass_number", i)
             key = arr[i]
             j = i - 1
 
-            steps.append({
-                "type": "compare",
-                "indices": [i],
-                "array": arr.copy(),
-                "description": f"Inserting {key} into sorted portion",
-                "pass_number": i
-            })
+            yield "compare", (i,), pending, ("inserting", key), level
+            pending = ()
 
             while j >= 0 and arr[j] > key:
-                steps.append({
-                    "type": "compare",
-                    "indices": [j, j + 1],
-                    "array": arr.copy(),
-                    "description": f"{arr[j]} > {key}, shifting right",
-                    "pass_number": i
-                })
+                yield "compare", (j, j + 1), pending, ("shifting", arr[j], key), level
 
                 arr[j + 1] = arr[j]
+                pending = ((j + 1, arr[j]),)
                 j -= 1
 
             arr[j + 1] = key
-            steps.append({
-                "type": "sorted",
-                "indices": [j + 1],
-                "array": arr.copy(),
-                "description": f"Inserted {key} at position {j+1}",
-                "pass_number": i
-            })
-
-        steps.append({
-            "type": "done",
-            "array": arr,
-            "description": "Insertion sort completed!",
-            "total_comparisons": len([s for s in steps if s["type"] == "compare"]),
-            "total_swaps": 0
-        })
-
-        return steps
+            yield "sorted", (j + 1,), pending + ((j + 1, key),), ("inserted", key, j + 1), level
+            pending = ()
+
+        yield "done", None, pending, ("insertion_done",), None
 
     @staticmethod
-    def merge_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def merge_events(arr: List[int]) -> Iterator[SortEvent]:
         arr = arr.copy()
+        pending = []
 
-        def merge(arr, left, mid, right, depth):
+        def flush():
+            writes = tuple(pending)
+            pending.clear()
+            return writes
+
+        def merge(left, mid, right, depth):
             left_arr = arr[left:mid + 1]
             right_arr = arr[mid + 1:right + 1]
+            level = ("depth", depth)
 
-            steps.append({
-                "type": "compare",
-                "indices": list(range(left, right + 1)),
-                "array": arr.copy(),
-                "description": f"Merging subarrays [{left}..{mid}] and [{mid+1}..{right}]",
-                "depth": depth
-            })
+            yield ("compare", tuple(range(left, right + 1)), flush(),
+                   ("merging", left, mid, mid + 1, right), level)
 
             i = j = 0
             k = left
@@ -191,167 +177,111 @@ class SortingAlgorithms:
                     arr[k] = right_arr[j]
                     j += 1
 
-                steps.append({
-                    "type": "sorted",
-                    "indices": [k],
-                    "array": arr.copy(),
-                    "description": f"Placed {arr[k]} at position {k}",
-                    "depth": depth
-                })
+                pending.append((k, arr[k]))
+                yield "sorted", (k,), flush(), ("placed", arr[k], k), level
                 k += 1
 
             while i < len(left_arr):
                 arr[k] = left_arr[i]
+                pending.append((k, arr[k]))
                 i += 1
                 k += 1
 
             while j < len(right_arr):
                 arr[k] = right_arr[j]
+                pending.append((k, arr[k]))
                 j += 1
                 k += 1
 
-        def merge_sort_helper(arr, left, right, depth=0):
+        def merge_sort_helper(left, right, depth=0):
             if left < right:
                 mid = (left + right) // 2
-                merge_sort_helper(arr, left, mid, depth + 1)
-                merge_sort_helper(arr, mid + 1, right, depth + 1)
-                merge(arr, left, mid, right, depth)
-
-        merge_sort_helper(arr, 0, len(arr) - 1)
+                yield from merge_sort_helper(left, mid, depth + 1)
+                yield from merge_sort_helper(mid + 1, right, depth + 1)
+                yield from merge(left, mid, right, depth)
 
-        steps.append({
-            "type": "done",
-            "array": arr,
-            "description": "Merge sort completed!",
-            "total_comparisons": len([s for s in steps if s["type"] == "compare"]),
-            "total_swaps": 0
-        })
+        yield from merge_sort_helper(0, len(arr) - 1)
 
-        return steps
+        yield "done", None, flush(), ("merge_done",), None
 
     @staticmethod
-    def quick_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def quick_events(arr: List[int]) -> Iterator[SortEvent]:
         arr = arr.copy()
 
-        def partition(arr, low, high, depth):
+        def partition(low, high, depth):
             pivot = arr[high]
+            level = ("depth", depth)
 
-            steps.append({
-                "type": "pivot",
-                "indices": [high],
-                "array": arr.copy(),
-                "description": f"Pivot selected: {pivot}",
-                "depth": depth
-            })
+            yield "pivot", (high,), (), ("pivot_selected", pivot), level
 
             i = low - 1
 
             for j in range(low, high):
-                steps.append({
-                    "type": "compare",
-                    "indices": [j, high],
-                    "array": arr.copy(),
-                    "description": f"Comparing {arr[j]} with pivot {pivot}",
-                    "depth": depth
-                })
+                yield "compare", (j, high), (), ("compare_pivot", arr[j], pivot), level
 
                 if arr[j] < pivot:
                     i += 1
                     arr[i], arr[j] = arr[j], arr[i]
-                    steps.append({
-                        "type": "swapping",
-                        "indices": [i, j],
-                        "array": arr.copy(),
-                        "description": f"Swapped {arr[i]} and {arr[j]}",
-                        "depth": depth
-                    })
+                    yield ("swapping", (i, j), ((i, arr[i]), (j, arr[j])),
+                           ("swapped", arr[i], arr[j]), level)
 
             arr[i + 1], arr[high] = arr[high], arr[i + 1]
-            steps.append({
-                "type": "sorted",
-                "indices": [i + 1],
-                "array": arr.copy(),
-                "description": f"Pivot {pivot} in final position {i+1}",
-                "depth": depth
-            })
+            yield ("sorted", (i + 1,), ((i + 1, arr[i + 1]), (high, arr[high])),
+                   ("pivot_placed", pivot, i + 1), level)
 
             return i + 1
 
-        def quick_sort_helper(arr, low, high, depth=0):
+        # Explicit stack (right pushed first) keeps the recursive visiting
+        # order without hitting the recursion limit on presorted input.
+        stack = [(0, len(arr) - 1, 0)]
+        while stack:
+            low, high, depth = stack.pop()
             if low < high:
-                pi = partition(arr, low, high, depth)
-                quick_sort_helper(arr, low, pi - 1, depth + 1)
-                quick_sort_helper(arr, pi + 1, high, depth + 1)
-
-        quick_sort_helper(arr, 0, len(arr) - 1)
-
-        steps.append({
-            "type": "done",
-            "array": arr,
-            "description": "Quick sort completed!",
-            "total_comparisons": len([s for s in steps if s["type"] == "compare"]),
-            "total_swaps": len([s for s in steps if s["type"] == "swapping"])
-        })
+                pi = yield from partition(low, high, depth)
+                stack.append((pi + 1, high, depth + 1))
+                stack.append((low, pi - 1, depth + 1))
 
-        return steps
+        yield "done", None, (), ("quick_done",), None
 
     @staticmethod
-    def heap_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def heap_events(arr: List[int]) -> Iterator[SortEvent]:
         arr = arr.copy()
         n = len(arr)
 
-        def heapify(arr, n, i):
-            largest = i
-            left = 2 * i + 1
-            right = 2 * i + 2
+        def heapify(n, i):
+            while True:
+                largest = i
+                left = 2 * i + 1
+                right = 2 * i + 2
 
-            if left < n and arr[left] > arr[largest]:
-                largest = left
-            if right < n and arr[right] > arr[largest]:
-                largest = right
+                if left < n and arr[left] > arr[largest]:
+                    largest = left
+                if right < n and arr[right] > arr[largest]:
+                    largest = right
 
-            if largest != i:
+                if largest == i:
+                    return
                 arr[i], arr[largest] = arr[largest], arr[i]
-                steps.append({
-                    "type": "swapping",
-                    "indices": [i, largest],
-                    "array": arr.copy(),
-                    "description": f"Heapifying: swapped {arr[i]} and {arr[largest]}"
-                })
-                heapify(arr, n, largest)
+                yield ("swapping", (i, largest), ((i, arr[i]), (largest, arr[largest])),
+                       ("heapify_swap", arr[i], arr[largest]), None)
+                i = largest
 
         for i in range(n // 2 - 1, -1, -1):
-            heapify(arr, n, i)
+            yield from heapify(n, i)
 
         for i in range(n - 1, 0, -1):
             arr[0], arr[i] = arr[i], arr[0]
-            steps.append({
-                "type": "sorted",
-                "indices": [i],
-                "array": arr.copy(),
-                "description": f"Extracted {arr[i]} to position {i}"
-            })
-            heapify(arr, i, 0)
-
-        steps.append({
-            "type": "done",
-            "array": arr,
-            "description": "Heap sort completed!",
-            "total_comparisons": 0,
-            "total_swaps": len([s for s in steps if s["type"] == "swapping"])
-        })
-
-        return steps
+            yield "sorted", (i,), ((0, arr[0]), (i, arr[i])), ("extracted", arr[i], i), None
+            yield from heapify(i, 0)
+
+        yield "done", None, (), ("heap_done",), None
 
     @staticmethod
-    def counting_sort(arr: List[int]) -> List[Dict[str, Any]]:
-        steps = []
+    def counting_events(arr: List[int]) -> Iterator[SortEvent]:
         arr = arr.copy()
 
         if not arr:
-            return steps
+            return
 
         max_val = max(arr)
         min_val = min(arr)
@@ -365,25 +295,47 @@ class SortingAlgorithms:
         for i in range(1, len(count)):
             count[i] += count[i - 1]
 
+        # The visualization switches over to the (zeroed) output buffer
+        pending = [(k, 0) for k in range(len(arr))]
         for i in range(len(arr) - 1, -1, -1):
-            output[count[arr[i] - min_val] - 1] = arr[i]
-            steps.append({
-                "type": "sorted",
-                "indices": [count[arr[i] - min_val] - 1],
-                "array": output.copy(),
-                "description": f"Placed {arr[i]} at position {count[arr[i] - min_val] - 1}"
-            })
+            pos = count[arr[i] - min_val] - 1
+            output[pos] = arr[i]
+            pending.append((pos, arr[i]))
+            yield "sorted", (pos,), pending, ("placed", arr[i], pos), None
+            pending = []
             count[arr[i] - min_val] -= 1
 
-        steps.append({
-            "type": "done",
-            "array": output,
-            "description": "Counting sort completed!",
-            "total_comparisons": 0,
-            "total_swaps": 0
-        })
+        yield "done", None, pending, ("counting_done",), None
+
+    # --- Legacy step-list API (one full array snapshot per step) ---
+
+    @staticmethod
+    def bubble_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.bubble_events(arr))
+
+    @staticmethod
+    def selection_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.selection_events(arr))
+
+    @staticmethod
+    def insertion_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.insertion_events(arr))
+
+    @staticmethod
+    def merge_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.merge_events(arr))
+
+    @staticmethod
+    def quick_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.quick_events(arr))
+
+    @staticmethod
+    def heap_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.heap_events(arr))
 
-        return steps
+    @staticmethod
+    def counting_sort(arr: List[int]) -> List[Dict[str, Any]]:
+        return expand_sort_steps(arr, SortingAlgorithms.counting_events(arr))
 
 
 # --- Algorithm Registry (replaces if/elif chains) ---
@@ -396,3 +348,28 @@ SORTING_REGISTRY = {
     "heap": SortingAlgorithms.heap_sort,
     "counting": SortingAlgorithms.counting_sort,
 }
+
+# --- Event generators, for encoders that don't need full snapshots ---
+SORTING_EVENTS = {
+    "bubble": SortingAlgorithms.bubble_events,
+    "selection": SortingAlgorithms.selection_events,
+    "insertion": SortingAlgorithms.insertion_events,
+    "merge": SortingAlgorithms.merge_events,
+    "quick": SortingAlgorithms.quick_events,
+    "heap": SortingAlgorithms.heap_events,
+    "counting": SortingAlgorithms.counting_events,
+}
+
+# --- Coarse generators: one range event per pass/scan instead of one step per comparison ---
+COARSE_EVENTS = {
+    "bubble": SortingAlgorithms.bubble_pass_events,
+    "selection": SortingAlgorithms.selection_scan_events,
+}
+
+GRANULARITIES = ("fine", "coarse")
+
+
+def sort_events(algorithm: str, arr: List[int], granularity: str = "fine") -> Iterator[SortEvent]:
+    if granularity == "coarse" and algorithm in COARSE_EVENTS:
+        return COARSE_EVENTS[algorithm](arr)
+    return SORTING_EVENTS[algorithm](arr)
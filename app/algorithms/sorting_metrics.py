@@ -0,0 +1,230 @@
+"""
+Counting-only sorting implementations for time trials and metrics mode.
+Same algorithms as app.algorithms.sorting, but instead of a trace they keep
+plain integer counters of comparisons, swaps and element reads/writes.
+Each sorts a copy of its input, or the input itself with in_place=True
+(counting sort always writes a new output list).
+"""
+
+import time
+from typing import List, Dict, Any, Tuple
+
+
+def _result(arr, comparisons, swaps, reads, writes) -> Dict[str, Any]:
+    return {"array": arr, "comparisons": comparisons, "swaps": swaps, "reads": reads, "writes": writes}
+
+
+class SortingMetrics:
+
+    @staticmethod
+    def bubble_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        if not in_place:
+            arr = arr.copy()
+        n = len(arr)
+        comparisons = swaps = reads = 0
+
+        for i in range(n):
+            swapped = False
+            for j in range(n - i - 1):
+                a, b = arr[j], arr[j + 1]
+                if a > b:
+                    arr[j], arr[j + 1] = b, a
+                    swaps += 1
+                    swapped = True
+            comparisons += n - i - 1
+            reads += 2 * (n - i - 1)
+            if not swapped:
+                break
+
+        return _result(arr, comparisons, swaps, reads, 2 * swaps)
+
+    @staticmethod
+    def selection_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        if not in_place:
+            arr = arr.copy()
+        n = len(arr)
+        comparisons = swaps = reads = 0
+
+        for i in range(n):
+            min_idx = i
+            min_val = arr[i]
+            for j in range(i + 1, n):
+                value = arr[j]
+                if value < min_val:
+                    min_idx = j
+                    min_val = value
+            comparisons += n - i - 1
+            reads += n - i
+            if min_idx != i:
+                arr[min_idx] = arr[i]
+                arr[i] = min_val
+                swaps += 1
+                reads += 1
+
+        return _result(arr, comparisons, swaps, reads, 2 * swaps)
+
+    @staticmethod
+    def insertion_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        if not in_place:
+            arr = arr.copy()
+        n = len(arr)
+        comparisons = reads = writes = 0
+
+        for i in range(1, n):
+            key = arr[i]
+            j = i - 1
+            while j >= 0 and arr[j] > key:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = key
+            shifts = i - 1 - j
+            compared = shifts + (1 if j >= 0 else 0)
+            comparisons += compared
+            reads += 1 + compared
+            writes += shifts + 1
+
+        return _result(arr, comparisons, 0, reads, writes)
+
+    @staticmethod
+    def merge_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        if not in_place:
+            arr = arr.copy()
+        counts = [0, 0, 0]  # comparisons, reads, writes
+
+        def merge_sort_helper(left, right):
+            if left >= right:
+                return
+            mid = (left + right) // 2
+            merge_sort_helper(left, mid)
+            merge_sort_helper(mid + 1, right)
+
+            left_arr = arr[left:mid + 1]
+            right_arr = arr[mid + 1:right + 1]
+            i = j = 0
+            k = left
+            nl, nr = len(left_arr), len(right_arr)
+            while i < nl and j < nr:
+                if left_arr[i] <= right_arr[j]:
+                    arr[k] = left_arr[i]
+                    i += 1
+                else:
+                    arr[k] = right_arr[j]
+                    j += 1
+                k += 1
+            counts[0] += i + j
+            if i < nl:
+                arr[k:right + 1] = left_arr[i:]
+            else:
+                arr[k:right + 1] = right_arr[j:]
+            size = right - left + 1
+            counts[1] += size
+            counts[2] += size
+
+        merge_sort_helper(0, len(arr) - 1)
+        return _result(arr, counts[0], 0, counts[1], counts[2])
+
+    @staticmethod
+    def quick_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        if not in_place:
+            arr = arr.copy()
+        comparisons = swaps = reads = 0
+
+        stack = [(0, len(arr) - 1)]
+        while stack:
+            low, high = stack.pop()
+            if low >= high:
+                continue
+            pivot = arr[high]
+            i = low - 1
+            for j in range(low, high):
+                if arr[j] < pivot:
+                    i += 1
+                    arr[i], arr[j] = arr[j], arr[i]
+                    swaps += 1
+            comparisons += high - low
+            reads += high - low + 1
+            arr[i + 1], arr[high] = arr[high], arr[i + 1]
+            swaps += 1
+            stack.append((i + 2, high))
+            stack.append((low, i))
+
+        return _result(arr, comparisons, swaps, reads + 2 * swaps, 2 * swaps)
+
+    @staticmethod
+    def heap_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        if not in_place:
+            arr = arr.copy()
+        n = len(arr)
+        comparisons = swaps = 0
+
+        def sift_down(end, i):
+            nonlocal comparisons, swaps
+            while True:
+                largest = i
+                left = 2 * i + 1
+                right = left + 1
+                if left < end:
+                    comparisons += 1
+                    if arr[left] > arr[largest]:
+                        largest = left
+                if right < end:
+                    comparisons += 1
+                    if arr[right] > arr[largest]:
+                        largest = right
+                if largest == i:
+                    return
+                arr[i], arr[largest] = arr[largest], arr[i]
+                swaps += 1
+                i = largest
+
+        for i in range(n // 2 - 1, -1, -1):
+            sift_down(n, i)
+        for i in range(n - 1, 0, -1):
+            arr[0], arr[i] = arr[i], arr[0]
+            swaps += 1
+            sift_down(i, 0)
+
+        return _result(arr, comparisons, swaps, 2 * comparisons + 2 * swaps, 2 * swaps)
+
+    @staticmethod
+    def counting_sort(arr: List[int], in_place: bool = False) -> Dict[str, Any]:
+        # Always sorts into a new output list; `in_place` only matches the other signatures
+        if not arr:
+            return _result([], 0, 0, 0, 0)
+
+        n = len(arr)
+        min_val = min(arr)
+        count = [0] * (max(arr) - min_val + 1)
+        for num in arr:
+            count[num - min_val] += 1
+        for i in range(1, len(count)):
+            count[i] += count[i - 1]
+
+        output = [0] * n
+        for i in range(n - 1, -1, -1):
+            num = arr[i]
+            count[num - min_val] -= 1
+            output[count[num - min_val]] = num
+
+        # min/max and two passes over the input; one write per element
+        return _result(output, 0, 0, 4 * n, n)
+
+
+# --- Metrics registry (mirrors SORTING_REGISTRY) ---
+SORTING_METRICS = {
+    "bubble": SortingMetrics.bubble_sort,
+    "selection": SortingMetrics.selection_sort,
+    "insertion": SortingMetrics.insertion_sort,
+    "merge": SortingMetrics.merge_sort,
+    "quick": SortingMetrics.quick_sort,
+    "heap": SortingMetrics.heap_sort,
+    "counting": SortingMetrics.counting_sort,
+}
+
+
+def measure(algorithm: str, arr: List[int]) -> Tuple[float, Dict[str, Any]]:
+    """Run the counting-only implementation and return (execution_time_us, metrics)."""
+    start_time = time.perf_counter()
+    metrics = SORTING_METRICS[algorithm](arr)
+    execution_time_us = (time.perf_counter() - start_time) * 1_000_000
+    return execution_time_us, metrics
@@ -0,0 +1,427 @@
+"""
+Trace encoders shared by the algorithm modules.
+
+Sorting algorithms yield lightweight events instead of building step dicts:
+
+    (type, indices, writes, description, level)
+
+`writes` lists the (index, value) pairs written to the array since the
+previous event, `description` is a (template id, *params) tuple (see
+app.algorithms.descriptions) and `level` is an optional
+("pass_number" | "depth", n) pair.
+Range events (RANGE_TYPES, coarse granularity) stand for a whole scan loop;
+their indices are (start, end, winner[, swaps]).
+The helpers below replay those events into the wire formats the API serves,
+and `Trace` records them into compact columns for traces that are kept.
+"""
+
+import json
+import logging
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.algorithms.descriptions import Description, describe
+from app.config import TRACE_KEYFRAME_INTERVAL, NDJSON_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+SortEvent = Tuple[str, Optional[Tuple[int, ...]], Any, Description, Optional[Tuple[str, int]]]
+
+
+# Step types dropped first when downsampling (folded into the next kept step), in order
+SORT_DROP_ORDER = (frozenset({"compare"}), frozenset({"swapping"}))
+GRAPH_DROP_ORDER = (frozenset({"explore_edge", "skip"}),)
+
+
+RANGE_TYPES = frozenset({"scan", "pass"})
+
+
+def range_fields(indices) -> Dict[str, Any]:
+    """Step fields of a range event: the scanned range, its winner and what the scan cost."""
+    start, end, winner = indices[0], indices[1], indices[2]
+    fields = {"range": [start, end], "winner": winner, "comparisons": end - start}
+    if len(indices) > 3:
+        fields["swaps"] = indices[3]
+    return fields
+
+
+def _step_dict(step_type: str, indices, description: Description, verbosity: str) -> Dict[str, Any]:
+    if step_type in RANGE_TYPES:
+        step = {"type": step_type, "indices": [indices[2]], **range_fields(indices)}
+    else:
+        step = {"type": step_type, "indices": list(indices)}
+    return describe(step, description, verbosity)
+
+
+def _extend_ints(column, values):
+    """Extend an int64 column, falling back to a plain list once a value does not fit."""
+    size = len(column)
+    try:
+        column.extend(values)
+    except OverflowError:
+        del column[size:]
+        column = list(column)
+        column.extend(values)
+    return column
+
+
+def keyframe_interval(n: int) -> int:
+    """Steps between keyframes — scaled with n so snapshots stay O(1) per step."""
+    return max(TRACE_KEYFRAME_INTERVAL, n)
+
+
+def iter_sort_steps(arr: List[int], events: Iterable[SortEvent], trace_format: str = "delta",
+                    interval: Optional[int] = None, verbosity: str = "full") -> Iterator[Dict[str, Any]]:
+    """Lazily encode events as steps; nothing is buffered beyond the current step."""
+    delta = trace_format == "delta"
+    keyframe_every = (interval or keyframe_interval(len(arr))) if delta else 1
+    display = list(arr)
+    comparisons = swaps = 0
+    index = 0
+
+    for step_type, indices, writes, description, level in events:
+        for idx, value in writes:
+            display[idx] = value
+
+        if step_type == "done":
+            yield describe({
+                "type": "done",
+                "array": display,
+                "total_comparisons": comparisons,
+                "total_swaps": swaps,
+            }, description, verbosity)
+            return
+
+        if step_type == "compare":
+            comparisons += 1
+        elif step_type == "swapping":
+            swaps += 1
+        elif step_type in RANGE_TYPES:
+            comparisons += indices[1] - indices[0]
+            swaps += indices[3] if len(indices) > 3 else 0
+
+        step = _step_dict(step_type, indices, description, verbosity)
+        if level is not None:
+            step[level[0]] = level[1]
+        if delta:
+            step["writes"] = [[idx, value] for idx, value in writes]
+            if index % keyframe_every == 0:
+                step["array"] = display.copy()
+        else:
+            step["array"] = display.copy()
+
+        index += 1
+        yield step
+
+
+def expand_sort_steps(arr: List[int], events: Iterable[SortEvent]) -> List[Dict[str, Any]]:
+    """Legacy format: every step carries a full copy of the array."""
+    return list(iter_sort_steps(arr, events, "full"))
+
+
+def delta_sort_steps(arr: List[int], events: Iterable[SortEvent], interval: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Delta format: steps carry only their writes, plus a keyframe every `interval` steps."""
+    return list(iter_sort_steps(arr, events, "delta", interval))
+
+
+class Trace:
+    """
+    Columnar recording of a sorting run.
+    Each step is one entry in array-module columns (op code, indices, writes,
+    level, description template and params); step dicts and description
+    strings are only built when a JSON view is asked for (steps(),
+    iteration, indexing).
+    """
+
+    __slots__ = (
+        "initial", "types", "_op_codes", "ops", "templates", "_template_codes", "template_ops",
+        "param_offsets", "params", "level_keys", "levels",
+        "index_offsets", "indices", "write_offsets", "write_index", "write_value",
+        "total_comparisons", "total_swaps", "spans", "_checkpoints",
+    )
+
+    # level_keys column: 0 for none, else 1 + position here
+    LEVEL_KEYS = ("pass_number", "depth")
+
+    def __init__(self, initial: List[int]):
+        self.initial = list(initial)
+        self.types: List[str] = []
+        self._op_codes: Dict[str, int] = {}
+        self.ops = array("B")
+        self.templates: List[str] = []
+        self._template_codes: Dict[str, int] = {}
+        self.template_ops = array("B")
+        self.param_offsets = array("I", [0])
+        self.params = array("q")
+        self.level_keys = array("B")
+        self.levels = array("i")
+        self.index_offsets = array("I", [0])
+        self.indices = array("i")
+        self.write_offsets = array("I", [0])
+        self.write_index = array("i")
+        self.write_value = array("q")
+        self.total_comparisons = 0
+        self.total_swaps = 0
+        # Source steps behind each step, once downsampled (see select)
+        self.spans: Optional[array] = None
+        self._checkpoints: Optional[List[List[int]]] = None
+
+    @classmethod
+    def record(cls, arr: List[int], events: Iterable[SortEvent]) -> "Trace":
+        trace = cls(arr)
+        for event in events:
+            trace.append(*event)
+        return trace
+
+    def append(self, step_type, indices, writes, description, level):
+        op = self._op_codes.get(step_type)
+        if op is None:
+            op = self._op_codes[step_type] = len(self.types)
+            self.types.append(step_type)
+        self.ops.append(op)
+        template = self._template_codes.get(description[0])
+        if template is None:
+            template = self._template_codes[description[0]] = len(self.templates)
+            self.templates.append(description[0])
+        self.template_ops.append(template)
+        if len(description) > 1:
+            self.params = _extend_ints(self.params, description[1:])
+        self.param_offsets.append(len(self.params))
+        if level is None:
+            self.level_keys.append(0)
+            self.levels.append(0)
+        else:
+            self.level_keys.append(self.LEVEL_KEYS.index(level[0]) + 1)
+            self.levels.append(level[1])
+        if indices:
+            self.indices.extend(indices)
+        self.index_offsets.append(len(self.indices))
+        for idx, value in writes:
+            self.write_index.append(idx)
+            self.write_value = _extend_ints(self.write_value, (value,))
+        self.write_offsets.append(len(self.write_index))
+
+        if step_type == "compare":
+            self.total_comparisons += 1
+        elif step_type == "swapping":
+            self.total_swaps += 1
+        elif step_type in RANGE_TYPES:
+            self.total_comparisons += indices[1] - indices[0]
+            self.total_swaps += indices[3] if len(indices) > 3 else 0
+        self._checkpoints = None
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def step_types(self) -> List[str]:
+        return [self.types[op] for op in self.ops]
+
+    def select(self, keep: List[int]) -> "Trace":
+        """
+        A new trace with only the steps in `keep` (ascending, ending with the
+        last step). Writes of dropped steps fold into the next kept step, so
+        replaying the result still reaches the same arrays at kept steps.
+        """
+        selected = Trace(self.initial)
+        selected.types = list(self.types)
+        selected._op_codes = dict(self._op_codes)
+        selected.templates = list(self.templates)
+        selected._template_codes = dict(self._template_codes)
+        selected.total_comparisons = self.total_comparisons
+        selected.total_swaps = self.total_swaps
+        selected.spans = array("I")
+        previous = -1
+        for i in keep:
+            selected.ops.append(self.ops[i])
+            selected.template_ops.append(self.template_ops[i])
+            selected.params = _extend_ints(selected.params, self.params[self.param_offsets[i]:self.param_offsets[i + 1]])
+            selected.param_offsets.append(len(selected.params))
+            selected.level_keys.append(self.level_keys[i])
+            selected.levels.append(self.levels[i])
+            selected.indices.extend(self.indices[self.index_offsets[i]:self.index_offsets[i + 1]])
+            selected.index_offsets.append(len(selected.indices))
+            # Last write per index wins
+            writes = {}
+            for w in range(self.write_offsets[previous + 1], self.write_offsets[i + 1]):
+                writes[self.write_index[w]] = self.write_value[w]
+            selected.write_index.extend(writes.keys())
+            selected.write_value = _extend_ints(selected.write_value, writes.values())
+            selected.write_offsets.append(len(selected.write_index))
+            span = i - previous
+            selected.spans.append(span if self.spans is None else sum(self.spans[previous + 1:i + 1]))
+            previous = i
+        return selected
+
+    def downsample(self, max_frames: Optional[int]) -> "Trace":
+        if max_frames is None or len(self) <= max_frames:
+            return self
+        return self.select(plan_frames(self.step_types, max_frames, SORT_DROP_ORDER))
+
+    def _apply(self, display: List[int], start: int, stop: int):
+        """Apply the writes of steps [start, stop) to display."""
+        write_index, write_value = self.write_index, self.write_value
+        for w in range(self.write_offsets[start], self.write_offsets[stop]):
+            display[write_index[w]] = write_value[w]
+
+    def array_at(self, frame: int) -> List[int]:
+        """Array state after `frame` (-1 for the initial array)."""
+        interval = keyframe_interval(len(self.initial))
+        if self._checkpoints is None:
+            # State before every interval-th step, built once on first seek
+            display = list(self.initial)
+            checkpoints = [display.copy()]
+            for start in range(0, len(self), interval):
+                self._apply(display, start, min(start + interval, len(self)))
+                checkpoints.append(display.copy())
+            self._checkpoints = checkpoints
+        k = (frame + 1) // interval
+        display = list(self._checkpoints[k])
+        self._apply(display, k * interval, frame + 1)
+        return display
+
+    def description(self, i: int) -> Description:
+        return (self.templates[self.template_ops[i]], *self.params[self.param_offsets[i]:self.param_offsets[i + 1]])
+
+    def _step(self, i: int, display: List[int], delta: bool, keyframe: bool, verbosity: str) -> Dict[str, Any]:
+        step_type = self.types[self.ops[i]]
+        if step_type == "done":
+            return describe({
+                "type": "done",
+                "array": display.copy(),
+                "total_comparisons": self.total_comparisons,
+                "total_swaps": self.total_swaps,
+            }, self.description(i), verbosity)
+        indices = self.indices[self.index_offsets[i]:self.index_offsets[i + 1]]
+        step = _step_dict(step_type, indices, self.description(i), verbosity)
+        if self.level_keys[i]:
+            step[self.LEVEL_KEYS[self.level_keys[i] - 1]] = self.levels[i]
+        if self.spans is not None and self.spans[i] > 1:
+            step["coalesced"] = self.spans[i]
+        if delta:
+            lo, hi = self.write_offsets[i], self.write_offsets[i + 1]
+            step["writes"] = [[self.write_index[w], self.write_value[w]] for w in range(lo, hi)]
+            if keyframe:
+                step["array"] = display.copy()
+        else:
+            step["array"] = display.copy()
+        return step
+
+    def iter_steps(self, trace_format: str = "delta", start: int = 0, stop: Optional[int] = None,
+                   interval: Optional[int] = None, verbosity: str = "full") -> Iterator[Dict[str, Any]]:
+        """
+        Step dicts as iter_sort_steps would produce them, for steps [start, stop).
+        Without a stop the iterator follows the trace as it grows, so steps
+        appended between next() calls are still yielded (see playback).
+        """
+        delta = trace_format == "delta"
+        keyframe_every = (interval or keyframe_interval(len(self.initial))) if delta else 1
+        display = self.array_at(start - 1)
+        i = start
+        while i < (len(self) if stop is None else min(stop, len(self))):
+            self._apply(display, i, i + 1)
+            yield self._step(i, display, delta, i % keyframe_every == 0, verbosity)
+            i += 1
+
+    def steps(self, trace_format: str = "delta", start: int = 0, stop: Optional[int] = None,
+              verbosity: str = "full") -> List[Dict[str, Any]]:
+        return list(self.iter_steps(trace_format, start, stop, verbosity=verbosity))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_steps()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, stride = key.indices(len(self))
+            if stride != 1:
+                raise ValueError("Trace slices must be contiguous")
+            return self.steps("delta", start, stop)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("Trace step out of range")
+        return self.steps("delta", key, key + 1)[0]
+
+
+def _spread(items: List[int], count: int) -> List[int]:
+    """`count` evenly spaced picks from items, always including the last."""
+    if count >= len(items):
+        return list(items)
+    if count <= 0:
+        return []
+    return [items[((k + 1) * len(items)) // count - 1] for k in range(count)]
+
+
+def plan_frames(step_types: List[str], max_frames: int, drop_order: Tuple[frozenset, ...]) -> List[int]:
+    """
+    Indices of the steps to keep so that at most `max_frames` remain.
+    The final step is always kept. Steps whose type is in no `drop_order` tier
+    come first, then each tier from last to first; the tier that no longer
+    fits entirely is sampled evenly, so long runs of it collapse into a few
+    frames, and earlier tiers are dropped.
+    """
+    last = len(step_types) - 1
+    if last < max_frames:
+        return list(range(last + 1))
+    tier_of = {t: tier for tier, types in enumerate(drop_order) for t in types}
+    groups: List[List[int]] = [[] for _ in range(len(drop_order) + 1)]
+    for i in range(last):
+        groups[tier_of.get(step_types[i], len(drop_order))].append(i)
+
+    budget = max_frames - 1
+    keep: List[int] = []
+    for group in reversed(groups):
+        picked = _spread(group, budget - len(keep))
+        keep.extend(picked)
+        if len(picked) < len(group):
+            break
+    keep.sort()
+    keep.append(last)
+    return keep
+
+
+def downsample_steps(steps: List[Dict[str, Any]], max_frames: Optional[int],
+                     drop_order: Tuple[frozenset, ...] = GRAPH_DROP_ORDER) -> List[Dict[str, Any]]:
+    """Frame budget for lists of self-contained steps: dropped steps are simply skipped."""
+    if max_frames is None or len(steps) <= max_frames:
+        return steps
+    kept = []
+    previous = -1
+    for i in plan_frames([step["type"] for step in steps], max_frames, drop_order):
+        step = steps[i]
+        if i - previous > 1:
+            step = {**step, "coalesced": i - previous}
+        kept.append(step)
+        previous = i
+    return kept
+
+
+def sort_array_at(initial: List[int], steps: List[Dict[str, Any]], frame: int) -> List[int]:
+    """Array state after `frame`, replayed from the nearest keyframe at or before it."""
+    k = frame
+    while k >= 0 and "array" not in steps[k]:
+        k -= 1
+    display = list(steps[k]["array"]) if k >= 0 else list(initial)
+    for step in steps[k + 1:frame + 1]:
+        for idx, value in step["writes"]:
+            display[idx] = value
+    return display
+
+
+def iter_ndjson(header: Dict[str, Any], steps: Iterable[Dict[str, Any]],
+                batch_size: int = NDJSON_BATCH_SIZE) -> Iterator[str]:
+    """Newline-delimited JSON: a header line, then one line per step, flushed in batches."""
+    yield json.dumps(header, separators=(",", ":")) + "\n"
+    batch = []
+    try:
+        for step in steps:
+            batch.append(json.dumps(step, separators=(",", ":")))
+            if len(batch) >= batch_size:
+                yield "\n".join(batch) + "\n"
+                batch = []
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.exception("Error while streaming trace")
+        batch.append(json.dumps({"type": "error", "description": str(e)}))
+    if batch:
+        yield "\n".join(batch) + "\n"
@@ -19,3 +19,83 @@ STATIC_DIR = BASE_DIR / "static"
 # --- App Info ---
 APP_TITLE = "Ultimate Sorting & Graph Visualizer API"
 APP_VERSION = "4.0.0"
+
+# --- Traces ---
+# Arrays above FULL_TRACE_MAX_ARRAY_SIZE must use the delta trace format.
+FULL_TRACE_MAX_ARRAY_SIZE = int(os.getenv("FULL_TRACE_MAX_ARRAY_SIZE", 500))
+MAX_ARRAY_SIZE = int(os.getenv("MAX_ARRAY_SIZE", 5000))
+# Metrics-only runs (time trials, mode=metrics) build no trace and can go much larger.
+METRICS_MAX_ARRAY_SIZE = int(os.getenv("METRICS_MAX_ARRAY_SIZE", 100_000))
+TIME_TRIAL_MAX_ARRAY_SIZE = int(os.getenv("TIME_TRIAL_MAX_ARRAY_SIZE", 100_000))
+# Minimum number of delta steps between full-array keyframes.
+TRACE_KEYFRAME_INTERVAL = int(os.getenv("TRACE_KEYFRAME_INTERVAL", 64))
+# Steps per chunk when streaming traces as NDJSON.
+NDJSON_BATCH_SIZE = int(os.getenv("NDJSON_BATCH_SIZE", 256))
+
+# --- Graphs ---
+# Priority queues (see app.algorithms.indexed_heap): "indexed" (d-ary, decrease-key) or, opt-in, "heapq" (lazy
+# deletion: duplicate pushes, traced as such), one for Dijkstra, A* and bidirectional Dijkstra and one for Prim,
+# and the indexed heap's children per node.
+GRAPH_SHORTEST_PATH_QUEUE = os.getenv("GRAPH_SHORTEST_PATH_QUEUE", "indexed")
+GRAPH_MST_QUEUE = os.getenv("GRAPH_MST_QUEUE", "indexed")
+GRAPH_HEAP_ARITY = int(os.getenv("GRAPH_HEAP_ARITY", 4))
+
+# --- Trace sessions ---
+TRACE_STORE_MAX_ENTRIES = int(os.getenv("TRACE_STORE_MAX_ENTRIES", 64))
+TRACE_STORE_MAX_STEPS = int(os.getenv("TRACE_STORE_MAX_STEPS", 5_000_000))
+TRACE_STORE_TTL_SECONDS = float(os.getenv("TRACE_STORE_TTL_SECONDS", 600))
+TRACE_PAGE_MAX_LIMIT = int(os.getenv("TRACE_PAGE_MAX_LIMIT", 5000))
+
+# --- Worker pools ---
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", os.cpu_count() or 2))
+# Per-algorithm time limit in a time trial; slower algorithms are reported as timed out.
+TIME_TRIAL_DEADLINE_SECONDS = float(os.getenv("TIME_TRIAL_DEADLINE_SECONDS", 10))
+# Time trials report the peak memory of recording a trace only up to this many (estimated) steps.
+TIME_TRIAL_TRACE_MEMORY_MAX_STEPS = int(os.getenv("TIME_TRIAL_TRACE_MEMORY_MAX_STEPS", 20_000))
+# Benchmark-mode time trials: warmup runs, timed samples, and the shortest sample (loops are calibrated to it).
+BENCHMARK_WARMUP = int(os.getenv("BENCHMARK_WARMUP", 1))
+BENCHMARK_REPEAT = int(os.getenv("BENCHMARK_REPEAT", 15))
+BENCHMARK_MAX_REPEAT = int(os.getenv("BENCHMARK_MAX_REPEAT", 100))
+BENCHMARK_MIN_SAMPLE_SECONDS = float(os.getenv("BENCHMARK_MIN_SAMPLE_SECONDS", 0.01))
+# Complexity sweeps: per-algorithm time limit (sizes measured by then are still fitted) and largest size.
+COMPLEXITY_DEADLINE_SECONDS = float(os.getenv("COMPLEXITY_DEADLINE_SECONDS", 60))
+COMPLEXITY_MAX_SIZE = int(os.getenv("COMPLEXITY_MAX_SIZE", 20_000))
+# Where /api/sort and /api/graph-solve run: "thread", "process" (shared pool) or "inline".
+SOLVE_EXECUTOR = os.getenv("SOLVE_EXECUTOR", "thread")
+SOLVE_WORKERS = int(os.getenv("SOLVE_WORKERS", 4))
+# Requests allowed to wait for a worker; beyond this they get 429 + Retry-After.
+SOLVE_QUEUE_SIZE = int(os.getenv("SOLVE_QUEUE_SIZE", 16))
+SOLVE_RETRY_AFTER_SECONDS = int(os.getenv("SOLVE_RETRY_AFTER_SECONDS", 2))
+
+# --- Result cache ---
+# Serialized sort/graph responses kept for identical requests, bounded by total size.
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# --- Admission control ---
+# Predicted response size above which a buffered trace is downgraded or must be streamed.
+ADMISSION_MAX_RESPONSE_BYTES = int(os.getenv("ADMISSION_MAX_RESPONSE_BYTES", 32 * 1024 * 1024))
+# Predicted size above which even a streamed trace is downgraded to metrics.
+ADMISSION_MAX_STREAM_BYTES = int(os.getenv("ADMISSION_MAX_STREAM_BYTES", 512 * 1024 * 1024))
+# Most steps a trace may have when it is recorded whole (buffered, sessions, max_frames).
+ADMISSION_MAX_RECORDED_STEPS = int(os.getenv("ADMISSION_MAX_RECORDED_STEPS", 5_000_000))
+# Most predicted operations (fine-grained steps) a metrics-mode sort may run; above it, 413.
+METRICS_MAX_OPERATIONS = int(os.getenv("METRICS_MAX_OPERATIONS", 50_000_000))
+# Largest value range (max - min + 1) counting sort may allocate counters for, in any mode.
+COUNTING_SORT_MAX_RANGE = int(os.getenv("COUNTING_SORT_MAX_RANGE", 1_000_000))
+
+# --- Background jobs ---
+# /api/jobs runs solves on its own thread pool; beyond JOB_WORKERS + JOB_QUEUE_SIZE unfinished jobs, 429.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", 16))
+# Finished jobs stay queryable this long (their traces live in the trace store).
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", 600))
+
+# --- Playback ---
+# /ws/play pushes frames at the client's speed (frames per second), clamped to PLAYBACK_MAX_FPS.
+PLAYBACK_DEFAULT_FPS = float(os.getenv("PLAYBACK_DEFAULT_FPS", 10))
+PLAYBACK_MAX_FPS = float(os.getenv("PLAYBACK_MAX_FPS", 1000))
+# /ws/race produces each algorithm's frames on this many threads, RACE_LOOKAHEAD frames ahead of playback.
+RACE_WORKERS = int(os.getenv("RACE_WORKERS", 4))
+RACE_LOOKAHEAD = int(os.getenv("RACE_LOOKAHEAD", 64))
+# A race takes one solve slot per algorithm, and races at most RACE_MAX_LANES algorithms.
+RACE_MAX_LANES = int(os.getenv("RACE_MAX_LANES", 4))
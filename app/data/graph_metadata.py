@@ -98,6 +98,48 @@ GRAPH_ALGORITHM_INFO = {
             "visualgo": "https://visualgo.net/en/dfsbfs"
         }
     },
+    "iddfs": {
+        "name": "Iterative Deepening DFS",
+        "description": "Runs depth-limited DFS with limits 0, 1, 2, ... until the target is found. Finds the shallowest target like BFS while keeping DFS's small memory footprint.",
+        "time_complexity": "O(b^d)",
+        "space_complexity": "O(d)",
+        "how_it_works": "Run a DFS that does not go below depth 0, then one limited to depth 1, then 2, and so on. Each round starts over from the source. The first round that reaches the target finds it at the smallest possible depth. If a round finishes without cutting off any branch, every reachable node has been seen and the search stops.",
+        "code_explanation": {
+            "algorithm": "Loop over limits; for each, run a depth-limited DFS that stops expanding at the limit. Stop when the target is found or nothing was cut off.",
+            "key_insight": "Most nodes of a search tree sit at its deepest level, so repeating the shallow levels costs only a constant factor more than one full search.",
+            "data_structure": "Explicit stack (LIFO) of the current path, plus the depth each node was reached at."
+        },
+        "real_world_uses": [
+            "Game-tree search with a time budget (chess engines)",
+            "Puzzle solving (15-puzzle, Rubik's cube) with IDA*",
+            "Searching huge or infinite state spaces",
+            "Web and file-system crawling to a bounded depth"
+        ],
+        "when_to_use": [
+            "Shallowest solution wanted, but memory is tight",
+            "Search depth is unknown in advance",
+            "Anytime search: deeper rounds refine the answer"
+        ],
+        "when_not_to_use": [
+            "Weighted shortest paths (use Dijkstra)",
+            "Small graphs where BFS memory is no concern",
+            "Graphs with many cycles, where rounds revisit a lot"
+        ],
+        "advantages": [
+            "Finds the shallowest target, like BFS",
+            "Memory grows with depth, like DFS",
+            "A depth limit bounds both stack and running time"
+        ],
+        "disadvantages": [
+            "Shallow levels are explored again in every round",
+            "Does not account for edge weights",
+            "Slower than BFS when memory is plentiful"
+        ],
+        "resources": {
+            "youtube": "https://www.youtube.com/results?search_query=iterative+deepening+depth+first+search+tutorial",
+            "visualgo": "https://visualgo.net/en/dfsbfs"
+        }
+    },
     "dijkstra": {
         "name": "Dijkstra's Algorithm",
         "description": "Finds the shortest path from a source to all other vertices in a weighted graph with non-negative weights. Uses a priority queue for greedy selection.",
@@ -105,9 +147,9 @@ GRAPH_ALGORITHM_INFO = {
         "space_complexity": "O(V)",
         "how_it_works": "Initialize all distances to infinity except source (0). Use a min-priority queue. Extract the node with smallest distance, relax all its edges: if going through this node gives a shorter path to a neighbor, update the neighbor's distance. Repeat until all nodes are processed or target is reached.",
         "code_explanation": {
-            "algorithm": "Use a min-heap (priority queue). Push (0, start). Pop minimum, relax neighbors. If new_dist < current dist, update and push to heap.",
+            "algorithm": "Use a min-priority queue. Push (0, start). Pop minimum, relax neighbors. If new_dist < current dist, update it: push the neighbor, or lower its key if it is already queued (decrease-key).",
             "key_insight": "Greedy choice: always process the unvisited node with the smallest known distance. This guarantees optimality for non-negative weights.",
-            "data_structure": "Min-heap (heapq in Python) for efficient extraction of the minimum-distance node."
+            "data_structure": "Indexed 4-ary min-heap: each node is queued once and a lower distance lowers its key in place (decrease-key). The snippet uses heapq with lazy deletion instead, pushing a duplicate and skipping the stale entry on pop; GRAPH_SHORTEST_PATH_QUEUE=heapq does the same, and traces those updates as relax steps."
         },
         "real_world_uses": [
             "GPS navigation and Google Maps routing",
@@ -148,6 +190,123 @@ GRAPH_ALGORITHM_INFO = {
             "visualgo": "https://visualgo.net/en/sssp"
         }
     },
+    "astar": {
+        "name": "A* Search",
+        "description": "Finds a shortest path between two nodes like Dijkstra, but orders the queue by distance so far plus an estimate of the distance left, so the search heads toward the target instead of spreading in every direction.",
+        "time_complexity": "O((V + E) log V)",
+        "space_complexity": "O(V)",
+        "how_it_works": "Each node gets g, the cost of the best path found from the start, and h, a lower bound on the cost from it to the target. Repeatedly settle the queued node with the smallest f = g + h and relax its edges, as Dijkstra does. Stop when the target is settled. Here h is the straight-line (Euclidean) or grid (Manhattan) distance between node positions, scaled so that no edge is cheaper than its length. With h = 0, A* is exactly Dijkstra.",
+        "code_explanation": {
+            "algorithm": "Dijkstra with the priority of each node raised by h(node). Push (h(start), start); pop the minimum f, relax neighbors with f = g + weight + h(neighbor), stop at the target.",
+            "key_insight": "A consistent heuristic (h(u) ≤ weight(u, v) + h(v) for every edge) never overestimates, so the first time the target is settled its path is optimal, and no settled node is ever reopened.",
+            "data_structure": "Indexed min-heap with decrease-key, keyed by f = g + h."
+        },
+        "real_world_uses": [
+            "Route planning in maps and navigation",
+            "Pathfinding for game characters on grids and navmeshes",
+            "Robot motion planning",
+            "Puzzle solving (8-puzzle, 15-puzzle)"
+        ],
+        "when_to_use": [
+            "One start and one target",
+            "Nodes have coordinates that bound the remaining cost",
+            "Large or grid-like graphs where Dijkstra explores too much"
+        ],
+        "when_not_to_use": [
+            "Distances to every node are wanted (use Dijkstra)",
+            "No meaningful heuristic is available",
+            "Negative edge weights"
+        ],
+        "advantages": [
+            "Optimal with an admissible heuristic",
+            "Settles far fewer nodes than Dijkstra when the heuristic is informative",
+            "Falls back to Dijkstra with h = 0"
+        ],
+        "disadvantages": [
+            "Only as good as its heuristic",
+            "A heuristic that overestimates can return a suboptimal path",
+            "Needs extra data, such as node coordinates"
+        ],
+        "resources": {
+            "youtube": "https://www.youtube.com/results?search_query=a+star+search+algorithm+tutorial"
+        }
+    },
+    "bidirectional_dijkstra": {
+        "name": "Bidirectional Dijkstra",
+        "description": "Runs Dijkstra forward from the start and backward from the target at the same time, and stops when the two searches meet. Each search only covers about half the distance.",
+        "time_complexity": "O((V + E) log V)",
+        "space_complexity": "O(V)",
+        "how_it_works": "Keep two Dijkstra searches, one over the edges and one over the edges reversed, and always advance the one whose next node is closer. Whenever an edge joins a node reached forward to a node reached backward, the sum of the two distances and the edge weight is a candidate path. Stop once the two frontiers' smallest distances add up to at least the best candidate: no undiscovered path can be shorter.",
+        "code_explanation": {
+            "algorithm": "Alternate pops between the forward and backward queues, relaxing edges as in Dijkstra, and track the best meeting path. Stop when top_forward + top_backward ≥ best.",
+            "key_insight": "On road-like graphs the area searched grows with the square of the radius, so two searches of half the radius settle about half as many nodes as one full search.",
+            "data_structure": "Two min-heaps, two distance arrays and two predecessor arrays (one per direction)."
+        },
+        "real_world_uses": [
+            "Point-to-point routing in road networks",
+            "The base of Contraction Hierarchies and other route planners",
+            "Shortest paths in social and communication networks"
+        ],
+        "when_to_use": [
+            "One start and one target, with no useful heuristic",
+            "Large graphs with non-negative weights"
+        ],
+        "when_not_to_use": [
+            "Distances to every node are wanted",
+            "Negative edge weights",
+            "Directed graphs whose reverse edges are not available"
+        ],
+        "advantages": [
+            "Needs no coordinates or heuristic",
+            "Settles far fewer nodes than one-sided Dijkstra on large graphs",
+            "Stays optimal"
+        ],
+        "disadvantages": [
+            "The stopping rule is subtle: the first meeting node is not always on the shortest path",
+            "Twice the bookkeeping",
+            "Little gain on small or densely connected graphs"
+        ],
+        "resources": {
+            "youtube": "https://www.youtube.com/results?search_query=bidirectional+dijkstra+algorithm"
+        }
+    },
+    "bidirectional_bfs": {
+        "name": "Bidirectional BFS",
+        "description": "Finds a path with the fewest edges between two nodes by growing BFS layers from both ends until they touch.",
+        "time_complexity": "O(b^(d/2))",
+        "space_complexity": "O(b^(d/2))",
+        "how_it_works": "Keep a BFS frontier from the start (over edges) and one from the target (over reversed edges). Expand the smaller frontier by a whole layer at a time. The first node reached by both searches lies on a shortest path; join the two search trees through it.",
+        "code_explanation": {
+            "algorithm": "While neither frontier is empty, expand the smaller one layer by layer; stop at the first node the other side has already seen, then walk both parent links from it.",
+            "key_insight": "With branching factor b and distance d, one BFS touches about b^d nodes but two half-depth searches touch about 2·b^(d/2).",
+            "data_structure": "Two frontier lists, two seen sets and two parent arrays."
+        },
+        "real_world_uses": [
+            "Degrees of separation in social networks",
+            "Word ladder and other puzzle solvers",
+            "Connectivity queries in large unweighted graphs"
+        ],
+        "when_to_use": [
+            "Unweighted graphs with a single target",
+            "High branching factor, where one-sided BFS explodes"
+        ],
+        "when_not_to_use": [
+            "Weighted edges (use bidirectional Dijkstra)",
+            "The full BFS order or all distances are wanted"
+        ],
+        "advantages": [
+            "Exponentially fewer nodes than BFS for deep targets",
+            "Simple: two BFS loops and a meeting test"
+        ],
+        "disadvantages": [
+            "Needs the reverse edges for directed graphs",
+            "Counts edges, not weights"
+        ],
+        "resources": {
+            "youtube": "https://www.youtube.com/results?search_query=bidirectional+search+bfs",
+            "visualgo": "https://visualgo.net/en/dfsbfs"
+        }
+    },
     "prim": {
         "name": "Prim's Algorithm",
         "description": "Builds a Minimum Spanning Tree by greedily adding the cheapest edge connecting the tree to an unvisited vertex. Grows the MST from a starting node.",
@@ -155,9 +314,9 @@ GRAPH_ALGORITHM_INFO = {
         "space_complexity": "O(V)",
         "how_it_works": "Start from any node. Add it to the MST. Among all edges connecting MST nodes to non-MST nodes, pick the one with minimum weight. Add the new node to the MST. Repeat until all nodes are in the MST. Uses a priority queue for efficient minimum edge selection.",
         "code_explanation": {
-            "algorithm": "Use a min-heap. Start with (0, start_node, None). Pop minimum weight edge, add node to MST if not visited, push all edges to unvisited neighbors.",
+            "algorithm": "Use a min-priority queue keyed by each node's cheapest edge to the tree. Start with key 0 for start_node. Pop the minimum, add it to the MST, and for each unvisited neighbor push it or lower its key if the new edge is cheaper.",
             "key_insight": "Greedy choice: always add the cheapest edge that connects the growing MST to a new vertex. This is proven to produce the optimal MST.",
-            "data_structure": "Min-heap stores (weight, node, from_node) tuples for efficient selection of the cheapest crossing edge."
+            "data_structure": "Indexed min-heap with decrease-key holds each unvisited node once, with its cheapest crossing edge. The snippet uses heapq with (weight, node, from_node) tuples instead, pushing every edge and skipping stale ones."
         },
         "real_world_uses": [
             "Network design (minimum cable to connect all buildings)",
@@ -283,6 +442,26 @@ def bfs(graph, start):
     helper(start)
     return order"""
     },
+    "iddfs": {
+        "python": """def depth_limited(graph, node, target, limit, path):
+    if node == target:
+        return path
+    if limit == 0:
+        return None
+    for neighbor in graph[node]:
+        if neighbor not in path:
+            found = depth_limited(graph, neighbor, target, limit - 1, path + [neighbor])
+            if found:
+                return found
+    return None
+
+def iddfs(graph, start, target, max_depth):
+    for limit in range(max_depth + 1):
+        found = depth_limited(graph, start, target, limit, [start])
+        if found:
+            return found
+    return None"""
+    },
     "dijkstra": {
         "python": """import heapq
 
@@ -304,6 +483,90 @@ def dijkstra(graph, start):
                 heapq.heappush(pq, (new_dist, neighbor))
     return dist, prev"""
     },
+    "astar": {
+        "python": """import heapq
+
+def astar(graph, start, target, h):
+    # h(node): lower bound on the distance from node to target
+    g = {start: 0}
+    prev = {}
+    pq = [(h(start), start)]
+    closed = set()
+    while pq:
+        f, node = heapq.heappop(pq)
+        if node in closed:
+            continue
+        if node == target:
+            path = [node]
+            while node in prev:
+                node = prev[node]
+                path.append(node)
+            return g[target], path[::-1]
+        closed.add(node)
+        for neighbor, weight in graph[node].items():
+            new_g = g[node] + weight
+            if new_g < g.get(neighbor, float('inf')):
+                g[neighbor] = new_g
+                prev[neighbor] = node
+                heapq.heappush(pq, (new_g + h(neighbor), neighbor))
+    return float('inf'), []"""
+    },
+    "bidirectional_dijkstra": {
+        "python": """import heapq
+
+def bidirectional_dijkstra(graph, reverse, start, target):
+    dist = [{start: 0}, {target: 0}]
+    pq = [[(0, start)], [(0, target)]]
+    done = [set(), set()]
+    adjacency = [graph, reverse]
+    best = 0 if start == target else float('inf')
+    while pq[0] and pq[1]:
+        if pq[0][0][0] + pq[1][0][0] >= best:
+            break
+        side = 0 if pq[0][0][0] <= pq[1][0][0] else 1
+        d, node = heapq.heappop(pq[side])
+        if node in done[side]:
+            continue
+        done[side].add(node)
+        for neighbor, weight in adjacency[side][node].items():
+            new_dist = d + weight
+            if new_dist < dist[side].get(neighbor, float('inf')):
+                dist[side][neighbor] = new_dist
+                heapq.heappush(pq[side], (new_dist, neighbor))
+            if neighbor in dist[1 - side]:
+                best = min(best, new_dist + dist[1 - side][neighbor])
+    return best"""
+    },
+    "bidirectional_bfs": {
+        "python": """def bidirectional_bfs(graph, reverse, start, target):
+    if start == target:
+        return [start]
+    parents = [{start: None}, {target: None}]
+    frontiers = [[start], [target]]
+    adjacency = [graph, reverse]
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        layer = []
+        for node in frontiers[side]:
+            for neighbor in adjacency[side][node]:
+                if neighbor in parents[side]:
+                    continue
+                parents[side][neighbor] = node
+                layer.append(neighbor)
+                if neighbor in parents[1 - side]:
+                    forward, backward = [], []
+                    n = neighbor
+                    while n is not None:
+                        forward.append(n)
+                        n = parents[0][n]
+                    n = parents[1][neighbor]
+                    while n is not None:
+                        backward.append(n)
+                        n = parents[1][n]
+                    return forward[::-1] + backward
+        frontiers[side] = layer
+    return None"""
+    },
     "prim": {
         "python": """import heapq
 
@@ -1,12 +1,35 @@
 """Pydantic request / response models for input validation."""
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Tuple
+
+from app.config import (
+    BENCHMARK_MAX_REPEAT, BENCHMARK_REPEAT, BENCHMARK_WARMUP, COMPLEXITY_MAX_SIZE, METRICS_MAX_ARRAY_SIZE,
+    RACE_MAX_LANES, TIME_TRIAL_MAX_ARRAY_SIZE,
+)
 
 
 class SortRequest(BaseModel):
-    array: List[int] = Field(..., min_length=1, max_length=500, description="Array to sort")
+    # Trace modes are further capped at MAX_ARRAY_SIZE by the route
+    array: List[int] = Field(..., min_length=1, max_length=METRICS_MAX_ARRAY_SIZE, description="Array to sort")
     algorithm: str = Field(default="bubble", description="Sorting algorithm name")
+    mode: str = Field(default="trace", description="trace (step-by-step) or metrics (operation counts only)")
+    trace_format: str = Field(default="full", description="Trace format: full (array per step) or delta")
+    granularity: str = Field(default="fine", description="fine (one step per comparison) or coarse (one range step per scan)")
+    verbosity: str = Field(default="full", description="Step descriptions: none, summary (template id + params) or full")
+    session: bool = Field(default=False, description="Store the trace server-side and return a trace_id")
+    max_frames: Optional[int] = Field(default=None, ge=2, description="Downsample the trace to at most this many steps")
+
+
+class RaceRequest(BaseModel):
+    # Races are played whole: /api/sort options such as max_frames or session are refused, not ignored
+    model_config = ConfigDict(extra="forbid")
+
+    array: List[int] = Field(..., min_length=1, max_length=METRICS_MAX_ARRAY_SIZE, description="Array every algorithm sorts")
+    algorithms: List[str] = Field(..., min_length=2, max_length=RACE_MAX_LANES, description="Sorting algorithm names to race")
+    trace_format: str = Field(default="delta", description="Trace format: full (array per step) or delta")
+    granularity: str = Field(default="fine", description="fine (one step per comparison) or coarse (one range step per scan)")
+    verbosity: str = Field(default="full", description="Step descriptions: none, summary (template id + params) or full")
 
 
 class GraphSolveRequest(BaseModel):
@@ -14,11 +37,32 @@ class GraphSolveRequest(BaseModel):
     algorithm: str = Field(default="bfs", description="Graph algorithm name")
     start: str = Field(..., description="Start node label")
     directed: bool = Field(default=False)
-    target: Optional[str] = Field(default=None, description="Target node (Dijkstra)")
+    target: Optional[str] = Field(default=None, description="Target node (Dijkstra, iddfs, A*, bidirectional searches)")
+    depth_limit: Optional[int] = Field(default=None, ge=0, description="Depth limit (dfs, iddfs)")
+    heuristic: Optional[str] = Field(default=None, description="A* heuristic: euclidean, manhattan or zero "
+                                                               "(default: euclidean given positions, else zero)")
+    positions: Optional[Dict[str, Tuple[float, float]]] = Field(default=None,
+                                                                description="Node (x, y) coordinates for A*")
+    trace_format: str = Field(default="full", description="Trace format: full (state snapshot per step) or delta")
+    session: bool = Field(default=False, description="Store the trace server-side and return a trace_id")
+    max_frames: Optional[int] = Field(default=None, ge=2, description="Downsample the trace to at most this many steps")
 
 
 class TimeTrialRequest(BaseModel):
-    array: List[int] = Field(..., min_length=1, max_length=500, description="Array for time trial")
+    array: List[int] = Field(..., min_length=1, max_length=TIME_TRIAL_MAX_ARRAY_SIZE, description="Array for time trial")
+    mode: str = Field(default="single", description="single (one timed run) or benchmark (warmup + repeated samples)")
+    repeat: int = Field(default=BENCHMARK_REPEAT, ge=3, le=BENCHMARK_MAX_REPEAT, description="Timed samples per algorithm (benchmark)")
+    warmup: int = Field(default=BENCHMARK_WARMUP, ge=0, le=10, description="Untimed runs before sampling (benchmark)")
+
+
+class ComplexitySweepRequest(BaseModel):
+    algorithms: Optional[List[str]] = Field(default=None, description="Sorting algorithms to sweep (default: all)")
+    distributions: Optional[List[str]] = Field(default=None, description="Input distributions (default: all)")
+    min_size: int = Field(default=64, ge=2, description="Smallest input size")
+    max_size: int = Field(default=1024, le=COMPLEXITY_MAX_SIZE, description="Largest input size")
+    points: int = Field(default=5, ge=2, le=12, description="Sizes in the geometric range")
+    repeat: int = Field(default=3, ge=1, le=BENCHMARK_MAX_REPEAT, description="Timed samples per size and distribution")
+    seed: int = Field(default=0, description="Seed for the generated inputs")
 
 
 class ExportRequest(BaseModel):
@@ -2,43 +2,101 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse
 
-from app.algorithms.graph import GRAPH_REGISTRY
+from app.algorithms.binary_trace import TRACE_MEDIA_TYPE
+from app.algorithms.graph import DEPTH_LIMITED, GRAPH_REGISTRY, HEURISTICS, TARGETED
 from app.data.graph_metadata import GRAPH_ALGORITHM_INFO, GRAPH_CODE_SNIPPETS
 from app.models.schemas import GraphSolveRequest
+from app.routes.sorting import TRACE_FORMATS
+from app.services.admission import admit_graph, admission_headers
+from app.services.executor import solve_executor
+from app.services.result_cache import result_cache, canonical_key, cached_response
+from app.services.solvers import solve_graph, render_graph
+from app.services.trace_store import trace_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["graph"])
 
 
+def check_graph_request(payload: GraphSolveRequest):
+    if not payload.graph:
+        raise HTTPException(status_code=400, detail="Graph cannot be empty")
+    if payload.start not in payload.graph:
+        raise HTTPException(status_code=400, detail=f"Start node '{payload.start}' not in graph")
+    if payload.algorithm not in GRAPH_REGISTRY:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {payload.algorithm}")
+    if payload.trace_format not in TRACE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown trace format: {payload.trace_format}")
+    if payload.depth_limit is not None and payload.algorithm not in DEPTH_LIMITED:
+        raise HTTPException(status_code=400, detail=f"depth_limit applies to {', '.join(DEPTH_LIMITED)} only")
+    if payload.algorithm in TARGETED:
+        if not payload.target:
+            raise HTTPException(status_code=400, detail=f"{payload.algorithm} needs a target")
+        if payload.target not in payload.graph and not any(payload.target in edges for edges in payload.graph.values()):
+            raise HTTPException(status_code=400, detail=f"Target node '{payload.target}' not in graph")
+    if payload.algorithm != "astar" and (payload.heuristic is not None or payload.positions is not None):
+        raise HTTPException(status_code=400, detail="heuristic and positions apply to astar only")
+    if payload.heuristic is not None and payload.heuristic not in HEURISTICS:
+        raise HTTPException(status_code=400, detail=f"Unknown heuristic: {payload.heuristic}")
+    if payload.heuristic not in (None, "zero") or payload.positions is not None:
+        nodes = set(payload.graph).union(*payload.graph.values())
+        missing = sorted(nodes - set(payload.positions or {}))
+        if missing:
+            raise HTTPException(status_code=400, detail=f"No position for nodes: {', '.join(missing[:10])}")
+
+
 @router.post("/graph-solve")
-async def graph_solve(payload: GraphSolveRequest):
+async def graph_solve(payload: GraphSolveRequest, request: Request):
     try:
+        check_graph_request(payload)
         graph = payload.graph
         algorithm = payload.algorithm
         start = payload.start
         directed = payload.directed
         target = payload.target
-
-        # Ensure weights are numeric
-        for node in graph:
-            if isinstance(graph[node], dict):
-                graph[node] = {k: float(v) for k, v in graph[node].items()}
-
-        if not graph:
-            raise HTTPException(status_code=400, detail="Graph cannot be empty")
-        if start not in graph:
-            raise HTTPException(status_code=400, detail=f"Start node '{start}' not in graph")
-        if algorithm not in GRAPH_REGISTRY:
-            raise HTTPException(status_code=400, detail=f"Unknown algorithm: {algorithm}")
-
-        solve_fn = GRAPH_REGISTRY[algorithm]
-        steps = solve_fn(graph, start, directed, target=target)
-
-        logger.info("Graph %s from '%s' on %d nodes", algorithm, start, len(graph))
-        return {"steps": steps, "algorithm": algorithm}
+        trace_format = payload.trace_format
+        depth_limit = payload.depth_limit
+        heuristic = payload.heuristic
+        positions = payload.positions
+
+        binary = TRACE_MEDIA_TYPE in request.headers.get("accept", "") and not payload.session
+        media_type = TRACE_MEDIA_TYPE if binary else "application/json"
+        # Sessions keep the recorded changes and page them in delta format
+        estimate = admit_graph(algorithm, graph, media_type, payload.max_frames,
+                               "delta" if payload.session else trace_format, depth_limit, start, target)
+        headers = admission_headers(estimate, "accepted")
+
+        if payload.session:
+            trace = await solve_executor.run(solve_graph, algorithm, graph, start, directed, target, depth_limit,
+                                             heuristic, positions, payload.max_frames)
+            logger.info("Graph %s from '%s' on %d nodes", algorithm, start, len(graph))
+            try:
+                trace_id = trace_store.put("graph", trace, algorithm=algorithm)
+            except ValueError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            return JSONResponse({"trace_id": trace_id, "total_steps": len(trace), "algorithm": algorithm,
+                                 "keyframe_interval": trace.interval}, headers=headers)
+
+        async def compute():
+            return await solve_executor.run(
+                render_graph, algorithm, graph, start, directed, target, media_type, payload.max_frames, trace_format,
+                depth_limit, heuristic, positions,
+            )
+
+        # Neighbour order drives traversal order, so the graph key keeps insertion order
+        cache_key = canonical_key(
+            "graph", algorithm=algorithm, start=start, directed=directed, target=target, media_type=media_type,
+            max_frames=payload.max_frames, trace_format=trace_format, depth_limit=depth_limit,
+            heuristic=heuristic, positions=positions,
+            graph=[[node, list(edges.items())] for node, edges in graph.items()],
+        )
+        entry, status = await result_cache.get_or_compute(cache_key, compute, media_type)
+        response = cached_response(request, entry, status)
+        response.headers.update(headers)
+        return response
 
     except HTTPException:
         raise
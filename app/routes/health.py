@@ -3,6 +3,10 @@
 from datetime import datetime
 from fastapi import APIRouter
 
+from app.services.executor import solve_executor
+from app.services.jobs import job_manager
+from app.services.result_cache import result_cache
+
 router = APIRouter(tags=["health"])
 
 
@@ -12,4 +16,7 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "version": "4.0.0",
+        "solver": solve_executor.stats(),
+        "cache": result_cache.stats(),
+        "jobs": job_manager.stats(),
     }
@@ -0,0 +1,84 @@
+"""Background job route handlers (submit, poll, cancel)."""
+
+import logging
+from typing import Union
+
+from fastapi import APIRouter, HTTPException, Response
+
+from app.config import ADMISSION_MAX_RECORDED_STEPS
+from app.models.schemas import GraphSolveRequest, SortRequest
+from app.routes.graph import check_graph_request
+from app.routes.sorting import check_sort_request, check_trace_size
+from app.services.admission import AdmissionRejected, admission_headers, admit_graph, admit_sort
+from app.services.jobs import graph_job, job_manager, sort_job
+from app.services.trace_store import trace_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired")
+    return job
+
+
+@router.post("", status_code=202)
+async def create_job(payload: Union[SortRequest, GraphSolveRequest], response: Response):
+    """Accepts a /api/sort or /api/graph-solve payload; the finished trace is stored as a trace session."""
+    try:
+        if isinstance(payload, SortRequest):
+            check_sort_request(payload)
+            if payload.mode != "trace":
+                raise HTTPException(status_code=400, detail="Jobs record traces; use mode 'trace'")
+            array = [int(x) for x in payload.array]
+            check_trace_size(array, payload.trace_format)
+            estimate, admission = admit_sort(
+                payload.algorithm, array, payload.trace_format, "application/json", payload.granularity,
+                payload.verbosity, payload.max_frames, stream=False, session=True,
+                max_steps=min(ADMISSION_MAX_RECORDED_STEPS, trace_store.max_steps),
+            )
+            if admission == "metrics":
+                raise AdmissionRejected(
+                    f"Predicted trace of {estimate['steps']} steps is too large to keep; use mode 'metrics'", estimate,
+                )
+            granularity = "coarse" if admission == "coarse" else payload.granularity
+            job = job_manager.submit(
+                "sort", payload.algorithm, sort_job, payload.algorithm, array, payload.trace_format,
+                payload.max_frames, granularity, payload.verbosity, estimated_steps=estimate["steps"],
+            )
+        else:
+            check_graph_request(payload)
+            estimate = admit_graph(payload.algorithm, payload.graph, "application/json", payload.max_frames, "delta",
+                                   payload.depth_limit, payload.start, payload.target)
+            admission = "accepted"
+            job = job_manager.submit(
+                "graph", payload.algorithm, graph_job, payload.algorithm, payload.graph, payload.start,
+                payload.directed, payload.target, payload.depth_limit, payload.heuristic, payload.positions,
+                payload.max_frames,
+                estimated_steps=estimate["steps"],
+            )
+
+        logger.info("Queued %s job %s (%s, ~%d steps)", job["kind"], job["job_id"], job["algorithm"], estimate["steps"])
+        response.headers.update(admission_headers(estimate, admission))
+        response.headers["Location"] = f"{router.prefix}/{job['job_id']}"
+        return job_manager.view(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in create_job")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str):
+    return job_manager.view(get_job(job_id))
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    get_job(job_id)
+    return job_manager.view(job_manager.cancel(job_id))
@@ -0,0 +1,254 @@
+"""
+WebSocket playback route.
+The client sends one /api/sort or /api/graph-solve payload (plus optional
+`speed` in frames per second and `paused`), then control messages:
+{"action": "pause"}, {"action": "resume"}, {"action": "speed", "value": fps}
+and {"action": "seek", "value": frame}. The server pushes "frame" messages
+at the requested speed, "state" after each control, and "end" when the run
+is over; the socket stays open for seeks until the client closes it.
+/ws/race takes a RaceRequest instead and plays the algorithms side by side:
+frame t carries `steps`, step t of each algorithm still running.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.algorithms.descriptions import VERBOSITIES
+from app.algorithms.sorting import GRANULARITIES, SORTING_REGISTRY
+from app.config import ADMISSION_MAX_RECORDED_STEPS, PLAYBACK_DEFAULT_FPS, PLAYBACK_MAX_FPS
+from app.models.schemas import GraphSolveRequest, RaceRequest, SortRequest
+from app.routes.graph import check_graph_request
+from app.routes.sorting import TRACE_FORMATS, check_sort_request, check_trace_size
+from app.services.admission import AdmissionRejected, admit_graph, admit_sort
+from app.services.executor import solve_executor
+from app.services.playback import GraphPlayback, RacePlayback, SortPlayback
+from app.services.solvers import solve_graph
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["playback"])
+
+CONTROL_ACTIONS = ("pause", "resume", "speed", "seek")
+
+
+def clamp_speed(value: Any) -> float:
+    speed = float(value)
+    if not speed > 0:
+        raise ValueError("speed must be positive")
+    return min(speed, PLAYBACK_MAX_FPS)
+
+
+def parse(model, message: Dict[str, Any]):
+    try:
+        return model.model_validate(message)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+
+async def open_playback(message: Dict[str, Any]):
+    """The playback and its "start" message for the first client message; raises HTTPException."""
+    payload = parse(GraphSolveRequest if "graph" in message else SortRequest, message)
+
+    if isinstance(payload, SortRequest):
+        check_sort_request(payload)
+        array = [int(x) for x in payload.array]
+        check_trace_size(array, payload.trace_format)
+        # Played steps are recorded as they go, so admitted like a session: on step count alone
+        estimate, admission = admit_sort(
+            payload.algorithm, array, payload.trace_format, "application/json", payload.granularity,
+            payload.verbosity, None, stream=False, session=True, max_steps=ADMISSION_MAX_RECORDED_STEPS,
+        )
+        if admission == "metrics":
+            raise AdmissionRejected(
+                f"Predicted trace of {estimate['steps']} steps is too long to play; use /api/sort mode 'metrics'",
+                estimate,
+            )
+        granularity = "coarse" if admission == "coarse" else payload.granularity
+        playback = SortPlayback(payload.algorithm, array, payload.trace_format, granularity, payload.verbosity)
+        start = {"kind": "sort", "algorithm": payload.algorithm, "granularity": granularity,
+                 "estimated_steps": estimate["steps"]}
+    else:
+        check_graph_request(payload)
+        estimate = admit_graph(payload.algorithm, payload.graph, "application/json", payload.max_frames,
+                               payload.trace_format, payload.depth_limit, payload.start, payload.target)
+        # The session's slot (see serve_playback) covers the solve
+        trace = await solve_executor.run_held(solve_graph, payload.algorithm, payload.graph, payload.start,
+                                              payload.directed, payload.target, payload.depth_limit,
+                                              payload.heuristic, payload.positions, payload.max_frames)
+        playback = GraphPlayback(trace, payload.trace_format)
+        start = {"kind": "graph", "algorithm": payload.algorithm, "estimated_steps": estimate["steps"]}
+    start.update(playback.header())
+    return playback, start
+
+
+async def open_race(message: Dict[str, Any]):
+    payload = parse(RaceRequest, message)
+    algorithms = list(dict.fromkeys(payload.algorithms))
+    unknown = [algorithm for algorithm in algorithms if algorithm not in SORTING_REGISTRY]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {unknown[0]}")
+    if payload.trace_format not in TRACE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown trace format: {payload.trace_format}")
+    if payload.granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown granularity: {payload.granularity}")
+    if payload.verbosity not in VERBOSITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown verbosity: {payload.verbosity}")
+    array = [int(x) for x in payload.array]
+    check_trace_size(array, payload.trace_format)
+
+    # Each lane is admitted like a /ws/play sort; one coarse lane makes the race coarse, to keep frames comparable
+    estimated, admissions = {}, set()
+    for algorithm in algorithms:
+        estimate, admission = admit_sort(
+            algorithm, array, payload.trace_format, "application/json", payload.granularity, payload.verbosity,
+            None, stream=False, session=True, max_steps=ADMISSION_MAX_RECORDED_STEPS,
+        )
+        if admission == "metrics":
+            raise AdmissionRejected(
+                f"Predicted {algorithm} trace of {estimate['steps']} steps is too long to race", estimate,
+            )
+        estimated[algorithm] = estimate["steps"]
+        admissions.add(admission)
+    granularity = "coarse" if "coarse" in admissions else payload.granularity
+
+    playback = RacePlayback(algorithms, array, payload.trace_format, granularity, payload.verbosity)
+    return playback, {"kind": "race", "granularity": granularity, "estimated_steps": estimated,
+                      **playback.header()}
+
+
+async def receive_controls(websocket: WebSocket, controls: asyncio.Queue):
+    """Forward client messages to the playback loop; None means the client went away."""
+    while True:
+        try:
+            message = await websocket.receive_json()
+        except (WebSocketDisconnect, RuntimeError):
+            await controls.put(None)
+            return
+        except ValueError:
+            # Not JSON; answered like an unknown action
+            message = {}
+        await controls.put(message)
+
+
+async def serve_playback(websocket: WebSocket, open_fn):
+    """
+    Open a playback from the first message with open_fn, then pace its
+    frames until the client leaves. Playbacks compute as they play, so a
+    session holds a solve slot (one per race lane) until it ends; when the
+    solvers are saturated or the run is not admitted, the socket is closed
+    with 1008 (policy violation) after an error message.
+    """
+    await websocket.accept()
+    try:
+        message = await websocket.receive_json()
+        if not isinstance(message, dict):
+            raise HTTPException(status_code=400, detail="Expected a JSON object payload")
+        paused = bool(message.pop("paused", False))
+        speed = clamp_speed(message.pop("speed", PLAYBACK_DEFAULT_FPS))
+    except WebSocketDisconnect:
+        return
+    except (HTTPException, ValueError) as e:
+        await reject(websocket, e)
+        return
+
+    try:
+        async with solve_executor.slot():
+            try:
+                playback, start = await open_fn(message)
+            except (HTTPException, ValueError) as e:
+                await reject(websocket, e)
+                return
+            # Races take a slot per lane
+            async with solve_executor.slot(playback.slots - 1):
+                await play_frames(websocket, playback, start, speed, paused)
+    except HTTPException as e:
+        # No slot free
+        await reject(websocket, e)
+    except WebSocketDisconnect:
+        pass
+
+
+async def reject(websocket: WebSocket, error: Exception):
+    status, detail = (error.status_code, error.detail) if isinstance(error, HTTPException) else (400, str(error))
+    await websocket.send_json({"type": "error", "status": status, "detail": detail})
+    await websocket.close(code=1008)
+
+
+async def play_frames(websocket: WebSocket, playback, start: Dict[str, Any], speed: float, paused: bool):
+    """Send "start", then pace the playback's frames and answer controls until the client leaves."""
+    await websocket.send_json({"type": "start", "speed": speed, "paused": paused, **start})
+    controls: asyncio.Queue = asyncio.Queue()
+    receiver = asyncio.create_task(receive_controls(websocket, controls))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    finished = False
+    try:
+        while True:
+            timeout = None if paused or finished else max(deadline - loop.time(), 0)
+            try:
+                control = await asyncio.wait_for(controls.get(), timeout)
+            except asyncio.TimeoutError:
+                try:
+                    step = await run_in_threadpool(playback.next_frame)
+                except ValueError as e:
+                    finished = True
+                    await websocket.send_json({"type": "error", "status": 413, "detail": str(e)})
+                    continue
+                if step is None:
+                    finished = True
+                    await websocket.send_json({"type": "end", **playback.footer()})
+                else:
+                    await websocket.send_json({"type": "frame", "frame": playback.position, playback.FRAME_KEY: step})
+                # Late ticks are not made up with a burst of frames
+                deadline = max(deadline, loop.time() - 1 / speed) + 1 / speed
+                continue
+
+            if control is None:
+                break
+            action = control.get("action") if isinstance(control, dict) else None
+            try:
+                if action == "pause":
+                    paused = True
+                elif action == "resume":
+                    paused = False
+                    deadline = loop.time()
+                elif action == "speed":
+                    speed = clamp_speed(control.get("value"))
+                elif action == "seek":
+                    frame = int(control.get("value"))
+                    step = await run_in_threadpool(playback.seek, frame)
+                    finished = False
+                    deadline = loop.time() + 1 / speed
+                    await websocket.send_json({"type": "frame", "frame": playback.position, playback.FRAME_KEY: step,
+                                               "seek": True})
+                else:
+                    raise ValueError(f"Unknown action; expected one of {', '.join(CONTROL_ACTIONS)}")
+            except (TypeError, ValueError) as e:
+                await websocket.send_json({"type": "error", "status": 400, "detail": str(e)})
+                continue
+            await websocket.send_json({"type": "state", "paused": paused, "speed": speed,
+                                       "frame": playback.position})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.exception("Error in playback")
+        await websocket.send_json({"type": "error", "status": 500, "detail": str(e)})
+        await websocket.close(code=1011)
+    finally:
+        receiver.cancel()
+    logger.info("Playback ended at frame %d", playback.position)
+
+
+@router.websocket("/ws/play")
+async def play(websocket: WebSocket):
+    await serve_playback(websocket, open_playback)
+
+
+@router.websocket("/ws/race")
+async def race(websocket: WebSocket):
+    await serve_playback(websocket, open_race)
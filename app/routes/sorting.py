@@ -1,18 +1,33 @@
 """Sorting API route handlers."""
 
-import time
 import io
 import csv
+import json
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.algorithms.sorting import SORTING_REGISTRY
+from app.algorithms.sorting import SORTING_REGISTRY, GRANULARITIES, sort_events
+from app.algorithms.binary_trace import TRACE_MEDIA_TYPE
+from app.algorithms.descriptions import DESCRIPTION_TEMPLATES, VERBOSITIES
+from app.algorithms.trace import keyframe_interval, iter_sort_steps, iter_ndjson
+from app.config import (
+    ADMISSION_MAX_RECORDED_STEPS, FULL_TRACE_MAX_ARRAY_SIZE, MAX_ARRAY_SIZE, TIME_TRIAL_DEADLINE_SECONDS,
+)
 from app.data.sorting_metadata import ALGORITHM_INFO
 from app.data.sorting_code import CODE_SNIPPETS
-from app.models.schemas import SortRequest, TimeTrialRequest, ExportRequest
+from app.models.schemas import SortRequest, TimeTrialRequest, ComplexitySweepRequest, ExportRequest
+from app.services.admission import admit_metrics, admit_sort, admission_headers
+from app.services.complexity import DISTRIBUTIONS, geometric_sizes, iter_sweep
+from app.services.executor import DeadlineExceeded, solve_executor
+from app.services.result_cache import result_cache, canonical_key, cached_response
+from app.services.solvers import solve_sort, render_sort, iter_sort_frames
+from app.services.time_trial import (
+    TIME_TRIAL_MODES, fastest_is_significant, iter_time_trial, metrics_entry, rank_results,
+)
+from app.services.trace_store import trace_store
 
 logger = logging.getLogger(__name__)
 
@@ -24,33 +39,130 @@ SPACE_COMPLEXITY = {
     "merge": "O(n)", "quick": "O(log n)", "heap": "O(1)", "counting": "O(k)",
 }
 
+TRACE_FORMATS = ("full", "delta")
+SORT_MODES = ("trace", "metrics")
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def wants_binary(request: Request) -> bool:
+    return TRACE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def check_sort_request(payload: SortRequest):
+    if payload.algorithm not in SORTING_REGISTRY:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {payload.algorithm}")
+    if payload.trace_format not in TRACE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown trace format: {payload.trace_format}")
+    if payload.mode not in SORT_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode: {payload.mode}")
+    if payload.granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown granularity: {payload.granularity}")
+    if payload.verbosity not in VERBOSITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown verbosity: {payload.verbosity}")
+
+
+def check_trace_size(array, trace_format: str):
+    if len(array) > MAX_ARRAY_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Arrays over {MAX_ARRAY_SIZE} elements are only supported with mode 'metrics'",
+        )
+    if trace_format == "full" and len(array) > FULL_TRACE_MAX_ARRAY_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Arrays over {FULL_TRACE_MAX_ARRAY_SIZE} elements require trace_format 'delta'",
+        )
+
 
 @router.post("/sort")
-async def sort_array(payload: SortRequest):
+async def sort_array(payload: SortRequest, request: Request, stream: bool = False):
     try:
+        check_sort_request(payload)
         algorithm = payload.algorithm
-        if algorithm not in SORTING_REGISTRY:
-            raise HTTPException(status_code=400, detail=f"Unknown algorithm: {algorithm}")
+        trace_format = payload.trace_format
+        granularity = payload.granularity
+        verbosity = payload.verbosity
+
+        binary = wants_binary(request) and payload.mode == "trace" and not payload.session
+        if binary:
+            # The binary encoding always carries writes; clients replay from `initial`
+            trace_format = "delta"
 
         array = [int(x) for x in payload.array]
-        start_time = time.perf_counter()
+        if payload.mode == "metrics":
+            return await run_metrics(algorithm, array)
+
+        check_trace_size(array, trace_format)
 
-        sort_fn = SORTING_REGISTRY[algorithm]
-        steps = sort_fn(array)
+        streaming = not binary and wants_stream(request, stream)
+        media_type = TRACE_MEDIA_TYPE if binary else "application/json"
+        max_steps = ADMISSION_MAX_RECORDED_STEPS
+        if payload.session:
+            # Sessions must also fit the trace store
+            max_steps = min(max_steps, trace_store.max_steps)
+        estimate, admission = admit_sort(
+            algorithm, array, trace_format, media_type, granularity, verbosity, payload.max_frames,
+            streaming, payload.session, max_steps,
+        )
+        headers = admission_headers(estimate, admission)
+        if admission == "metrics":
+            logger.info("Downgraded %s trace for %d elements to metrics", algorithm, len(array))
+            return JSONResponse(await run_metrics(algorithm, array), headers=headers)
+        if admission == "coarse":
+            granularity = "coarse"
 
-        end_time = time.perf_counter()
-        execution_time_us = (end_time - start_time) * 1_000_000
+        if streaming:
+            # Steps are generated and flushed as they are produced (in Starlette's threadpool)
+            header = {
+                "algorithm": algorithm,
+                "array_size": len(array),
+                "trace_format": trace_format,
+                "granularity": granularity,
+                "verbosity": verbosity,
+                "initial": array,
+                "keyframe_interval": keyframe_interval(len(array)),
+            }
+            if payload.max_frames is None:
+                events = sort_events(algorithm, array, granularity)
+                steps = iter_sort_steps(array, events, trace_format, verbosity=verbosity)
+            else:
+                steps = iter_sort_frames(algorithm, array, trace_format, payload.max_frames, granularity, verbosity)
+            logger.info("Streaming %s trace for %d elements", algorithm, len(array))
+            body = solve_executor.hold(iter_ndjson(header, steps))
+            return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
 
-        final_step = steps[-1]
-        logger.info("Sorted %d elements with %s in %.0fμs", len(array), algorithm, execution_time_us)
-        return {
-            "steps": steps,
-            "execution_time_us": round(execution_time_us, 2),
-            "algorithm": algorithm,
-            "array_size": len(array),
-            "total_comparisons": final_step.get("total_comparisons", 0),
-            "total_swaps": final_step.get("total_swaps", 0),
-        }
+        if payload.session:
+            solved = await solve_executor.run(
+                solve_sort, algorithm, array, trace_format, payload.max_frames, granularity, verbosity,
+            )
+            result = solved["summary"]
+            # Keep the trace server-side; the client pages it via /api/traces/{trace_id}
+            try:
+                result["trace_id"] = trace_store.put(
+                    "sort", solved["trace"], algorithm=algorithm, initial=array, verbosity=verbosity,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            result["total_steps"] = len(solved["trace"])
+            return JSONResponse(result, headers=headers)
+
+        async def compute():
+            return await solve_executor.run(
+                render_sort, algorithm, array, trace_format, media_type, payload.max_frames, granularity, verbosity,
+            )
+
+        cache_key = canonical_key(
+            "sort", algorithm=algorithm, array=array, trace_format=trace_format, media_type=media_type,
+            max_frames=payload.max_frames, granularity=granularity, verbosity=verbosity,
+        )
+        entry, status = await result_cache.get_or_compute(cache_key, compute, media_type)
+        response = cached_response(request, entry, status)
+        response.headers.update(headers)
+        return response
 
     except HTTPException:
         raise
@@ -59,6 +171,36 @@ async def sort_array(payload: SortRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def run_metrics(algorithm, array):
+    admit_metrics(algorithm, array)
+    try:
+        execution_time_us, metrics = await solve_executor.run(
+            metrics_entry, algorithm, array, TIME_TRIAL_DEADLINE_SECONDS,
+        )
+    except DeadlineExceeded:
+        raise HTTPException(
+            status_code=504, detail=f"{algorithm} sort exceeded the {TIME_TRIAL_DEADLINE_SECONDS:g}s deadline",
+        )
+    logger.info("Metrics for %d elements with %s in %.0fμs", len(array), algorithm, execution_time_us)
+    return {
+        "mode": "metrics",
+        "algorithm": algorithm,
+        "array_size": len(array),
+        "execution_time_us": round(execution_time_us, 2),
+        "total_comparisons": metrics["comparisons"],
+        "total_swaps": metrics["swaps"],
+        "reads": metrics["reads"],
+        "writes": metrics["writes"],
+        "array": metrics["array"],
+    }
+
+
+@router.get("/description-templates")
+async def get_description_templates():
+    """Template table for steps requested with verbosity 'summary'."""
+    return {"verbosities": list(VERBOSITIES), "templates": DESCRIPTION_TEMPLATES}
+
+
 @router.get("/algorithm-info/{algorithm}")
 async def get_algorithm_info(algorithm: str):
     if algorithm not in ALGORITHM_INFO:
@@ -80,43 +222,107 @@ async def get_algorithm_code(algorithm: str, language: str = "python"):
 
 
 @router.post("/time-trial")
-async def time_trial(payload: TimeTrialRequest):
+async def time_trial(payload: TimeTrialRequest, request: Request, stream: bool = False):
     try:
+        if payload.mode not in TIME_TRIAL_MODES:
+            raise HTTPException(status_code=400, detail=f"Unknown mode: {payload.mode}")
         array = [int(x) for x in payload.array]
-        results = []
+        solve_executor.check_trial_pool()
 
-        for algo_name, sort_fn in SORTING_REGISTRY.items():
-            try:
-                start_time = time.perf_counter()
-                steps = sort_fn(array)
-                end_time = time.perf_counter()
-                execution_time_us = (end_time - start_time) * 1_000_000
-                final_step = steps[-1]
-
-                results.append({
-                    "algorithm": algo_name,
-                    "execution_time_us": round(execution_time_us, 2),
-                    "comparisons": final_step.get("total_comparisons", 0),
-                    "swaps": final_step.get("total_swaps", 0),
-                    "total_steps": len(steps),
-                    "space_complexity": SPACE_COMPLEXITY.get(algo_name, "?"),
-                })
-            except Exception as e:
-                results.append({"algorithm": algo_name, "error": str(e)})
-
-        results.sort(key=lambda x: x.get("execution_time_us", float("inf")))
-        logger.info("Time trial completed for %d elements", len(array))
-        return {
-            "results": results,
-            "array_size": len(array),
-            "fastest": results[0]["algorithm"] if results else None,
-        }
+        if wants_stream(request, stream):
+            body = solve_executor.hold(stream_time_trial(array, payload))
+            return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE)
 
+        # The trial fans out to the process pool itself; it only needs admission
+        async with solve_executor.slot():
+            results = rank_results([
+                with_space_complexity(r)
+                async for r in iter_time_trial(array, mode=payload.mode, repeat=payload.repeat, warmup=payload.warmup)
+            ])
+        logger.info("Time trial (%s) completed for %d elements", payload.mode, len(array))
+        return {"results": results, **trial_summary(array, results, payload)}
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error in time_trial")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def with_space_complexity(result):
+    result["space_complexity"] = SPACE_COMPLEXITY.get(result["algorithm"], "?")
+    return result
+
+
+def fastest_of(results):
+    finished = [r for r in results if "execution_time_us" in r]
+    return finished[0]["algorithm"] if finished else None
+
+
+def trial_summary(array, results, payload: TimeTrialRequest):
+    """Response fields besides the results, which must already be ranked."""
+    summary = {"array_size": len(array), "mode": payload.mode, "fastest": fastest_of(results)}
+    if payload.mode == "benchmark":
+        summary.update(
+            repeat=payload.repeat,
+            warmup=payload.warmup,
+            fastest_significant=fastest_is_significant(results),
+        )
+    return summary
+
+
+async def stream_time_trial(array, payload: TimeTrialRequest):
+    """NDJSON: one result line per algorithm as it finishes, then a summary line."""
+    results = []
+    async for result in iter_time_trial(array, mode=payload.mode, repeat=payload.repeat, warmup=payload.warmup):
+        results.append(with_space_complexity(result))
+        yield json.dumps({"type": "result", **result}) + "\n"
+    logger.info("Streamed time trial (%s) for %d elements", payload.mode, len(array))
+    yield json.dumps({"type": "summary", **trial_summary(array, rank_results(results), payload)}) + "\n"
+
+
+@router.post("/complexity-sweep")
+async def complexity_sweep(payload: ComplexitySweepRequest, request: Request, stream: bool = False):
+    try:
+        algorithms = list(dict.fromkeys(payload.algorithms or SORTING_REGISTRY))
+        distributions = list(dict.fromkeys(payload.distributions or DISTRIBUTIONS))
+        for algorithm in algorithms:
+            if algorithm not in SORTING_REGISTRY:
+                raise HTTPException(status_code=400, detail=f"Unknown algorithm: {algorithm}")
+        for distribution in distributions:
+            if distribution not in DISTRIBUTIONS:
+                raise HTTPException(status_code=400, detail=f"Unknown distribution: {distribution}")
+        if payload.min_size >= payload.max_size:
+            raise HTTPException(status_code=400, detail="min_size must be below max_size")
+        sizes = geometric_sizes(payload.min_size, payload.max_size, payload.points)
+        sweep = iter_sweep(algorithms, sizes, distributions, payload.repeat, payload.seed)
+        header = {"sizes": sizes, "distributions": distributions, "repeat": payload.repeat, "seed": payload.seed}
+        solve_executor.check_trial_pool()
+
+        if wants_stream(request, stream):
+            body = solve_executor.hold(stream_sweep(header, sweep))
+            return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE)
+
+        # Like the time trial, the sweep fans out to the process pool itself
+        async with solve_executor.slot():
+            results = sorted([r async for r in sweep], key=lambda r: algorithms.index(r["algorithm"]))
+        logger.info("Complexity sweep of %d algorithms over %d sizes", len(algorithms), len(sizes))
+        return {**header, "results": results}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in complexity_sweep")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def stream_sweep(header, sweep):
+    """NDJSON: the header, then one result line per algorithm as it finishes."""
+    yield json.dumps({"type": "header", **header}) + "\n"
+    async for result in sweep:
+        yield json.dumps({"type": "result", **result}) + "\n"
+
+
 @router.post("/export")
 async def export_results(data: ExportRequest):
     if data.format == "json":
@@ -0,0 +1,81 @@
+"""Trace session route handlers (paging and seeking stored traces)."""
+
+import logging
+
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+
+from app.config import TRACE_PAGE_MAX_LIMIT
+from app.services.trace_store import trace_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/traces", tags=["traces"])
+
+
+def get_trace(trace_id: str):
+    entry = trace_store.get(trace_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Trace '{trace_id}' not found or expired")
+    return entry
+
+
+@router.get("/{trace_id}")
+async def get_trace_info(trace_id: str):
+    entry = get_trace(trace_id)
+    return {
+        "trace_id": trace_id,
+        "kind": entry["kind"],
+        "algorithm": entry["algorithm"],
+        "total_steps": len(entry["steps"]),
+    }
+
+
+@router.get("/{trace_id}/steps")
+async def get_trace_steps(
+    trace_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=TRACE_PAGE_MAX_LIMIT),
+):
+    entry = get_trace(trace_id)
+    # Rendering replays from the nearest checkpoint, so it runs off the event loop
+    steps = await run_in_threadpool(render_window, entry, offset, limit)
+    return {
+        "trace_id": trace_id,
+        "offset": offset,
+        "limit": limit,
+        "total_steps": len(entry["steps"]),
+        "steps": steps,
+    }
+
+
+def render_window(entry: Dict[str, Any], offset: int, limit: int) -> List[Dict[str, Any]]:
+    if entry["kind"] == "sort":
+        # Sorting sessions hold a columnar Trace; render just this window
+        steps = entry["steps"].steps("delta", offset, offset + limit, entry.get("verbosity", "full"))
+    else:
+        # Graph sessions hold a GraphTrace, whose delta windows open with a snapshot
+        steps = entry["steps"].steps("delta", offset, offset + limit)
+
+    # Make each window self-contained: its first sorting step carries a keyframe
+    if steps and entry["kind"] == "sort" and "array" not in steps[0]:
+        steps[0]["array"] = entry["steps"].array_at(offset)
+    return steps
+
+
+@router.get("/{trace_id}/seek")
+async def seek_trace(trace_id: str, frame: int = Query(..., ge=0)):
+    entry = get_trace(trace_id)
+    if frame >= len(entry["steps"]):
+        raise HTTPException(status_code=400, detail=f"Frame {frame} out of range (trace has {len(entry['steps'])} steps)")
+
+    return {"trace_id": trace_id, "frame": frame, **await run_in_threadpool(render_frame, entry, frame)}
+
+
+def render_frame(entry: Dict[str, Any], frame: int) -> Dict[str, Any]:
+    if entry["kind"] == "sort":
+        step = entry["steps"].steps("delta", frame, frame + 1, entry.get("verbosity", "full"))[0]
+        return {"step": step, "array": entry["steps"].array_at(frame)}
+    return {"step": entry["steps"][frame]}
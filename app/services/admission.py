@@ -0,0 +1,346 @@
+"""
+Admission control for trace requests.
+Before a solve runs, its step count and response size are predicted from
+closed-form bounds: per-algorithm formulas over n plus a Fenwick-tree
+presortedness scan (inversions, longest leftward move) for sorting, and
+V/E counts for graphs. Requests predicted to be too large are downgraded
+(coarse granularity, then metrics mode), told to stream, or rejected.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.algorithms.binary_trace import TRACE_MEDIA_TYPE
+from app.algorithms.sorting import COARSE_EVENTS
+from app.algorithms.trace import keyframe_interval
+from app.config import (
+    ADMISSION_MAX_RECORDED_STEPS, ADMISSION_MAX_RESPONSE_BYTES, ADMISSION_MAX_STREAM_BYTES, COUNTING_SORT_MAX_RANGE,
+    METRICS_MAX_OPERATIONS,
+)
+
+# Approximate encoded bytes per sort step, beyond keyframes, by encoding and verbosity
+SORT_STEP_BYTES = {"json": 58, "binary": 30}
+SORT_DESCRIPTION_BYTES = {
+    "json": {"full": 52, "summary": 44, "none": 0},
+    "binary": {"full": 48, "summary": 20, "none": 0},
+}
+# Per graph step: fixed fields and changes; per snapshot, bytes per node label in each node-sized field
+GRAPH_STEP_BYTES = {"json": 140, "binary": 60}
+GRAPH_NODE_BYTES = {"json": 4, "binary": 4}
+# Node-sized fields per snapshot (visited, queue, distances, MST edges ...)
+GRAPH_NODE_FIELDS = {"bfs": 2, "dfs": 1, "iddfs": 1, "dijkstra": 3, "astar": 3, "bidirectional_dijkstra": 3,
+                     "bidirectional_bfs": 1, "prim": 2, "kruskal": 3}
+
+
+def presortedness(array: List[int]) -> Tuple[int, int]:
+    """Inversions, and the most larger elements before any one element (bubble sort's pass count)."""
+    ranks = {value: rank for rank, value in enumerate(sorted(set(array)), start=1)}
+    tree = [0] * (len(ranks) + 1)
+    inversions = longest = 0
+    for seen, value in enumerate(array):
+        k = ranks[value]
+        not_greater = 0
+        while k:
+            not_greater += tree[k]
+            k -= k & -k
+        greater = seen - not_greater
+        inversions += greater
+        longest = max(longest, greater)
+        k = ranks[value]
+        while k < len(tree):
+            tree[k] += 1
+            k += k & -k
+    return inversions, longest
+
+
+def sort_steps(algorithm: str, array: List[int], granularity: str = "fine") -> int:
+    """Predicted trace length; exact for bubble and insertion, an upper bound or estimate otherwise."""
+    n = len(array)
+    pairs = n * (n - 1) // 2
+    log_n = max(1, math.ceil(math.log2(n))) if n > 1 else 1
+    coarse = granularity == "coarse" and algorithm in COARSE_EVENTS
+
+    if algorithm in ("bubble", "insertion", "quick"):
+        inversions, longest = presortedness(array)
+    if algorithm == "bubble":
+        passes = min(longest + 1, n)
+        if coarse:
+            return 2 * passes - (passes == n) + 1
+        comparisons = passes * (n - 1) - passes * (passes - 1) // 2
+        return comparisons + inversions + passes + 1
+    if algorithm == "selection":
+        if coarse:
+            return (n - 1) + (n - 1) + n + 1
+        return n + pairs + (n - 1) + n + 1
+    if algorithm == "insertion":
+        return 2 * (n - 1) + inversions + 1
+    if algorithm == "merge":
+        return (n - 1) + n * log_n + 1
+    if algorithm == "quick":
+        # Last-element pivots go quadratic on presorted input (either way) and within runs of equal values
+        ties = sum(c * (c - 1) // 2 for c in Counter(array).values())
+        order = abs(2 * inversions / (pairs - ties) - 1) ** 2 if pairs > ties else 1.0
+        comparisons = (1 - order) * 2 * n * math.log(max(n, 2)) + order * pairs + ties
+        # About half the comparisons swap on random input, all of them on sorted input
+        return int(comparisons * (1.2 + 0.8 * order)) + 2 * n + 1
+    if algorithm == "heap":
+        return n + (n - 1) * log_n + (n - 1) + 1
+    return n + 1
+
+
+def counting_range(algorithm: str, array: List[int]) -> int:
+    """Counters counting sort allocates (max - min + 1); 0 for every other algorithm."""
+    if algorithm != "counting" or not array:
+        return 0
+    return max(array) - min(array) + 1
+
+
+def check_counting_range(algorithm: str, array: List[int]):
+    """ValueError when counting sort's counters would exceed COUNTING_SORT_MAX_RANGE, whatever n is."""
+    k = counting_range(algorithm, array)
+    if k > COUNTING_SORT_MAX_RANGE:
+        raise ValueError(
+            f"Counting sort over a value range of {k} needs {k} counters, "
+            f"over the {COUNTING_SORT_MAX_RANGE} allowed; use another algorithm or narrower values"
+        )
+
+
+def estimate_sort(algorithm: str, array: List[int], trace_format: str, media_type: str,
+                  granularity: str = "fine", verbosity: str = "full",
+                  max_frames: Optional[int] = None) -> Dict[str, int]:
+    """Predicted steps (before any frame budget) and response bytes."""
+    steps = sort_steps(algorithm, array, granularity)
+    frames = steps if max_frames is None else min(steps, max_frames)
+    encoding = "binary" if media_type == TRACE_MEDIA_TYPE else "json"
+    n = len(array)
+    value_bytes = sum(len(str(v)) for v in array[:256]) / min(n, 256) + 1
+    if encoding == "binary":
+        keyframes = 0
+    elif trace_format == "full":
+        keyframes = frames
+    else:
+        keyframes = frames // keyframe_interval(n) + 1
+    per_step = SORT_STEP_BYTES[encoding] + SORT_DESCRIPTION_BYTES[encoding][verbosity]
+    size = frames * per_step + (keyframes + 1) * n * value_bytes
+    return {"steps": steps, "bytes": int(size)}
+
+
+def graph_counts(graph: Dict[str, Dict[str, Any]]) -> Tuple[int, int, int, float]:
+    """
+    Nodes (including ones only named as neighbours), adjacency entries,
+    distinct node pairs among them and mean label length.
+    """
+    nodes = set(graph)
+    edges = 0
+    pairs = set()
+    for node, neighbours in graph.items():
+        nodes.update(neighbours)
+        edges += len(neighbours)
+        pairs.update((min(node, v), max(node, v)) for v in neighbours)
+    label_bytes = sum(len(label) for label in nodes) / len(nodes) if nodes else 1
+    return len(nodes), edges, len(pairs), label_bytes
+
+
+def graph_steps(algorithm: str, nodes: int, edges: int, pairs: int) -> int:
+    """Upper bounds on trace length, over the whole graph rather than the part reachable from start."""
+    if algorithm == "bfs" or algorithm == "prim":
+        return nodes + edges + 2
+    if algorithm == "dfs":
+        # Every tree edge is explored and backtracked, every other adjacency entry skipped
+        return 2 * nodes + edges + 1
+    if algorithm == "kruskal":
+        return 2 * pairs + 2
+    if algorithm == "bidirectional_bfs":
+        # Each direction visits every node and checks every edge at most once
+        return 2 * (nodes + edges) + 3
+    if algorithm == "bidirectional_dijkstra":
+        # Each direction as Dijkstra, plus a meet step per improving edge
+        return 2 * (nodes + 2 * edges) + edges + 3
+    return nodes + 2 * edges + 3
+
+
+def bfs_depths(graph: Dict[str, Dict[str, Any]], start: str) -> Dict[str, int]:
+    """BFS depth of every node reachable from start."""
+    depth = {start: 0}
+    frontier = [start]
+    while frontier:
+        layer = []
+        for node in frontier:
+            for neighbour in graph.get(node, ()):
+                if neighbour not in depth:
+                    depth[neighbour] = depth[node] + 1
+                    layer.append(neighbour)
+        frontier = layer
+    return depth
+
+
+def depth_limited_steps(algorithm: str, graph: Dict[str, Dict[str, Any]], start: Optional[str],
+                        target: Optional[str], depth_limit: Optional[int],
+                        cap: int = ADMISSION_MAX_RECORDED_STEPS) -> int:
+    """
+    Bound on depth-limited DFS and IDDFS traces. Under a limit L, a node at
+    BFS depth d is entered only at depths d..L, each time shallower than the
+    last, so at most L - d + 1 times. Each entry costs a visit, maybe a
+    cutoff, a backtrack and one step per adjacency entry. IDDFS stops at the
+    target's depth, or one round past the deepest layer. Rounds are summed
+    one by one, stopping once past `cap`. Without a start, every node counts
+    as depth 0 and rounds run to V - 1.
+    """
+    nodes, edges, _, _ = graph_counts(graph)
+    if start is None:
+        # Per layer: 3 steps per node plus its adjacency entries
+        weights = [3 * nodes + edges]
+        last = max(nodes - 1, 0)
+        target_depth = None
+    else:
+        depth = bfs_depths(graph, start)
+        weights = [0] * (max(depth.values()) + 1)
+        for node, d in depth.items():
+            weights[d] += 3 + len(graph.get(node, ()))
+        last = min(len(weights), max(nodes - 1, 0))
+        target_depth = depth.get(target) if target else None
+    if algorithm == "dfs":
+        return 2 + sum((depth_limit - d + 1) * w for d, w in enumerate(weights[:depth_limit + 1]))
+
+    if target_depth is not None:
+        last = target_depth
+    if depth_limit is not None:
+        last = min(last, depth_limit)
+    total = 2
+    within = round_steps = 0
+    for limit in range(last + 1):
+        # round(L) = round(L - 1) + weights of layers 0..L
+        if limit < len(weights):
+            within += weights[limit]
+        round_steps += within
+        total += 1 + round_steps
+        if total > cap:
+            break
+    return total
+
+
+def estimate_graph(algorithm: str, graph: Dict[str, Dict[str, Any]], media_type: str,
+                   max_frames: Optional[int] = None, trace_format: str = "full",
+                   depth_limit: Optional[int] = None, start: Optional[str] = None,
+                   target: Optional[str] = None) -> Dict[str, int]:
+    """
+    Predicted steps, response bytes and peak memory (recorded steps plus the
+    JSON size of the rendered ones). Steps are recorded as O(1) changes;
+    rendered steps snapshot node-sized fields, every step in full format
+    and every keyframe_interval(V) steps in delta format.
+    """
+    nodes, edges, pairs, label_bytes = graph_counts(graph)
+    if algorithm == "iddfs" or (algorithm == "dfs" and depth_limit is not None):
+        steps = depth_limited_steps(algorithm, graph, start, target, depth_limit)
+    else:
+        steps = graph_steps(algorithm, nodes, edges, pairs)
+    frames = steps if max_frames is None else min(steps, max_frames)
+    # Delta windows also snapshot their first step, and some start steps set every node
+    snapshots = frames if trace_format == "full" else frames // keyframe_interval(nodes) + 2
+
+    def rendered_bytes(encoding):
+        node_bytes = GRAPH_NODE_BYTES[encoding] + (label_bytes if encoding == "json" else 0)
+        snapshot = GRAPH_NODE_FIELDS.get(algorithm, 3) * nodes * node_bytes
+        return frames * GRAPH_STEP_BYTES[encoding] + snapshots * snapshot
+
+    encoding = "binary" if media_type == TRACE_MEDIA_TYPE else "json"
+    return {"steps": steps, "bytes": int(rendered_bytes(encoding)),
+            "memory": int(steps * GRAPH_STEP_BYTES["json"] + rendered_bytes("json"))}
+
+
+class AdmissionRejected(HTTPException):
+    def __init__(self, detail: str, estimate: Dict[str, int], admission: str = "rejected"):
+        super().__init__(status_code=413, detail=detail, headers=admission_headers(estimate, admission))
+
+
+def admission_headers(estimate: Dict[str, int], admission: str) -> Dict[str, str]:
+    return {
+        "X-Estimated-Steps": str(estimate["steps"]),
+        "X-Estimated-Bytes": str(estimate["bytes"]),
+        "X-Admission": admission,
+    }
+
+
+def _admit_counting_range(algorithm: str, array: List[int]):
+    try:
+        check_counting_range(algorithm, array)
+    except ValueError as e:
+        estimate = {"steps": sort_steps(algorithm, array), "bytes": counting_range(algorithm, array) * 8}
+        raise AdmissionRejected(str(e), estimate)
+
+
+def _fits(estimate: Dict[str, int], max_bytes: Optional[int], max_steps: Optional[int]) -> bool:
+    if max_steps is not None and estimate["steps"] > max_steps:
+        return False
+    return max_bytes is None or estimate["bytes"] <= max_bytes
+
+
+def admit_sort(algorithm: str, array: List[int], trace_format: str, media_type: str, granularity: str,
+               verbosity: str, max_frames: Optional[int], stream: bool, session: bool,
+               max_steps: int = ADMISSION_MAX_RECORDED_STEPS) -> Tuple[Dict[str, int], str]:
+    """
+    The estimate and how to serve the request: "accepted", "coarse" (switch
+    to coarse granularity) or "metrics" (operation counts only). Raises
+    AdmissionRejected when the trace would fit only if streamed.
+    """
+    _admit_counting_range(algorithm, array)
+    # Streams without a frame budget are encoded step by step and never recorded whole;
+    # sessions are recorded whole but paged, so only their step count matters
+    recorded_steps = max_steps if session or not stream or max_frames is not None else None
+    max_bytes = None if session else ADMISSION_MAX_STREAM_BYTES if stream else ADMISSION_MAX_RESPONSE_BYTES
+    estimate = estimate_sort(algorithm, array, trace_format, media_type, granularity, verbosity, max_frames)
+    if _fits(estimate, max_bytes, recorded_steps):
+        return estimate, "accepted"
+
+    if granularity == "fine" and algorithm in COARSE_EVENTS:
+        coarse = estimate_sort(algorithm, array, trace_format, media_type, "coarse", verbosity, max_frames)
+        if _fits(coarse, max_bytes, recorded_steps):
+            return coarse, "coarse"
+
+    streamed = estimate_sort(algorithm, array, trace_format, "application/json", granularity, verbosity, max_frames)
+    stream_steps = max_steps if max_frames is not None else None
+    if not stream and not session and _fits(streamed, ADMISSION_MAX_STREAM_BYTES, stream_steps):
+        raise AdmissionRejected(
+            f"Predicted trace of {estimate['steps']} steps (~{estimate['bytes'] // 1_000_000} MB) is too large "
+            "to buffer; stream it (Accept: application/x-ndjson) or set max_frames",
+            estimate, "stream-required",
+        )
+    return estimate, "metrics"
+
+
+def admit_metrics(algorithm: str, array: List[int]) -> Dict[str, int]:
+    """
+    The estimate for a metrics-mode run, or AdmissionRejected. Counting
+    implementations do about one operation per fine-grained trace step, so
+    the step bound doubles as an operation count; quadratic sorts of large
+    unsorted arrays exceed it long before their response size matters.
+    """
+    _admit_counting_range(algorithm, array)
+    # Counting sort also clears and prefix-sums one counter per value in range
+    steps = sort_steps(algorithm, array) + counting_range(algorithm, array)
+    estimate = {"steps": steps, "bytes": len(array) * 8}
+    if steps > METRICS_MAX_OPERATIONS:
+        raise AdmissionRejected(
+            f"Predicted {algorithm} sort of {len(array)} elements takes about {steps} operations, "
+            f"over the {METRICS_MAX_OPERATIONS} allowed in metrics mode; try a smaller array or another algorithm",
+            estimate,
+        )
+    return estimate
+
+
+def admit_graph(algorithm: str, graph: Dict[str, Dict[str, Any]], media_type: str,
+                max_frames: Optional[int], trace_format: str = "full",
+                depth_limit: Optional[int] = None, start: Optional[str] = None,
+                target: Optional[str] = None) -> Dict[str, int]:
+    """The estimate, or AdmissionRejected; graph traces have no streamed or coarse form to fall back to."""
+    estimate = estimate_graph(algorithm, graph, media_type, max_frames, trace_format, depth_limit, start, target)
+    if estimate["memory"] > ADMISSION_MAX_RESPONSE_BYTES:
+        raise AdmissionRejected(
+            f"Predicted {algorithm} trace of {estimate['steps']} steps "
+            f"(~{estimate['memory'] // 1_000_000} MB) is too large for this graph",
+            estimate,
+        )
+    return estimate
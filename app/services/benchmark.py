@@ -0,0 +1,127 @@
+"""
+Repeated-measurement timing for benchmark-mode time trials.
+A single perf_counter sample of a sub-millisecond sort is mostly timer and
+scheduler noise. Here each algorithm gets warmup runs, a loop count
+calibrated the way timeit.Timer.autorange does it (so one sample lasts at
+least min_sample_seconds), then `repeat` samples taken with the garbage
+collector off, summarised as median, p95, standard deviation and a 95%
+confidence interval for the median. Allocation peaks are measured in
+separate, untimed runs, since tracemalloc slows every allocation down.
+"""
+
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.algorithms.sorting_metrics import SORTING_METRICS
+from app.config import BENCHMARK_MIN_SAMPLE_SECONDS
+
+# z for a two-sided 95% interval
+Z_95 = 1.959964
+
+
+def time_loops(fn: Callable[[], Any], loops: int) -> float:
+    """Seconds for `loops` calls of fn, with the garbage collector off."""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def peak_allocation(fn: Callable[[], Any]) -> Tuple[Any, int]:
+    """(fn(), peak bytes allocated while it ran, above what was live before it started)."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return result, peak - baseline
+
+
+def autorange(fn: Callable[[], Any], min_seconds: float = BENCHMARK_MIN_SAMPLE_SECONDS) -> Tuple[int, float]:
+    """Smallest loop count in 1, 2, 5, 10, 20, 50, ... taking at least min_seconds, and its time."""
+    i = 1
+    while True:
+        for j in (1, 2, 5):
+            loops = i * j
+            elapsed = time_loops(fn, loops)
+            if elapsed >= min_seconds:
+                return loops, elapsed
+        i *= 10
+
+
+def median_interval(samples: List[float]) -> Tuple[float, float]:
+    """Distribution-free 95% interval for the median, from order statistics."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    half_width = Z_95 * math.sqrt(n) / 2
+    lo = max(math.floor(n / 2 - half_width), 0)
+    hi = min(math.ceil(n / 2 + half_width), n - 1)
+    return ordered[lo], ordered[hi]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Statistics of per-run times in microseconds."""
+    ordered = sorted(samples)
+    ci_low, ci_high = median_interval(ordered)
+    return {
+        "median_us": round(statistics.median(ordered), 3),
+        "mean_us": round(statistics.fmean(ordered), 3),
+        "stddev_us": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "p95_us": round(statistics.quantiles(ordered, n=20, method="inclusive")[18], 3)
+        if len(ordered) > 1 else round(ordered[0], 3),
+        "min_us": round(ordered[0], 3),
+        "max_us": round(ordered[-1], 3),
+        "ci95_us": [round(ci_low, 3), round(ci_high, 3)],
+    }
+
+
+def benchmark(algorithm: str, array: List[int], repeat: int, warmup: int,
+              min_sample_seconds: float = BENCHMARK_MIN_SAMPLE_SECONDS) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    (stats, metrics) for `repeat` calibrated samples of the counting
+    implementation. With warmup=0 the first sample is cold: calibrating would
+    run the sort, so samples are single runs, and the counts are collected
+    after them.
+    """
+    sort = SORTING_METRICS[algorithm]
+
+    def run():
+        return sort(array)
+
+    warmed = 0
+    if warmup:
+        # The untimed run that collects the counts doubles as the first warmup
+        metrics = run()
+        warmed += 1
+        for _ in range(warmup - 1):
+            run()
+            warmed += 1
+        loops, _ = autorange(run, min_sample_seconds)
+    else:
+        loops = 1
+    samples = [time_loops(run, loops) / loops * 1_000_000 for _ in range(repeat)]
+    if not warmup:
+        metrics = run()
+    stats = summarize(samples)
+    stats.update(samples=repeat, loops=loops, warmup=warmed)
+    return stats, metrics
+
+
+def intervals_overlap(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    return a["ci95_us"][0] <= b["ci95_us"][1] and b["ci95_us"][0] <= a["ci95_us"][1]
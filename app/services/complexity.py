@@ -0,0 +1,169 @@
+"""
+Empirical complexity sweeps.
+Each algorithm's counting implementation is benchmarked over a geometric
+range of sizes and several input distributions. Log-log least squares on
+runtime, comparisons and swaps gives the measured exponent and constant
+factor, and the closest textbook growth class is picked for comparison
+with the claimed Big-O in ALGORITHM_INFO.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.config import COMPLEXITY_DEADLINE_SECONDS
+from app.data.sorting_metadata import ALGORITHM_INFO
+from app.services.benchmark import benchmark
+from app.services.executor import DeadlineExceeded, deadline, solve_executor
+
+logger = logging.getLogger(__name__)
+
+# Extra wait beyond the worker-side deadline, for fitting and returning partial results
+SWEEP_GRACE_SECONDS = 5.0
+
+
+def _nearly_sorted(n: int, rng: random.Random) -> List[int]:
+    values = sorted(rng.randint(1, n) for _ in range(n))
+    # About 5% of positions displaced
+    for _ in range(max(1, n // 20)):
+        i, j = rng.randrange(n), rng.randrange(n)
+        values[i], values[j] = values[j], values[i]
+    return values
+
+
+# Values are drawn from 1..n, so counting sort's k grows with n
+DISTRIBUTIONS: Dict[str, Callable[[int, random.Random], List[int]]] = {
+    "random": lambda n, rng: [rng.randint(1, n) for _ in range(n)],
+    "sorted": lambda n, rng: sorted(rng.randint(1, n) for _ in range(n)),
+    "reversed": lambda n, rng: sorted((rng.randint(1, n) for _ in range(n)), reverse=True),
+    "few_unique": lambda n, rng: [rng.randint(1, 8) for _ in range(n)],
+    "nearly_sorted": _nearly_sorted,
+}
+
+GROWTH_CLASSES: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n²)": lambda n: n * n,
+    "O(n³)": lambda n: n ** 3,
+}
+
+MEASURES = ("runtime_us", "comparisons", "swaps")
+
+
+def geometric_sizes(min_size: int, max_size: int, points: int) -> List[int]:
+    """Up to `points` distinct sizes spaced evenly in log scale from min_size to max_size."""
+    ratio = (max_size / min_size) ** (1 / (points - 1))
+    return sorted({round(min_size * ratio ** i) for i in range(points)})
+
+
+def fit_power_law(sizes: List[int], values: List[float]) -> Optional[Dict[str, Any]]:
+    """
+    values ≈ constant · n^exponent by least squares in log-log space, plus
+    the growth class with the smallest log residual; None with fewer than
+    two positive values.
+    """
+    points = [(math.log(n), math.log(v), n, v) for n, v in zip(sizes, values) if v > 0]
+    if len(points) < 2 or len({p[0] for p in points}) < 2:
+        return None
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    exponent = sxy / sxx
+    intercept = mean_y - exponent * mean_x
+    r_squared = 1.0 if syy == 0 else sxy * sxy / (sxx * syy)
+
+    best = None
+    for name, growth in GROWTH_CLASSES.items():
+        # log(value / growth) should be flat for the right class
+        logs = [math.log(v / growth(n)) for _, _, n, v in points]
+        mean = sum(logs) / len(logs)
+        residual = sum((r - mean) ** 2 for r in logs) / len(logs)
+        if best is None or residual < best[1]:
+            best = (name, residual, math.exp(mean))
+
+    return {
+        "exponent": round(exponent, 3),
+        "constant": round(math.exp(intercept), 4),
+        "r_squared": round(r_squared, 4),
+        "best_fit": best[0],
+        "best_fit_constant": round(best[2], 4),
+    }
+
+
+def sweep_entry(algorithm: str, sizes: List[int], distributions: List[str], repeat: int, seed: int,
+                deadline_seconds: float) -> Dict[str, Any]:
+    """Runs inside a pool worker; past the deadline, the sizes measured so far are fitted."""
+    rng = random.Random(seed)
+    measured = {d: {"sizes": [], **{m: [] for m in MEASURES}} for d in distributions}
+    timed_out = False
+    start = time.perf_counter()
+    try:
+        with deadline(deadline_seconds):
+            for n in sizes:
+                inputs = {d: DISTRIBUTIONS[d](n, rng) for d in distributions}
+                for d, array in inputs.items():
+                    stats, metrics = benchmark(algorithm, array, repeat, warmup=1)
+                    row = measured[d]
+                    row["sizes"].append(n)
+                    row["runtime_us"].append(stats["median_us"])
+                    row["comparisons"].append(metrics["comparisons"])
+                    row["swaps"].append(metrics["swaps"])
+    except DeadlineExceeded:
+        timed_out = True
+        # Drop a size that only some distributions reached
+        done = min(len(row["sizes"]) for row in measured.values())
+        for row in measured.values():
+            for key in row:
+                del row[key][done:]
+
+    info = ALGORITHM_INFO.get(algorithm, {})
+    result = {
+        "algorithm": algorithm,
+        "claimed": {**info.get("time_complexity", {}), "space": info.get("space_complexity")},
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+        "distributions": {
+            d: {**row, "fits": {m: fit_power_law(row["sizes"], row[m]) for m in MEASURES}}
+            for d, row in measured.items()
+        },
+    }
+    if timed_out:
+        result["timed_out"] = True
+    return result
+
+
+async def _run_sweep_entry(algorithm: str, entries: int, sizes: List[int], distributions: List[str],
+                           repeat: int, seed: int, deadline_seconds: float) -> Dict[str, Any]:
+    # Entries return partial results at their deadline; the bounded wait only guards against a wedged worker
+    try:
+        return await solve_executor.run_trial(sweep_entry, algorithm, sizes, distributions, repeat, seed,
+                                              deadline_seconds, deadline_seconds=deadline_seconds, entries=entries,
+                                              grace=SWEEP_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        return {"algorithm": algorithm, "timed_out": True}
+    except Exception as e:
+        logger.exception("Complexity sweep failed for %s", algorithm)
+        return {"algorithm": algorithm, "error": str(e)}
+
+
+async def iter_sweep(algorithms: List[str], sizes: List[int], distributions: List[str], repeat: int, seed: int,
+                     deadline_seconds: float = COMPLEXITY_DEADLINE_SECONDS) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one sweep per algorithm, in completion order."""
+    tasks = [
+        asyncio.ensure_future(_run_sweep_entry(name, len(algorithms), sizes, distributions, repeat, seed,
+                                               deadline_seconds))
+        for name in algorithms
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,243 @@
+"""
+Executors for CPU-bound work.
+A shared process pool is created once (warmed at startup) and reused by every
+request, and SolveExecutor moves solves off the event loop with a bounded
+number of in-flight requests, rejecting the rest with 429 + Retry-After.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import iterate_in_threadpool
+
+from app.config import (
+    PROCESS_POOL_WORKERS, SOLVE_EXECUTOR, SOLVE_WORKERS, SOLVE_QUEUE_SIZE, SOLVE_RETRY_AFTER_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class SolverSaturated(HTTPException):
+    def __init__(self, retry_after: int = SOLVE_RETRY_AFTER_SECONDS):
+        super().__init__(
+            status_code=429,
+            detail="Server is busy with other solves, please retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class PoolUnavailable(HTTPException):
+    def __init__(self, retry_after: int = SOLVE_RETRY_AFTER_SECONDS):
+        super().__init__(
+            status_code=503,
+            detail="Time trials need the process pool, which failed to start; please retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def warm_process_pool():
+    try:
+        pool = get_process_pool()
+        pids = {f.result() for f in [pool.submit(os.getpid) for _ in range(PROCESS_POOL_WORKERS)]}
+    except (OSError, RuntimeError):
+        # Time trials and sweeps answer 503 until a pool starts (see SolveExecutor.run_trial)
+        logger.warning("Process pool failed to start", exc_info=True)
+        shutdown_process_pool()
+        return
+    logger.info("Process pool warmed with %d workers", len(pids))
+
+
+def shutdown_process_pool():
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Raise DeadlineExceeded inside the block after `seconds` (worker main thread, Unix only)."""
+    enforceable = (
+        seconds is not None
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if not enforceable:
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise DeadlineExceeded(f"Exceeded {seconds}s deadline")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class SolveExecutor:
+    """Runs solves in a thread or process pool, admitting at most workers + queue_size at once."""
+
+    KINDS = ("thread", "process", "inline")
+
+    def __init__(self, kind: str = SOLVE_EXECUTOR, workers: int = SOLVE_WORKERS, queue_size: int = SOLVE_QUEUE_SIZE):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown solve executor: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+    def acquire(self, count: int = 1):
+        with self._lock:
+            if self._pending + count > self.capacity:
+                raise SolverSaturated()
+            self._pending += count
+
+    def release(self, count: int = 1):
+        with self._lock:
+            self._pending -= count
+
+    @asynccontextmanager
+    async def slot(self, count: int = 1):
+        """Hold `count` admission slots for work that manages its own execution (e.g. time trials)."""
+        self.acquire(count)
+        try:
+            yield
+        finally:
+            self.release(count)
+
+    def hold(self, iterable) -> "HeldSlot":
+        """Take a slot now and keep it until a streamed response finishes."""
+        self.acquire()
+        return HeldSlot(self, iterable)
+
+    async def run(self, fn, *args):
+        if self.kind == "inline":
+            async with self.slot():
+                return fn(*args)
+
+        self.acquire()
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self.release()
+            raise
+        # Released when the work itself ends, even if the awaiting request goes away
+        future.add_done_callback(lambda _: self.release())
+        return await asyncio.wrap_future(future)
+
+    async def run_held(self, fn, *args):
+        """Run fn like run(), for callers that already hold a slot (see slot and acquire)."""
+        if self.kind == "inline":
+            return fn(*args)
+        return await asyncio.wrap_future(self._pool().submit(fn, *args))
+
+    def check_trial_pool(self):
+        """Raise PoolUnavailable (503) unless run_trial can start measurements."""
+        if self.kind != "inline":
+            self._submit_trial(os.getpid)
+
+    async def run_trial(self, fn, *args, deadline_seconds: float, entries: int, grace: float):
+        """
+        Run one of `entries` measurements (time trial entries, complexity
+        sweeps) that fn bounds with deadline(deadline_seconds). They hold no
+        slot of their own. Whatever the solve kind, they run on the process
+        pool, where each gets a core and its deadline can interrupt it, except
+        that the inline kind runs them inline. The wait is bounded as well, in
+        case a worker wedges: asyncio.TimeoutError once the entries queued
+        ahead and this one have had their deadlines.
+        """
+        if self.kind == "inline":
+            return fn(*args)
+        future = asyncio.wrap_future(self._submit_trial(fn, *args))
+        queued_rounds = -(-entries // PROCESS_POOL_WORKERS)
+        return await asyncio.wait_for(future, deadline_seconds * queued_rounds + grace)
+
+    def _submit_trial(self, fn, *args) -> Future:
+        # No thread fallback: off a main thread the deadline cannot interrupt a
+        # measurement, which would then hold a solve thread long after its trial gave up
+        try:
+            return get_process_pool().submit(fn, *args)
+        except (OSError, RuntimeError):
+            logger.warning("Process pool unavailable", exc_info=True)
+            # The next trial tries a fresh pool
+            shutdown_process_pool()
+            raise PoolUnavailable()
+
+    def _pool(self):
+        if self.kind == "process":
+            return get_process_pool()
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="solver")
+            return self._threads
+
+    def shutdown(self):
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+                self._threads = None
+
+    def stats(self):
+        return {"kind": self.kind, "workers": self.workers, "pending": self._pending, "capacity": self.capacity}
+
+
+class HeldSlot:
+    """Async iterable that releases its admission slot when exhausted, closed or collected."""
+
+    def __init__(self, executor: SolveExecutor, iterable):
+        self._executor = executor
+        self._iterable = iterable
+        self._held = True
+
+    def release(self):
+        if self._held:
+            self._held = False
+            self._executor.release()
+
+    __del__ = release
+
+    async def __aiter__(self):
+        items = self._iterable if hasattr(self._iterable, "__aiter__") else iterate_in_threadpool(self._iterable)
+        try:
+            async for item in items:
+                yield item
+        finally:
+            self.release()
+
+
+solve_executor = SolveExecutor()
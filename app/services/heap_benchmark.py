@@ -0,0 +1,59 @@
+"""
+Priority queue benchmarks for the graph engine.
+Times the shipped GraphAlgorithms.dijkstra and GraphAlgorithms.prim on a
+random graph, trace recording included, once with the lazy-deletion heapq
+queue and once per arity of the indexed heap (see
+app.algorithms.indexed_heap), using the calibrated samples of
+app.services.benchmark. Each row also reports the decrease-key steps of the
+run: the indexed heap's lowered keys, which the lazy heap pushes as
+duplicates instead. scripts/heap_benchmark.py prints a table.
+"""
+
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.algorithms.graph import GraphAlgorithms
+from app.algorithms.graph_csr import CSRGraph
+from app.services.benchmark import autorange, summarize, time_loops
+
+ARITIES = (2, 4, 8)
+ALGORITHMS = {"dijkstra": GraphAlgorithms.dijkstra, "prim": GraphAlgorithms.prim}
+
+
+def random_graph(nodes: int, degree: int, seed: int = 0) -> CSRGraph:
+    """Connected undirected graph: a random spanning tree plus edges up to about `degree` per node."""
+    rng = random.Random(seed)
+    labels = [f"N{i}" for i in range(nodes)]
+    adjacency: Dict[str, Dict[str, int]] = {label: {} for label in labels}
+
+    def connect(a: str, b: str):
+        weight = rng.randint(1, 100)
+        adjacency[a][b] = weight
+        adjacency[b][a] = weight
+
+    for i in range(1, nodes):
+        connect(labels[i], labels[rng.randrange(i)])
+    for _ in range(max(nodes * degree // 2 - (nodes - 1), 0)):
+        a, b = rng.sample(labels, 2)
+        connect(a, b)
+    return CSRGraph(adjacency)
+
+
+def compare_arities(nodes: int = 2000, degree: int = 8, arities: Sequence[int] = ARITIES, repeat: int = 5,
+                    seed: int = 0, min_sample_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+    """One row per algorithm and queue ("heapq" or d = arity): decrease-key steps plus timing summary."""
+    graph = random_graph(nodes, degree, seed)
+    start = graph.labels[0]
+    rows = []
+    for algorithm, solve in ALGORITHMS.items():
+        candidates = [("heapq", lambda: solve(graph, start, False, queue="heapq"))]
+        candidates += [(f"d={arity}", lambda arity=arity: solve(graph, start, False, queue="indexed", arity=arity))
+                       for arity in arities]
+        for queue, run in candidates:
+            trace = run()
+            loops, _ = autorange(run) if min_sample_seconds is None else autorange(run, min_sample_seconds)
+            samples = [time_loops(run, loops) / loops * 1_000_000 for _ in range(repeat)]
+            rows.append({"algorithm": algorithm, "queue": queue, "nodes": nodes, "edges": len(graph.targets),
+                         "steps": len(trace), "decrease_keys": trace.step_types.count("decrease_key"),
+                         **summarize(samples)})
+    return rows
@@ -0,0 +1,174 @@
+"""
+Background solve jobs.
+POST /api/jobs hands a sort or graph solve to a small thread pool and returns
+at once; clients poll the job for progress and page the finished trace from
+the trace store. Cancelling a job sets its Progress, which stops the solve at
+its next checkpoint (see app.algorithms.progress).
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.algorithms.progress import Cancelled, Progress
+from app.config import JOB_QUEUE_SIZE, JOB_TTL_SECONDS, JOB_WORKERS
+from app.services.executor import SolverSaturated
+from app.services.solvers import solve_graph, solve_sort
+from app.services.trace_store import trace_store
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+def sort_job(algorithm: str, array: List[int], trace_format: str, max_frames: Optional[int], granularity: str,
+             verbosity: str, progress: Optional[Progress] = None) -> Dict[str, Any]:
+    solved = solve_sort(algorithm, array, trace_format, max_frames, granularity, verbosity, progress)
+    result = solved["summary"]
+    result["trace_id"] = trace_store.put("sort", solved["trace"], algorithm=algorithm, initial=array, verbosity=verbosity)
+    result["total_steps"] = len(solved["trace"])
+    return result
+
+
+def graph_job(algorithm: str, graph: Dict[str, Dict[str, Any]], start: str, directed: bool, target: Optional[str],
+              depth_limit: Optional[int], heuristic: Optional[str], positions: Optional[Dict[str, Tuple[float, float]]],
+              max_frames: Optional[int], progress: Optional[Progress] = None) -> Dict[str, Any]:
+    trace = solve_graph(algorithm, graph, start, directed, target, depth_limit, heuristic, positions, max_frames,
+                        progress)
+    trace_id = trace_store.put("graph", trace, algorithm=algorithm)
+    return {"trace_id": trace_id, "total_steps": len(trace), "algorithm": algorithm, "keyframe_interval": trace.interval}
+
+
+class JobManager:
+    """Runs jobs on `workers` threads, admitting at most workers + queue_size unfinished jobs."""
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE,
+                 ttl_seconds: float = JOB_TTL_SECONDS):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, kind: str, algorithm: str, fn, *args, estimated_steps: Optional[int] = None) -> Dict[str, Any]:
+        """Queue fn(*args, progress=...) and return the job; raises SolverSaturated when full."""
+        with self._lock:
+            self._evict()
+            if sum(1 for job in self._jobs.values() if job["status"] not in FINISHED) >= self.capacity:
+                raise SolverSaturated()
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "kind": kind,
+                "algorithm": algorithm,
+                "status": "queued",
+                "progress": Progress(),
+                "estimated_steps": estimated_steps,
+                "created": time.monotonic(),
+                "started": None,
+                "finished": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job["job_id"]] = job
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+            job["future"] = self._pool.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Dict[str, Any], fn, args):
+        with self._lock:
+            if job["progress"].cancelled:
+                job.update(status="cancelled", finished=time.monotonic())
+                return
+            job.update(status="running", started=time.monotonic())
+
+        result = error = None
+        try:
+            result = fn(*args, progress=job["progress"])
+            status = "done"
+        except Cancelled:
+            status = "cancelled"
+        except Exception as e:
+            logger.exception("Job %s failed", job["job_id"])
+            status, error = "failed", str(e)
+
+        with self._lock:
+            job.update(status=status, result=result, error=error, finished=time.monotonic())
+        logger.info("Job %s (%s %s) %s after %d steps", job["job_id"], job["kind"], job["algorithm"], status,
+                    job["progress"].steps)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Request cancellation; queued jobs are cancelled at once, running ones at their next checkpoint."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return job
+            job["progress"].cancel()
+            if job["future"].cancel():
+                job.update(status="cancelled", finished=time.monotonic())
+            elif job["status"] == "running":
+                job["status"] = "cancelling"
+            return job
+
+    def view(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Public fields of a job, with progress and remaining-work estimates."""
+        steps = job["progress"].steps
+        estimated = job["estimated_steps"]
+        view = {
+            "job_id": job["job_id"],
+            "kind": job["kind"],
+            "algorithm": job["algorithm"],
+            "status": job["status"],
+            "steps": steps,
+            "estimated_steps": estimated,
+        }
+        if job["started"] is not None:
+            elapsed = (job["finished"] or time.monotonic()) - job["started"]
+            view["elapsed_seconds"] = round(elapsed, 3)
+            if estimated and job["status"] in ("running", "cancelling"):
+                remaining = max(estimated - steps, 0)
+                view["estimated_remaining_steps"] = remaining
+                if steps:
+                    view["estimated_remaining_seconds"] = round(remaining * elapsed / steps, 3)
+        if job["result"] is not None:
+            view["result"] = job["result"]
+        if job["error"] is not None:
+            view["error"] = job["error"]
+        return view
+
+    def _evict(self):
+        deadline = time.monotonic() - self.ttl_seconds
+        for job_id in [k for k, job in self._jobs.items() if job["finished"] is not None and job["finished"] < deadline]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                job["progress"].cancel()
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running") + statuses.count("cancelling"),
+            "jobs": len(statuses),
+        }
+
+
+job_manager = JobManager()
@@ -0,0 +1,211 @@
+"""
+Server-paced playback for /ws/play and /ws/race.
+A SortPlayback pulls events from the sorting generator only as frames are
+asked for, recording them into a columnar Trace as it goes; a client that
+stops watching halfway never pays for the rest of the run. Seeking back
+replays from the trace's keyframes, seeking ahead runs the generator up to
+the requested frame. Graph algorithms build their step list in one go, so
+a GraphPlayback solves up front and only paces the sending. A RacePlayback
+runs several sorts side by side in logical time: frame t holds step t of
+every algorithm still running.
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.algorithms.graph_trace import GraphTrace
+from app.algorithms.sorting import sort_events
+from app.algorithms.trace import Trace, keyframe_interval
+from app.config import ADMISSION_MAX_RECORDED_STEPS, RACE_LOOKAHEAD, RACE_WORKERS
+
+_race_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_race_pool() -> ThreadPoolExecutor:
+    global _race_pool
+    if _race_pool is None:
+        _race_pool = ThreadPoolExecutor(max_workers=RACE_WORKERS, thread_name_prefix="race")
+    return _race_pool
+
+
+def shutdown_race_pool():
+    global _race_pool
+    if _race_pool is not None:
+        _race_pool.shutdown(wait=False, cancel_futures=True)
+        _race_pool = None
+
+
+class Playback(ABC):
+    """Frames are sent as {"type": "frame", "frame": position, FRAME_KEY: next_frame()}."""
+
+    FRAME_KEY = "step"
+    # Solve slots held while playing (see app.routes.play.serve_playback)
+    slots = 1
+
+    @property
+    @abstractmethod
+    def total_steps(self) -> Optional[int]:
+        """Length of the run, or None while it is still unknown."""
+
+    def header(self) -> Dict[str, Any]:
+        return {}
+
+    def footer(self) -> Dict[str, Any]:
+        return {"frames": self.total_steps}
+
+    @abstractmethod
+    def next_frame(self) -> Optional[Any]:
+        """The frame after the current position, or None once the run is over."""
+
+    @abstractmethod
+    def seek(self, frame: int) -> Any:
+        """Move to `frame` and return it."""
+
+
+class SortPlayback(Playback):
+
+    def __init__(self, algorithm: str, array: List[int], trace_format: str = "delta", granularity: str = "fine",
+                 verbosity: str = "full", max_steps: int = ADMISSION_MAX_RECORDED_STEPS):
+        self.trace = Trace(array)
+        self.trace_format = trace_format
+        self.verbosity = verbosity
+        self.max_steps = max_steps
+        self.position = -1
+        self._events = sort_events(algorithm, array, granularity)
+        self._exhausted = False
+        self._frames = self._iter_from(0)
+
+    @property
+    def total_steps(self) -> Optional[int]:
+        """Length of the run, once the generator has finished."""
+        return len(self.trace) if self._exhausted else None
+
+    def header(self) -> Dict[str, Any]:
+        header = {"trace_format": self.trace_format, "verbosity": self.verbosity}
+        if self.trace_format == "delta":
+            header["initial"] = self.trace.initial
+            header["keyframe_interval"] = keyframe_interval(len(self.trace.initial))
+        return header
+
+    def _produce(self, frame: int):
+        """Record events until the trace has `frame` or the run ends."""
+        trace = self.trace
+        while not self._exhausted and len(trace) <= frame:
+            if len(trace) >= self.max_steps:
+                raise ValueError(f"Playback stops at {self.max_steps} steps")
+            event = next(self._events, None)
+            if event is None:
+                self._exhausted = True
+            else:
+                trace.append(*event)
+
+    def _iter_from(self, start: int):
+        return self.trace.iter_steps(self.trace_format, start, verbosity=self.verbosity)
+
+    def next_frame(self) -> Optional[Dict[str, Any]]:
+        """The step after the current position, or None once the run is over."""
+        self._produce(self.position + 1)
+        step = next(self._frames, None)
+        if step is not None:
+            self.position += 1
+        return step
+
+    def seek(self, frame: int) -> Dict[str, Any]:
+        """Move to `frame` (clamped to the run); the step carries the full array."""
+        self._produce(frame)
+        frame = max(0, min(frame, len(self.trace) - 1))
+        step = self.trace.steps(self.trace_format, frame, frame + 1, self.verbosity)[0]
+        step["array"] = self.trace.array_at(frame)
+        self.position = frame
+        self._frames = self._iter_from(frame + 1)
+        return step
+
+
+class GraphPlayback(Playback):
+
+    def __init__(self, trace: GraphTrace, trace_format: str = "full"):
+        self.trace = trace
+        self.trace_format = trace_format
+        self.position = -1
+        self._frames = trace.iter_steps(trace_format)
+
+    @property
+    def total_steps(self) -> int:
+        return len(self.trace)
+
+    def header(self) -> Dict[str, Any]:
+        header = {"trace_format": self.trace_format}
+        if self.trace_format == "delta":
+            header["keyframe_interval"] = self.trace.interval
+        return header
+
+    def next_frame(self) -> Optional[Dict[str, Any]]:
+        step = next(self._frames, None)
+        if step is not None:
+            self.position += 1
+        return step
+
+    def seek(self, frame: int) -> Dict[str, Any]:
+        """Move to `frame` (clamped to the trace); the step carries the full state."""
+        self.position = max(0, min(frame, len(self.trace) - 1))
+        self._frames = self.trace.iter_steps(self.trace_format, self.position + 1)
+        return self.trace[self.position]
+
+
+class RacePlayback(Playback):
+    """
+    One SortPlayback lane per algorithm over the same input. Lanes are
+    advanced concurrently on the race pool, up to `lookahead` frames past
+    playback, so memory grows with the frames watched rather than with the
+    longest run.
+    """
+
+    FRAME_KEY = "steps"
+
+    def __init__(self, algorithms: List[str], array: List[int], trace_format: str = "delta",
+                 granularity: str = "fine", verbosity: str = "full",
+                 max_steps: int = ADMISSION_MAX_RECORDED_STEPS, lookahead: int = RACE_LOOKAHEAD):
+        self.lanes = {algorithm: SortPlayback(algorithm, array, trace_format, granularity, verbosity, max_steps)
+                      for algorithm in algorithms}
+        self.lookahead = lookahead
+        self.position = -1
+        self.slots = len(self.lanes)
+
+    @property
+    def total_steps(self) -> Optional[int]:
+        totals = [lane.total_steps for lane in self.lanes.values()]
+        return None if None in totals else max(totals)
+
+    def header(self) -> Dict[str, Any]:
+        return {"algorithms": list(self.lanes), **next(iter(self.lanes.values())).header()}
+
+    def footer(self) -> Dict[str, Any]:
+        return {"frames": self.total_steps,
+                "steps": {algorithm: lane.total_steps for algorithm, lane in self.lanes.items()}}
+
+    def _produce(self, frame: int):
+        behind = [lane for lane in self.lanes.values() if not lane._exhausted and len(lane.trace) <= frame]
+        if behind:
+            # list() re-raises a lane's error (its step limit) here
+            list(get_race_pool().map(lambda lane: lane._produce(frame + self.lookahead), behind))
+
+    def next_frame(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Step position + 1 of every lane that has one; None once all runs are over."""
+        self._produce(self.position + 1)
+        steps = {}
+        for algorithm, lane in self.lanes.items():
+            step = lane.next_frame()
+            if step is not None:
+                steps[algorithm] = step
+        if not steps:
+            return None
+        self.position += 1
+        return steps
+
+    def seek(self, frame: int) -> Dict[str, Dict[str, Any]]:
+        """Every lane at `frame`; lanes that finished earlier show their last step."""
+        self._produce(frame)
+        longest = max(len(lane.trace) for lane in self.lanes.values())
+        self.position = max(0, min(frame, longest - 1))
+        return {algorithm: lane.seek(self.position) for algorithm, lane in self.lanes.items()}
@@ -0,0 +1,127 @@
+"""
+Content-addressed cache of serialized solve responses.
+Keys are a hash of the algorithm plus the canonicalized input, values are the
+encoded JSON body and its ETag; entries are evicted least-recently-used first
+once the total size exceeds the byte budget. Concurrent misses for the same
+key share a single in-flight computation.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import RESULT_CACHE_MAX_BYTES
+
+
+def canonical_key(kind: str, **parts) -> str:
+    encoded = json.dumps({"kind": kind, **parts}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def encode_json(content: Any) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResultCache:
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        # Only touched from the event loop
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, body: bytes, media_type: str = "application/json") -> Dict[str, Any]:
+        entry = {"body": body, "etag": f'"{key[:32]}"', "media_type": media_type}
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= len(self._entries.pop(key)["body"])
+            self._entries[key] = entry
+            self._total_bytes += len(body)
+            while self._total_bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._total_bytes -= len(dropped["body"])
+        return entry
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[bytes]],
+                             media_type: str = "application/json") -> Tuple[Dict[str, Any], str]:
+        """Return (entry, cache status); identical concurrent misses await one compute() call."""
+        entry = self.get(key)
+        if entry is not None:
+            return entry, "HIT"
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute, media_type))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            status = "MISS"
+        else:
+            self.coalesced += 1
+            status = "SHARED"
+        # Shielded so one waiter disconnecting does not cancel the others' result
+        return await asyncio.shield(task), status
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[bytes]], media_type: str) -> Dict[str, Any]:
+        return self.put(key, await compute(), media_type)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter went away
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "inflight": len(self._inflight),
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+def cached_response(request: Request, entry: Dict[str, Any], status: str) -> Response:
+    headers = {"ETag": entry["etag"], "X-Cache": status, "Vary": "Accept"}
+    if entry["etag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type=entry["media_type"], headers=headers)
+
+
+result_cache = ResultCache()
@@ -0,0 +1,89 @@
+"""
+Solve entry points run by the solve executor.
+Plain module-level functions of plain arguments, so they can be shipped to a
+thread or a process pool alike. The render_* variants also encode the
+response, so neither the solve nor the serialization runs on the event loop.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.algorithms.binary_trace import TRACE_MEDIA_TYPE, encode_graph_trace, encode_sort_trace
+from app.algorithms.graph import GRAPH_REGISTRY
+from app.algorithms.graph_csr import CSRGraph
+from app.algorithms.graph_trace import GraphTrace
+from app.algorithms.progress import Progress, checkpointed
+from app.algorithms.sorting import sort_events
+from app.algorithms.trace import Trace, keyframe_interval
+from app.services.result_cache import encode_json
+
+logger = logging.getLogger(__name__)
+
+
+def solve_sort(algorithm: str, array: List[int], trace_format: str, max_frames: Optional[int] = None,
+               granularity: str = "fine", verbosity: str = "full",
+               progress: Optional[Progress] = None) -> Dict[str, Any]:
+    """Record the run as a columnar Trace, plus the response fields other than the steps."""
+    start_time = time.perf_counter()
+    trace = Trace.record(array, checkpointed(sort_events(algorithm, array, granularity), progress))
+    execution_time_us = (time.perf_counter() - start_time) * 1_000_000
+    source_steps = len(trace)
+    trace = trace.downsample(max_frames)
+
+    logger.info("Sorted %d elements with %s in %.0fμs", len(array), algorithm, execution_time_us)
+    summary = {
+        "execution_time_us": round(execution_time_us, 2),
+        "algorithm": algorithm,
+        "array_size": len(array),
+        "trace_format": trace_format,
+        "granularity": granularity,
+        "verbosity": verbosity,
+        "total_comparisons": trace.total_comparisons,
+        "total_swaps": trace.total_swaps,
+    }
+    if trace_format == "delta":
+        summary["initial"] = array
+        summary["keyframe_interval"] = keyframe_interval(len(array))
+    if len(trace) < source_steps:
+        summary["source_steps"] = source_steps
+    return {"trace": trace, "summary": summary}
+
+
+def render_sort(algorithm: str, array: List[int], trace_format: str, media_type: str,
+                max_frames: Optional[int] = None, granularity: str = "fine", verbosity: str = "full") -> bytes:
+    solved = solve_sort(algorithm, array, trace_format, max_frames, granularity, verbosity)
+    if media_type == TRACE_MEDIA_TYPE:
+        return encode_sort_trace(solved["trace"], solved["summary"], verbosity)
+    return encode_json({"steps": solved["trace"].steps(trace_format, verbosity=verbosity), **solved["summary"]})
+
+
+def iter_sort_frames(algorithm: str, array: List[int], trace_format: str, max_frames: int,
+                     granularity: str = "fine", verbosity: str = "full") -> Iterator[Dict[str, Any]]:
+    """Downsampled steps for streaming; the frame plan needs the whole run, so it is recorded first."""
+    trace = Trace.record(array, sort_events(algorithm, array, granularity)).downsample(max_frames)
+    yield from trace.iter_steps(trace_format, verbosity=verbosity)
+
+
+def solve_graph(algorithm: str, graph: Dict[str, Dict[str, Any]], start: str, directed: bool,
+                target: Optional[str] = None, depth_limit: Optional[int] = None, heuristic: Optional[str] = None,
+                positions: Optional[Dict[str, Tuple[float, float]]] = None, max_frames: Optional[int] = None,
+                progress: Optional[Progress] = None) -> GraphTrace:
+    # Ingested once: labels to dense ids, weights coerced to float
+    trace = GRAPH_REGISTRY[algorithm](CSRGraph(graph), start, directed, target=target, depth_limit=depth_limit,
+                                      heuristic=heuristic, positions=positions, progress=progress)
+    return trace.downsample(max_frames)
+
+
+def render_graph(algorithm: str, graph: Dict[str, Dict[str, Any]], start: str, directed: bool,
+                 target: Optional[str], media_type: str, max_frames: Optional[int] = None,
+                 trace_format: str = "full", depth_limit: Optional[int] = None, heuristic: Optional[str] = None,
+                 positions: Optional[Dict[str, Tuple[float, float]]] = None) -> bytes:
+    trace = solve_graph(algorithm, graph, start, directed, target, depth_limit, heuristic, positions, max_frames)
+    result = {"steps": trace.steps(trace_format), "algorithm": algorithm, "trace_format": trace_format}
+    if trace_format == "delta":
+        result["keyframe_interval"] = trace.interval
+    logger.info("Graph %s from '%s' on %d nodes", algorithm, start, len(graph))
+    if media_type == TRACE_MEDIA_TYPE:
+        return encode_graph_trace(result)
+    return encode_json(result)
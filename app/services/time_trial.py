@@ -0,0 +1,114 @@
+"""
+Parallel time trials: every algorithm runs in the shared process pool under
+its own deadline, and results are yielded as soon as each one finishes.
+In benchmark mode each entry is timed repeatedly (see app.services.benchmark).
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.algorithms.sorting import sort_events
+from app.algorithms.sorting_metrics import SORTING_METRICS, measure
+from app.algorithms.trace import Trace
+from app.config import (
+    BENCHMARK_REPEAT, BENCHMARK_WARMUP, FULL_TRACE_MAX_ARRAY_SIZE, TIME_TRIAL_DEADLINE_SECONDS,
+    TIME_TRIAL_TRACE_MEMORY_MAX_STEPS,
+)
+from app.services.admission import check_counting_range, sort_steps
+from app.services.benchmark import benchmark, intervals_overlap, peak_allocation
+from app.services.executor import DeadlineExceeded, deadline, solve_executor
+
+logger = logging.getLogger(__name__)
+
+# Extra wait beyond the worker-side deadline before giving up on a result
+DEADLINE_GRACE_SECONDS = 1.0
+
+TIME_TRIAL_MODES = ("single", "benchmark")
+
+
+def time_trial_entry(algorithm: str, array: List[int], deadline_seconds: float, mode: str = "single",
+                     repeat: int = BENCHMARK_REPEAT, warmup: int = BENCHMARK_WARMUP) -> Dict[str, Any]:
+    """Runs inside a pool worker."""
+    check_counting_range(algorithm, array)
+    stats = None
+    with deadline(deadline_seconds):
+        if mode == "benchmark":
+            stats, metrics = benchmark(algorithm, array, repeat, warmup)
+            execution_time_us = stats["median_us"]
+        else:
+            execution_time_us, metrics = measure(algorithm, array)
+        # Auxiliary allocation of the bare algorithm: the working copy is made before measuring
+        working = list(array)
+        _, peak_bytes = peak_allocation(lambda: SORTING_METRICS[algorithm](working, in_place=True))
+        # Step counts and trace memory need the trace, so only report them where it is cheap;
+        # tracing allocations slows recording several times over, hence the tighter step limit
+        total_steps = trace_peak_bytes = None
+        if len(array) <= FULL_TRACE_MAX_ARRAY_SIZE:
+            if sort_steps(algorithm, array) <= TIME_TRIAL_TRACE_MEMORY_MAX_STEPS:
+                trace, trace_peak_bytes = peak_allocation(lambda: Trace.record(array, sort_events(algorithm, array)))
+                total_steps = len(trace)
+            else:
+                total_steps = sum(1 for _ in sort_events(algorithm, array))
+
+    result = {
+        "algorithm": algorithm,
+        "execution_time_us": round(execution_time_us, 2),
+        "comparisons": metrics["comparisons"],
+        "swaps": metrics["swaps"],
+        "reads": metrics["reads"],
+        "writes": metrics["writes"],
+        "total_steps": total_steps,
+        "peak_bytes": peak_bytes,
+        "trace_peak_bytes": trace_peak_bytes,
+    }
+    if stats is not None:
+        result["stats"] = stats
+    return result
+
+
+def metrics_entry(algorithm: str, array: List[int], deadline_seconds: float):
+    """measure() under a deadline, for mode=metrics sorts (enforced where the solve runs on a worker's main thread)."""
+    check_counting_range(algorithm, array)
+    with deadline(deadline_seconds):
+        return measure(algorithm, array)
+
+
+async def _run_entry(algorithm: str, array: List[int], deadline_seconds: float, *options) -> Dict[str, Any]:
+    # The worker enforces the deadline from when the entry starts running;
+    # the bounded wait only guards against a wedged worker.
+    try:
+        return await solve_executor.run_trial(time_trial_entry, algorithm, array, deadline_seconds, *options,
+                                              deadline_seconds=deadline_seconds, entries=len(SORTING_METRICS),
+                                              grace=DEADLINE_GRACE_SECONDS)
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        return {"algorithm": algorithm, "timed_out": True, "deadline_seconds": deadline_seconds}
+    except Exception as e:
+        logger.exception("Time trial entry failed for %s", algorithm)
+        return {"algorithm": algorithm, "error": str(e)}
+
+
+async def iter_time_trial(array: List[int], deadline_seconds: float = TIME_TRIAL_DEADLINE_SECONDS,
+                          mode: str = "single", repeat: int = BENCHMARK_REPEAT,
+                          warmup: int = BENCHMARK_WARMUP) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one result per algorithm, in completion order."""
+    tasks = [asyncio.ensure_future(_run_entry(name, array, deadline_seconds, mode, repeat, warmup))
+             for name in SORTING_METRICS]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(results, key=lambda x: x.get("execution_time_us", float("inf")))
+
+
+def fastest_is_significant(ranked: List[Dict[str, Any]]) -> Optional[bool]:
+    """Whether the fastest benchmarked result's median interval clears the runner-up's; None without stats."""
+    timed = [r for r in ranked if "stats" in r]
+    if len(timed) < 2:
+        return None
+    return not intervals_overlap(timed[0]["stats"], timed[1]["stats"])
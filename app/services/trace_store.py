@@ -0,0 +1,65 @@
+"""
+Bounded in-memory store for server-side trace sessions.
+Entries are evicted least-recently-used first once the entry or total-step
+budget is exceeded, and expire after a fixed time-to-live.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from app.algorithms.graph_trace import GraphTrace
+from app.algorithms.trace import Trace
+from app.config import TRACE_STORE_MAX_ENTRIES, TRACE_STORE_MAX_STEPS, TRACE_STORE_TTL_SECONDS
+
+
+class TraceStore:
+
+    def __init__(self, max_entries: int = TRACE_STORE_MAX_ENTRIES, max_steps: int = TRACE_STORE_MAX_STEPS,
+                 ttl_seconds: float = TRACE_STORE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_steps = max_steps
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_steps = 0
+        self._lock = threading.Lock()
+
+    def put(self, kind: str, steps: Union[Trace, GraphTrace], **meta) -> str:
+        if len(steps) > self.max_steps:
+            raise ValueError(f"Trace has {len(steps)} steps; sessions hold at most {self.max_steps}")
+        trace_id = uuid.uuid4().hex
+        entry = {"kind": kind, "steps": steps, "created": time.monotonic(), **meta}
+        with self._lock:
+            self._entries[trace_id] = entry
+            self._total_steps += len(steps)
+            self._evict()
+        return trace_id
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(trace_id)
+            if entry is not None:
+                self._entries.move_to_end(trace_id)
+            return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self):
+        # Expired entries first, then least recently used until within budget
+        deadline = time.monotonic() - self.ttl_seconds
+        for trace_id in [k for k, e in self._entries.items() if e["created"] < deadline]:
+            self._drop(trace_id)
+        while self._entries and (len(self._entries) > self.max_entries or self._total_steps > self.max_steps):
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, trace_id: str):
+        entry = self._entries.pop(trace_id)
+        self._total_steps -= len(entry["steps"])
+
+
+trace_store = TraceStore()
@@ -0,0 +1,21 @@
+"""
+Print the priority queue benchmark of app.services.heap_benchmark as a table.
+Run from the repository root: python -m scripts.heap_benchmark [nodes] [degree]
+"""
+
+import sys
+
+from app.services.heap_benchmark import compare_arities
+
+
+def main(argv):
+    nodes = int(argv[0]) if argv else 20_000
+    degree = int(argv[1]) if len(argv) > 1 else 8
+    for row in compare_arities(nodes, degree):
+        print(f"{row['algorithm']:<9} {row['queue']:<6} median {row['median_us'] / 1000:8.2f} ms  "
+              f"p95 {row['p95_us'] / 1000:8.2f} ms  steps {row['steps']:>8}  "
+              f"decrease-keys {row['decrease_keys']:>6}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
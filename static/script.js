@@ -1,3 +1,327 @@
+// Parse a newline-delimited JSON response body as it arrives
+async function* ndjsonLines(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const parts = buffer.split('\n');
+        buffer = parts.pop();
+        for (const line of parts) {
+            if (line) yield JSON.parse(line);
+        }
+    }
+    if (buffer.trim()) yield JSON.parse(buffer);
+}
+
+
+// ============================================
+// BINARY TRACES (application/x-trace)
+// Packed columns plus a JSON meta block; the layout is
+// documented in app/algorithms/binary_trace.py.
+// ============================================
+
+const TRACE_MEDIA_TYPE = 'application/x-trace';
+const TRACE_DTYPES = { u8: Uint8Array, u32: Uint32Array, i32: Int32Array, f64: Float64Array };
+const HOST_LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+function decodeTrace(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'VTR1') throw new Error('Not a binary trace');
+    const metaLength = view.getUint32(4, true);
+    const meta = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, metaLength)));
+
+    const columns = {};
+    let offset = 8 + metaLength;
+    for (const { name, dtype, length } of meta.columns) {
+        offset += (8 - offset % 8) % 8;
+        const Type = TRACE_DTYPES[dtype];
+        if (HOST_LITTLE_ENDIAN) {
+            // Zero-copy view onto the response buffer
+            columns[name] = new Type(buffer, offset, length);
+        } else {
+            const column = new Type(length);
+            const getter = { u8: 'getUint8', u32: 'getUint32', i32: 'getInt32', f64: 'getFloat64' }[dtype];
+            for (let i = 0; i < length; i++) column[i] = view[getter](offset + i * Type.BYTES_PER_ELEMENT, true);
+            columns[name] = column;
+        }
+        offset += length * Type.BYTES_PER_ELEMENT;
+    }
+    return { meta, columns };
+}
+
+// Materialize step objects in the same shape as the JSON API returns
+function traceSteps({ meta, columns: c }) {
+    const strings = meta.strings;
+    const steps = [];
+    for (let i = 0; i < meta.steps; i++) {
+        const step = { type: strings[c.type[i]] };
+        if (c.description) {
+            step.description = strings[c.description[i]];
+        } else if (c.template) {
+            step.template = strings[c.template[i]];
+            step.params = Array.from(c.params.subarray(c.params_offsets[i], c.params_offsets[i + 1]));
+        }
+        if (meta.kind === 'sort') {
+            if (c.level_key[i]) step[meta.level_keys[c.level_key[i] - 1]] = c.level[i];
+            if (c.spans && c.spans[i] > 1) step.coalesced = c.spans[i];
+            step.indices = Array.from(c.indices.subarray(c.indices_offsets[i], c.indices_offsets[i + 1]));
+            if (step.type === 'scan' || step.type === 'pass') {
+                // Range steps pack (start, end, winner[, swaps]) into their indices
+                const [start, end, winner, swaps] = step.indices;
+                Object.assign(step, { range: [start, end], winner, comparisons: end - start, indices: [winner] });
+                if (swaps !== undefined) step.swaps = swaps;
+            }
+            step.writes = [];
+            for (let k = c.writes_offsets[i]; k < c.writes_offsets[i + 1]; k++) {
+                step.writes.push([c.write_index[k], c.write_value[k]]);
+            }
+        } else {
+            meta.fields.forEach(([name, shape], bit) => {
+                if (!(c.present[i] & (1 << bit))) return;
+                if (shape === 'node') {
+                    step[name] = c[name][i] < 0 ? null : strings[c[name][i]];
+                    return;
+                }
+                if (shape === 'number') {
+                    step[name] = c[name][i];
+                    return;
+                }
+                const lo = c[`${name}_offsets`][i];
+                const hi = c[`${name}_offsets`][i + 1];
+                const values = [];
+                for (let k = lo; k < hi; k++) {
+                    if (shape === 'nodes') values.push(strings[c[name][k]]);
+                    else if (shape === 'edges') values.push([strings[c[name][2 * k]], strings[c[name][2 * k + 1]]]);
+                }
+                if (shape === 'distances') {
+                    step[name] = {};
+                    for (let k = lo; k < hi; k++) {
+                        const d = c[`${name}_values`][k];
+                        step[name][strings[c[name][k]]] = Number.isFinite(d) ? d : '∞';
+                    }
+                } else {
+                    step[name] = values;
+                }
+            });
+        }
+        steps.push(step);
+    }
+    return { meta, steps, initial: c.initial ? Array.from(c.initial) : undefined };
+}
+
+
+// ============================================
+// STEP DESCRIPTIONS
+// Steps requested with verbosity 'summary' carry a template id and
+// params; the template table is fetched once and formatted here.
+// ============================================
+
+let descriptionTemplates = null;
+
+function loadDescriptionTemplates(apiUrl) {
+    if (!descriptionTemplates) {
+        descriptionTemplates = fetch(`${apiUrl}/api/description-templates`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => data.templates)
+            .catch(error => {
+                descriptionTemplates = null;
+                throw error;
+            });
+    }
+    return descriptionTemplates;
+}
+
+function formatDescription(templates, step) {
+    if (step.description !== undefined) return step.description;
+    const template = templates && templates[step.template];
+    if (!template) return '';
+    return template.replace(/\{(\d+)\}/g, (_, k) => step.params[k]);
+}
+
+
+// ============================================
+// SORT TRACE PLAYER
+// Replays delta traces: steps carry only their writes,
+// with a full-array keyframe every few steps.
+// ============================================
+
+class SortTracePlayer {
+    constructor(data) {
+        this.steps = data.steps || [];
+        this.initial = (data.initial || (this.steps[0] && this.steps[0].array) || []).slice();
+        this.array = this.initial.slice();
+        this.index = -1;
+        this.complete = data.steps !== undefined;
+        this.waiters = [];
+    }
+
+    get length() {
+        return this.steps.length;
+    }
+
+    push(step) {
+        this.steps.push(step);
+        this.waiters.splice(0).forEach(resolve => resolve());
+    }
+
+    finish() {
+        this.complete = true;
+        this.waiters.splice(0).forEach(resolve => resolve());
+    }
+
+    waitForSteps() {
+        return new Promise(resolve => this.waiters.push(resolve));
+    }
+
+    apply(step) {
+        if (step.array) {
+            this.array = step.array.slice();
+        } else if (step.writes) {
+            for (const [i, v] of step.writes) this.array[i] = v;
+        }
+    }
+
+    next() {
+        const step = this.steps[++this.index];
+        this.apply(step);
+        return step;
+    }
+
+    seek(index) {
+        // Rewind to the nearest keyframe at or before index, then replay forward
+        let k = index;
+        while (k >= 0 && !this.steps[k].array) k--;
+        this.array = k >= 0 ? this.steps[k].array.slice() : this.initial.slice();
+        for (let s = k + 1; s <= index; s++) this.apply(this.steps[s]);
+        this.index = index;
+        return this.steps[index];
+    }
+
+    // Zoom into a coarse range step: replace it with one step per comparison.
+    // The array doesn't change during a scan, so the fine steps are rebuilt
+    // from the state just before it.
+    expand(index) {
+        const step = this.steps[index];
+        if (!step || !step.range) return 0;
+        const before = this.seek(index - 1) ? this.array.slice() : this.initial.slice();
+        const [start, end] = step.range;
+        const level = step.pass_number !== undefined ? { pass_number: step.pass_number } : {};
+        const fine = [];
+
+        if (step.type === 'scan') {
+            let min = start;
+            for (let j = start + 1; j <= end; j++) {
+                fine.push({ type: 'compare', indices: [min, j], writes: [], template: 'compare_minimum', params: [before[min], before[j]], ...level });
+                if (before[j] < before[min]) min = j;
+            }
+        } else if (step.type === 'pass') {
+            const a = before.slice();
+            for (let j = start; j < end; j++) {
+                fine.push({ type: 'compare', indices: [j, j + 1], writes: [], template: 'compare_adjacent', params: [a[j], a[j + 1], j, j + 1], ...level });
+                if (a[j] > a[j + 1]) {
+                    [a[j], a[j + 1]] = [a[j + 1], a[j]];
+                    fine.push({ type: 'swapping', indices: [j, j + 1], writes: [[j, a[j]], [j + 1, a[j + 1]]], template: 'swapped', params: [a[j + 1], a[j]], ...level });
+                }
+            }
+        }
+        // Keep any keyframe the range step carried on the last fine step
+        if (step.array && fine.length) fine[fine.length - 1].array = step.array;
+        this.steps.splice(index, 1, ...fine);
+        this.seek(index - 1);
+        return fine.length;
+    }
+}
+
+// ============================================
+// GRAPH TRACE STATE
+// Delta graph traces carry only what each step changed (visited_add,
+// queue_push / queue_pop, mst_add), with a snapshot of the state fields
+// every few steps (or to reset them, as iterative deepening does).
+// ============================================
+
+class GraphTraceState {
+    constructor() {
+        this.visited = new Set();
+        this.queue = [];
+        this.mstEdges = [];
+    }
+
+    // The step with its state filled in, as a full-format step carries it.
+    // Snapshot fields replace the state, then the step's changes apply on top.
+    apply(step) {
+        if (step.visited) this.visited = new Set(step.visited);
+        if (step.queue) this.queue = step.queue.slice();
+        if (step.mst_edges) this.mstEdges = step.mst_edges.slice();
+        for (const node of step.visited_add || []) this.visited.add(node);
+        // Pushes before pops, as the server folds skipped steps that way
+        this.queue.push(...(step.queue_push || []));
+        this.queue.splice(0, step.queue_pop || 0);
+        this.mstEdges.push(...(step.mst_add || []));
+        return { ...step, visited: [...this.visited], queue: this.queue.slice(), mst_edges: this.mstEdges };
+    }
+}
+
+// Client for /ws/play: messages are queued until receive() asks for them
+class PlaybackSocket {
+    constructor(url, request) {
+        this.messages = [];
+        this.waiters = [];
+        this.socket = new WebSocket(url);
+        this.socket.onopen = () => this.socket.send(JSON.stringify(request));
+        this.socket.onmessage = (event) => this.deliver(JSON.parse(event.data));
+        this.socket.onclose = () => this.deliver({ type: 'closed' });
+    }
+
+    deliver(message) {
+        const waiter = this.waiters.shift();
+        if (waiter) waiter(message);
+        else this.messages.push(message);
+    }
+
+    receive() {
+        if (this.messages.length) return Promise.resolve(this.messages.shift());
+        return new Promise(resolve => this.waiters.push(resolve));
+    }
+
+    // Controls: pause, resume, speed (frames per second) and seek (frame index)
+    send(action, value) {
+        if (this.socket.readyState === WebSocket.OPEN) {
+            this.socket.send(JSON.stringify(value === undefined ? { action } : { action, value }));
+        }
+    }
+
+    close() {
+        this.socket.close();
+    }
+}
+
+function formatBytes(bytes) {
+    if (bytes === null || bytes === undefined) return 'N/A';
+    if (bytes < 1024) return `${bytes} B`;
+    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+}
+
+function formatSocketError(message) {
+    if (message.type === 'closed') return 'Playback connection closed';
+    const detail = typeof message.detail === 'string' ? message.detail : JSON.stringify(message.detail);
+    return `${message.status}: ${detail}`;
+}
+
+function rangeIndices(step) {
+    if (!step.range) return step.indices || [];
+    const [start, end] = step.range;
+    return Array.from({ length: end - start + 1 }, (_, k) => start + k);
+}
+
+
 class SortingVisualizer {
     constructor() {
     this.apiUrl = window.location.origin;
@@ -54,6 +378,7 @@ document.getElementById('runTrialBtn').addEventListener('click', () => this.runT
         document.getElementById('speedSlider').addEventListener('input', (e) => {
             this.speed = parseFloat(e.target.value);
             document.getElementById('speedLabel').textContent = this.speed + 'x';
+            this.playback?.send('speed', 10 * this.speed);
         });
 
         // Preset buttons
@@ -244,43 +569,64 @@ document.getElementById('runTrialBtn').addEventListener('click', () => this.runT
     document.getElementById('pauseBtn').disabled = false;
     
     try {
-        const response = await fetch(`${this.apiUrl}/api/sort`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                array: this.currentArray,
-                algorithm: this.currentAlgorithm
-            })
+        this.templates = await loadDescriptionTemplates(this.apiUrl);
+        // The server computes and paces the frames; closing the socket stops the run there
+        const socket = new PlaybackSocket(`${this.apiUrl.replace(/^http/, 'ws')}/ws/play`, {
+            array: this.currentArray,
+            algorithm: this.currentAlgorithm,
+            trace_format: 'delta',
+            verbosity: 'summary',
+            granularity: document.getElementById('granularitySelect')?.value || 'fine',
+            speed: 10 * this.speed
         });
+        this.playback = socket;
+        const start = await socket.receive();
+        if (start.type !== 'start') throw new Error(formatSocketError(start));
+
+        const trace = new SortTracePlayer({ initial: start.initial });
+        trace.complete = false;
+        this.trace = trace;
+        this.allSteps = trace.steps;
+        let comparisons = 0;
+        let swaps = 0;
         
-        const data = await response.json();
-        
-        // Visualize steps
-        for (let i = 0; i < data.steps.length && this.isRunning; i++) {
-            const step = data.steps[i];
-            this.currentArray = step.array;
+        // Visualize steps as they arrive
+        let i = 0;
+        while (this.isRunning) {
+            const message = await socket.receive();
+            if (message.type === 'end' || message.type === 'closed') break;
+            if (message.type === 'error') throw new Error(formatSocketError(message));
+            if (message.type !== 'frame') continue;
+            trace.push(message.step);
+            const step = trace.next();
+            i++;
+            this.currentArray = trace.array;
+            if (step.type === 'compare') comparisons++;
+            if (step.type === 'swapping') swaps++;
+            // Coarse range steps stand for a whole scan
+            if (step.range) {
+                comparisons += step.comparisons;
+                swaps += step.swaps || 0;
+            }
             
-            const highlightClass = step.type === 'comparing' ? 'comparing' :
+            const highlightClass = step.type === 'comparing' || step.range ? 'comparing' :
                                  step.type === 'swapping' ? 'swapping' :
                                  step.type === 'sorted' ? 'sorted' : 'pivot';
             
-            this.renderBars(step.indices, highlightClass);
-            document.getElementById('stepDescription').textContent = step.description;
+            this.renderBars(rangeIndices(step), highlightClass);
+            document.getElementById('stepDescription').textContent = formatDescription(this.templates, step);
             
             this.updateStats(
                 this.currentArray.length,
-                i + 1,
-                data.total_comparisons,
-                data.total_swaps
+                i,
+                step.total_comparisons ?? comparisons,
+                step.total_swaps ?? swaps
             );
             
-            const progress = ((i + 1) / data.steps.length) * 100;
+            const progress = Math.min(i / start.estimated_steps, 1) * 100;
             document.getElementById('progressBar').style.width = progress + '%';
-            
-            await this.sleep(100 / this.speed);
         }
+        trace.finish();
         
         // Only show completion message if NOT paused
         if (this.isRunning) {
@@ -293,11 +639,13 @@ document.getElementById('runTrialBtn').addEventListener('click', () => this.runT
     } catch (error) {
         console.error('Error during sorting:', error);
         alert('Error: ' + error.message);
+    } finally {
+        this.playback?.close();
+        this.playback = null;
+        this.isRunning = false;
+        document.getElementById('startBtn').disabled = false;
+        document.getElementById('pauseBtn').disabled = true;
     }
-    
-    this.isRunning = false;
-    document.getElementById('startBtn').disabled = false;
-    document.getElementById('pauseBtn').disabled = true;
 }
 
 
@@ -312,8 +660,8 @@ async continueVisualization() {
             return;
         }
         
-        const step = this.allSteps[i];
-        this.currentArray = step.array;
+        const step = this.trace.seek(i);
+        this.currentArray = this.trace.array;
         
         // Determine highlight class
         const highlightClass = step.type === 'comparing' ? 'comparing' :
@@ -324,8 +672,8 @@ async continueVisualization() {
 
         
         // ✅ Render bars with animation
-        this.renderBars(step.indices || [], highlightClass);
-        document.getElementById('stepDescription').textContent = step.description || 'Sorting...';
+        this.renderBars(rangeIndices(step), step.range ? 'comparing' : highlightClass);
+        document.getElementById('stepDescription').textContent = formatDescription(this.templates, step) || 'Sorting...';
         
         // Get final stats from last step
         const finalStep = this.allSteps[totalSteps - 1];
@@ -386,15 +734,15 @@ stepBackward() {
     if (!this.isPaused || this.currentStepIndex <= 0) return;
     
     this.currentStepIndex--;
-    const step = this.allSteps[this.currentStepIndex];
+    const step = this.trace.seek(this.currentStepIndex);
     
-    this.currentArray = step.array;
+    this.currentArray = this.trace.array;
     const highlightClass = step.type === 'comparing' ? 'comparing' :
                          step.type === 'swapping' ? 'swapping' :
                          step.type === 'sorted' ? 'sorted' : 'pivot';
     
     this.renderBars(step.indices, highlightClass);
-    document.getElementById('stepDescription').textContent = step.description;
+    document.getElementById('stepDescription').textContent = formatDescription(this.templates, step);
     
     const progress = ((this.currentStepIndex + 1) / this.allSteps.length) * 100;
     document.getElementById('progressBar').style.width = progress + '%';
@@ -412,15 +760,17 @@ stepForward() {
     if (!this.isPaused || this.currentStepIndex >= this.allSteps.length - 1) return;
     
     this.currentStepIndex++;
-    const step = this.allSteps[this.currentStepIndex];
+    // Stepping manually zooms into coarse range steps
+    this.trace.expand(this.currentStepIndex);
+    const step = this.trace.seek(this.currentStepIndex);
     
-    this.currentArray = step.array;
+    this.currentArray = this.trace.array;
     const highlightClass = step.type === 'comparing' ? 'comparing' :
                          step.type === 'swapping' ? 'swapping' :
                          step.type === 'sorted' ? 'sorted' : 'pivot';
     
     this.renderBars(step.indices, highlightClass);
-    document.getElementById('stepDescription').textContent = step.description;
+    document.getElementById('stepDescription').textContent = formatDescription(this.templates, step);
     
     const progress = ((this.currentStepIndex + 1) / this.allSteps.length) * 100;
     document.getElementById('progressBar').style.width = progress + '%';
@@ -469,11 +819,11 @@ stepForward() {
             mimeType = 'application/json';
         } else if (format === 'csv') {
             // Export as CSV
-            let csv = 'Algorithm,Time (ms),Space Complexity,Comparisons,Swaps,Steps\n';
+            let csv = 'Algorithm,Time (ms),Space Complexity,Comparisons,Swaps,Reads,Writes,Steps\n';
             
             this.lastTrialResults.results.forEach(result => {
                 const timeMs = (result.execution_time_us / 1000).toFixed(3);
-                csv += `${result.algorithm},${timeMs},${result.space_complexity},${result.comparisons},${result.swaps},${result.total_steps}\n`;
+                csv += `${result.algorithm},${timeMs},${result.space_complexity},${result.comparisons},${result.swaps},${result.reads},${result.writes},${result.total_steps ?? ''}\n`;
             });
             
             csv += `\nArray Size: ${this.lastTrialResults.array_size}\n`;
@@ -521,7 +871,7 @@ stepForward() {
     resultsDiv.innerHTML = '<div style="text-align: center; padding: 2rem;"><i class="fas fa-spinner fa-spin"></i> Running time trial...</div>';
     
     try {
-        const response = await fetch(`${this.apiUrl}/api/time-trial`, {
+        const response = await fetch(`${this.apiUrl}/api/time-trial?stream=1`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -535,7 +885,19 @@ stepForward() {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
         
-        const data = await response.json();
+        // Results arrive as each algorithm finishes; re-rank and redraw on every one
+        const data = { array_size: this.currentArray.length, results: [], fastest: null };
+        const byTime = (a, b) => (a.execution_time_us ?? Infinity) - (b.execution_time_us ?? Infinity);
+        for await (const message of ndjsonLines(response)) {
+            if (message.type === 'result') {
+                data.results.push(message);
+                data.results.sort(byTime);
+            } else if (message.type === 'summary') {
+                data.array_size = message.array_size;
+                data.fastest = message.fastest;
+            }
+            this.displayTrialResults(data);
+        }
         
         // Store results
         this.lastTrialResults = {
@@ -546,9 +908,6 @@ stepForward() {
             timestamp: new Date().toISOString()
         };
         
-        // Display results
-        this.displayTrialResults(data);
-        
         return this.lastTrialResults;
         
     } catch (error) {
@@ -577,6 +936,8 @@ displayTrialResults(data) {
     data.results.forEach((result, index) => {
         const medal = index === 0 ? '🥇' : index === 1 ? '🥈' : index === 2 ? '🥉' : '🏅';
         const timeMs = result.execution_time_us / 1000;
+        const timeLabel = result.timed_out ? `timed out (> ${result.deadline_seconds}s)` :
+                          result.error ? 'error' : `${timeMs.toFixed(3)}ms`;
         
         html += `
             <div class="result-card">
@@ -585,12 +946,16 @@ displayTrialResults(data) {
                 <div class="result-stats">
                     <div class="stat-item">
                         <span class="stat-label">⏱️ Time:</span>
-                        <span class="stat-value">${timeMs.toFixed(3)}ms</span>
+                        <span class="stat-value">${timeLabel}</span>
                     </div>
                     <div class="stat-item">
                         <span class="stat-label">💾 Space:</span>
                         <span class="stat-value">${result.space_complexity || 'N/A'}</span>
                     </div>
+                    <div class="stat-item">
+                        <span class="stat-label">🧮 Peak memory (sort / trace):</span>
+                        <span class="stat-value">${formatBytes(result.peak_bytes)} / ${formatBytes(result.trace_peak_bytes)}</span>
+                    </div>
                     <div class="stat-item">
                         <span class="stat-label">🔄 Comparisons:</span>
                         <span class="stat-value">${result.comparisons ? result.comparisons.toLocaleString() : '0'}</span>
@@ -599,6 +964,10 @@ displayTrialResults(data) {
                         <span class="stat-label">↔️ Swaps:</span>
                         <span class="stat-value">${result.swaps ? result.swaps.toLocaleString() : '0'}</span>
                     </div>
+                    <div class="stat-item">
+                        <span class="stat-label">📖 Reads / ✏️ Writes:</span>
+                        <span class="stat-value">${(result.reads || 0).toLocaleString()} / ${(result.writes || 0).toLocaleString()}</span>
+                    </div>
                     <div class="stat-item">
                         <span class="stat-label">📊 Steps:</span>
                         <span class="stat-value">${result.total_steps ? result.total_steps.toLocaleString() : '0'}</span>
@@ -630,6 +999,9 @@ displayTrialResults(data) {
 // GRAPH ALGORITHMS VISUALIZER
 // ============================================
 
+// Algorithms that take a target node
+const TARGET_ALGORITHMS = ['dijkstra', 'iddfs', 'astar', 'bidirectional_dijkstra', 'bidirectional_bfs'];
+
 class GraphVisualizer {
     constructor() {
         this.apiUrl = window.location.origin;
@@ -976,7 +1348,11 @@ class GraphVisualizer {
         const algo = document.getElementById('graphAlgoSelect').value;
         const group = document.getElementById('targetNodeGroup');
         if (group) {
-            group.style.display = algo === 'dijkstra' ? '' : 'none';
+            group.style.display = TARGET_ALGORITHMS.includes(algo) ? '' : 'none';
+        }
+        const heuristic = document.getElementById('heuristicGroup');
+        if (heuristic) {
+            heuristic.style.display = algo === 'astar' ? '' : 'none';
         }
     }
 
@@ -1295,16 +1671,25 @@ class GraphVisualizer {
             );
             return;
         }
+        if (['astar', 'bidirectional_dijkstra', 'bidirectional_bfs'].includes(algo)
+            && !document.getElementById('targetNodeSelect').value) {
+            this.showGraphError(
+                'No Target Node',
+                'A* and the bidirectional searches find a path between two nodes. Please select a target node.',
+                '', 'warning'
+            );
+            return;
+        }
 
         // ---- Negative weight validation per algorithm ----
         const negativeEdges = this.edges.filter(e => e.weight < 0);
         if (negativeEdges.length > 0) {
             const negList = negativeEdges.map(e => `${e.from} → ${e.to} (weight: ${e.weight})`).join(', ');
 
-            if (algo === 'dijkstra') {
+            if (algo === 'dijkstra' || algo === 'astar' || algo === 'bidirectional_dijkstra') {
                 this.showGraphError(
                     'Negative Weights Not Allowed',
-                    `Dijkstra's algorithm does not support negative edge weights.`,
+                    `Dijkstra's algorithm (and A* and bidirectional Dijkstra, built on it) does not support negative edge weights.`,
                     `Dijkstra uses a greedy approach — it assumes that once a node is visited with the shortest distance, ` +
                     `no shorter path exists. Negative weights violate this assumption and can produce incorrect results. ` +
                     `Use Bellman-Ford algorithm for graphs with negative weights.\n\nNegative edges found: ${negList}`,
@@ -1335,17 +1720,25 @@ class GraphVisualizer {
 
         try {
             const graph = this.buildAdjList();
-            const payload = { graph, algorithm: algo, start, directed: this.directed };
+            const payload = { graph, algorithm: algo, start, directed: this.directed, trace_format: 'delta' };
 
-            // Include target for Dijkstra
-            if (algo === 'dijkstra') {
+            // Include target for Dijkstra, IDDFS and the point-to-point searches
+            if (TARGET_ALGORITHMS.includes(algo)) {
                 const target = document.getElementById('targetNodeSelect').value;
                 if (target) payload.target = target;
             }
 
+            // A* estimates remaining distance from the canvas positions
+            if (algo === 'astar') {
+                payload.heuristic = document.getElementById('heuristicSelect').value;
+                payload.positions = Object.fromEntries(
+                    Object.entries(this.nodes).map(([label, p]) => [label, [p.x, p.y]])
+                );
+            }
+
             const response = await fetch(`${this.apiUrl}/api/graph-solve`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Accept': `${TRACE_MEDIA_TYPE}, application/json` },
                 body: JSON.stringify(payload)
             });
 
@@ -1360,7 +1753,9 @@ class GraphVisualizer {
                 throw new Error(errMsg);
             }
 
-            const data = await response.json();
+            const data = response.headers.get('Content-Type')?.startsWith(TRACE_MEDIA_TYPE)
+                ? traceSteps(decodeTrace(await response.arrayBuffer()))
+                : await response.json();
             await this.animateSteps(data.steps);
 
         } catch (err) {
@@ -1379,9 +1774,11 @@ class GraphVisualizer {
 
     async animateSteps(steps) {
         const descEl = document.getElementById('graphStepDescription');
+        const state = new GraphTraceState();
 
-        for (const step of steps) {
+        for (const delta of steps) {
             if (!this.animating) break;
+            const step = state.apply(delta);
 
             // Update description
             descEl.textContent = step.description || '';
@@ -1427,8 +1824,8 @@ class GraphVisualizer {
                 }
             }
 
-            // Relaxed / added edges → highlight
-            if (step.type === 'relax' || step.type === 'add_edge') {
+            // Relaxed / added edges and lowered queue keys → highlight
+            if (step.type === 'relax' || step.type === 'decrease_key' || step.type === 'add_edge') {
                 if (step.edges) {
                     for (const [a, b] of step.edges) {
                         if (a && b) {
@@ -0,0 +1,148 @@
+"""Unit tests for trace admission control."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.graph import GRAPH_REGISTRY
+from app.algorithms.sorting import SORTING_EVENTS, sort_events
+from app.services import admission
+from app.services.admission import estimate_graph, presortedness, sort_steps
+from app.services.result_cache import result_cache
+
+client = TestClient(app)
+
+rng = random.Random(7)
+ARRAYS = {
+    "random": [rng.randint(-50, 50) for _ in range(120)],
+    "sorted": list(range(120)),
+    "reversed": list(range(120, 0, -1)),
+    "duplicates": [rng.randint(0, 3) for _ in range(120)],
+}
+
+
+def test_presortedness():
+    assert presortedness([1, 2, 3]) == (0, 0)
+    assert presortedness([3, 2, 1]) == (3, 2)
+    assert presortedness([2, 2, 1]) == (2, 2)
+
+
+@pytest.mark.parametrize("name", list(ARRAYS))
+@pytest.mark.parametrize("algo", ["bubble", "insertion", "counting"])
+def test_exact_step_counts(algo, name):
+    arr = ARRAYS[name]
+    assert sort_steps(algo, arr) == sum(1 for _ in SORTING_EVENTS[algo](arr))
+
+
+@pytest.mark.parametrize("name", list(ARRAYS))
+@pytest.mark.parametrize("algo", ["selection", "merge", "heap"])
+def test_step_bounds(algo, name):
+    arr = ARRAYS[name]
+    assert sort_steps(algo, arr) >= sum(1 for _ in SORTING_EVENTS[algo](arr))
+
+
+@pytest.mark.parametrize("algo", ["bubble", "selection"])
+def test_coarse_step_bounds(algo):
+    for arr in ARRAYS.values():
+        actual = sum(1 for _ in sort_events(algo, arr, "coarse"))
+        assert actual <= sort_steps(algo, arr, "coarse") <= actual + len(arr)
+
+
+def test_graph_step_bounds():
+    graph = {"A": {"B": 1, "C": 2}, "B": {"A": 1, "C": 1, "D": 4}, "C": {"A": 2, "B": 1}, "D": {"B": 4}}
+    for algo, solve in GRAPH_REGISTRY.items():
+        steps = solve(graph, "A", False)
+        assert estimate_graph(algo, graph, "application/json")["steps"] >= len(steps)
+        assert estimate_graph(algo, graph, "application/json", start="A")["steps"] >= len(steps)
+
+
+def test_depth_limited_bounds_follow_reachable_depth():
+    # 8 × 8 grid: rounds stop one past the corner's eccentricity (14), not at V - 1
+    label = "R{}C{}".format
+    grid = {label(r, c): {label(r + dr, c + dc): 1 for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                          if 0 <= r + dr < 8 and 0 <= c + dc < 8}
+            for r in range(8) for c in range(8)}
+    actual = len(GRAPH_REGISTRY["iddfs"](grid, "R0C0", False))
+    estimate = estimate_graph("iddfs", grid, "application/json", start="R0C0")["steps"]
+    assert actual <= estimate <= 4 * actual
+    res = client.post("/api/graph-solve", json={"graph": grid, "algorithm": "iddfs", "start": "R0C0",
+                                                "trace_format": "delta"})
+    assert res.status_code == 200 and len(res.json()["steps"]) == actual
+
+    # A long path under a small limit only reaches the first few nodes
+    path = {f"P{i:04d}": {f"P{i + 1:04d}": 1} for i in range(3000)}
+    assert estimate_graph("dfs", path, "application/json", depth_limit=3, start="P0000")["steps"] < 50
+    for payload in ({"algorithm": "dfs", "depth_limit": 3}, {"algorithm": "iddfs", "target": "P0040"}):
+        res = client.post("/api/graph-solve", json={"graph": path, "start": "P0000", "trace_format": "delta", **payload})
+        assert res.status_code == 200
+
+
+def test_accepted_trace_reports_estimate():
+    res = client.post("/api/sort", json={"array": [3, 1, 2], "algorithm": "insertion"})
+    assert res.status_code == 200
+    assert res.headers["X-Admission"] == "accepted"
+    assert int(res.headers["X-Estimated-Steps"]) == len(res.json()["steps"])
+    assert int(res.headers["X-Estimated-Bytes"]) > 0
+
+
+def test_oversized_trace_is_downgraded_to_coarse(monkeypatch):
+    result_cache.clear()
+    monkeypatch.setattr(admission, "ADMISSION_MAX_RESPONSE_BYTES", 200_000)
+    res = client.post("/api/sort", json={"array": list(range(200, 0, -1)), "trace_format": "delta"})
+    assert res.headers["X-Admission"] == "coarse"
+    assert res.json()["granularity"] == "coarse"
+
+
+def test_oversized_trace_requires_streaming(monkeypatch):
+    result_cache.clear()
+    monkeypatch.setattr(admission, "ADMISSION_MAX_RESPONSE_BYTES", 100_000)
+    payload = {"array": list(range(150, 0, -1)), "algorithm": "insertion", "trace_format": "delta"}
+    res = client.post("/api/sort", json=payload)
+    assert res.status_code == 413
+    assert res.headers["X-Admission"] == "stream-required"
+    streamed = client.post("/api/sort?stream=1", json=payload)
+    assert streamed.status_code == 200 and streamed.headers["X-Admission"] == "accepted"
+
+
+def test_unstreamable_trace_is_downgraded_to_metrics(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_RESPONSE_BYTES", 10_000)
+    monkeypatch.setattr(admission, "ADMISSION_MAX_STREAM_BYTES", 20_000)
+    res = client.post("/api/sort", json={"array": list(range(150, 0, -1)), "algorithm": "insertion"})
+    assert res.headers["X-Admission"] == "metrics"
+    assert res.json()["mode"] == "metrics" and res.json()["array"] == list(range(1, 151))
+
+
+def test_oversized_graph_is_rejected(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_MAX_RESPONSE_BYTES", 50_000)
+    graph = {f"N{i}": {f"N{j}": 1 for j in range(60) if j != i} for i in range(60)}
+    res = client.post("/api/graph-solve", json={"graph": graph, "algorithm": "dfs", "start": "N0"})
+    assert res.status_code == 413
+    assert res.headers["X-Admission"] == "rejected"
+    assert int(res.headers["X-Estimated-Steps"]) >= 60 * 59
+
+
+def test_metrics_mode_rejects_quadratic_sorts_of_large_arrays(monkeypatch):
+    array = list(range(3000, 0, -1))
+    monkeypatch.setattr(admission, "METRICS_MAX_OPERATIONS", 100_000)
+    res = client.post("/api/sort", json={"array": array, "algorithm": "bubble", "mode": "metrics"})
+    assert res.status_code == 413
+    assert res.headers["X-Admission"] == "rejected"
+    assert int(res.headers["X-Estimated-Steps"]) > 3000 * 2999 // 2
+    res = client.post("/api/sort", json={"array": array, "algorithm": "merge", "mode": "metrics"})
+    assert res.status_code == 200 and res.json()["array"] == sorted(array)
+
+
+def test_counting_sort_value_range_is_bounded(monkeypatch):
+    wide = [0, 10**9, 5]
+    assert admission.counting_range("counting", wide) == 10**9 + 1
+    assert admission.counting_range("merge", wide) == 0
+    for mode in ("trace", "metrics"):
+        res = client.post("/api/sort", json={"array": wide, "algorithm": "counting", "mode": mode})
+        assert res.status_code == 413 and "value range" in res.json()["detail"]
+    assert client.post("/api/sort", json={"array": wide, "algorithm": "merge", "mode": "metrics"}).status_code == 200
+    # The range counts toward metrics mode's operation budget too
+    monkeypatch.setattr(admission, "METRICS_MAX_OPERATIONS", 1000)
+    res = client.post("/api/sort", json={"array": [0, 5000], "algorithm": "counting", "mode": "metrics"})
+    assert res.status_code == 413 and int(res.headers["X-Estimated-Steps"]) > 5000
@@ -0,0 +1,94 @@
+"""Unit tests for the binary trace encoding."""
+
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.binary_trace import (
+    TRACE_MEDIA_TYPE, decode_steps, decode_trace, encode_graph_trace, encode_sort_trace,
+)
+from app.algorithms.descriptions import render
+from app.algorithms.graph import GRAPH_REGISTRY
+from app.algorithms.sorting import SORTING_EVENTS
+from app.algorithms.trace import Trace, delta_sort_steps, sort_array_at
+
+client = TestClient(app)
+
+GRAPH = {"A": {"B": 1.5, "C": 4}, "B": {"C": 2, "D": 5}, "C": {"D": 1}, "D": {}}
+
+
+def without_keyframes(steps):
+    stripped = []
+    for step in steps:
+        step = {k: v for k, v in step.items() if k not in ("array", "total_comparisons", "total_swaps")}
+        step.setdefault("indices", [])
+        step.setdefault("writes", [])
+        stripped.append(step)
+    return stripped
+
+
+@pytest.mark.parametrize("algo", list(SORTING_EVENTS))
+def test_sort_trace_round_trip(algo):
+    rng = random.Random(3)
+    arr = [rng.randint(-99, 99) for _ in range(40)]
+    steps = delta_sort_steps(arr, SORTING_EVENTS[algo](arr))
+    trace = Trace.record(arr, SORTING_EVENTS[algo](arr))
+    meta, decoded = decode_steps(encode_sort_trace(trace, {"algorithm": algo}))
+    assert meta["kind"] == "sort" and meta["steps"] == len(steps)
+    # The done step carries its pending writes instead of a snapshot
+    assert decoded[:-1] == without_keyframes(steps)[:-1]
+    assert sort_array_at(arr, decoded, len(decoded) - 1) == sorted(arr)
+
+
+@pytest.mark.parametrize("verbosity", ["summary", "none"])
+def test_sort_trace_verbosity(verbosity):
+    arr = [9, 4, 7, 1]
+    steps = delta_sort_steps(arr, SORTING_EVENTS["quick"](arr))
+    trace = Trace.record(arr, SORTING_EVENTS["quick"](arr))
+    meta, decoded = decode_steps(encode_sort_trace(trace, {}, verbosity))
+    assert meta["verbosity"] == verbosity
+    assert not any("description" in s for s in decoded)
+    if verbosity == "summary":
+        assert [render((s["template"], *s["params"])) for s in decoded] == [s["description"] for s in steps]
+    else:
+        assert not any("template" in s for s in decoded)
+
+
+def test_sort_values_outside_int32_widen():
+    arr = [2 ** 40, -5, 3]
+    encoded = encode_sort_trace(Trace.record(arr, SORTING_EVENTS["insertion"](arr)), {})
+    meta, columns = decode_trace(encoded)
+    assert columns["initial"].typecode == "d"
+    steps = decode_steps(encoded)[1]
+    assert sort_array_at(arr, steps, len(steps) - 1) == sorted(arr)
+
+
+@pytest.mark.parametrize("trace_format", ["full", "delta"])
+@pytest.mark.parametrize("algo", list(GRAPH_REGISTRY))
+def test_graph_trace_round_trip(algo, trace_format):
+    steps = GRAPH_REGISTRY[algo](GRAPH, "A", False, target="D").steps(trace_format)
+    meta, decoded = decode_steps(encode_graph_trace({"steps": steps, "algorithm": algo}))
+    assert meta["algorithm"] == algo
+    assert decoded == steps
+
+
+def test_binary_sort_is_smaller_than_json():
+    arr = list(range(200, 0, -1))
+    res = client.post("/api/sort", json={"array": arr, "algorithm": "bubble", "trace_format": "delta"})
+    binary = client.post("/api/sort", json={"array": arr, "algorithm": "bubble"}, headers={"Accept": TRACE_MEDIA_TYPE})
+    assert binary.headers["content-type"] == TRACE_MEDIA_TYPE
+    assert len(binary.content) < 0.6 * len(res.content)
+    meta, decoded = decode_steps(binary.content)
+    assert meta["trace_format"] == "delta" and meta["total_swaps"] == res.json()["total_swaps"]
+    assert sort_array_at(arr, decoded, len(decoded) - 1) == sorted(arr)
+
+
+def test_graph_negotiation():
+    payload = {"graph": GRAPH, "algorithm": "dijkstra", "start": "A", "target": "D"}
+    res = client.post("/api/graph-solve", json=payload, headers={"Accept": TRACE_MEDIA_TYPE})
+    assert res.headers["content-type"] == TRACE_MEDIA_TYPE
+    assert decode_steps(res.content)[1] == client.post("/api/graph-solve", json=payload).json()["steps"]
+    assert json.loads(client.post("/api/graph-solve", json=payload).content)["algorithm"] == "dijkstra"
@@ -0,0 +1,57 @@
+"""Unit tests for empirical complexity sweeps."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.services.complexity import DISTRIBUTIONS, fit_power_law, geometric_sizes, sweep_entry
+
+client = TestClient(app)
+
+
+def test_geometric_sizes():
+    assert geometric_sizes(64, 1024, 5) == [64, 128, 256, 512, 1024]
+    assert geometric_sizes(2, 4, 10) == [2, 3, 4]
+
+
+@pytest.mark.parametrize("distribution", list(DISTRIBUTIONS))
+def test_distributions_are_seeded(distribution):
+    a = DISTRIBUTIONS[distribution](50, random.Random(1))
+    assert a == DISTRIBUTIONS[distribution](50, random.Random(1)) and len(a) == 50
+    if distribution in ("sorted", "reversed"):
+        assert a == sorted(a, reverse=distribution == "reversed")
+
+
+def test_fit_power_law():
+    sizes = [64, 128, 256, 512]
+    fit = fit_power_law(sizes, [3 * n * n for n in sizes])
+    assert fit["exponent"] == 2 and fit["constant"] == 3 and fit["r_squared"] == 1
+    assert fit["best_fit"] == "O(n²)"
+    assert fit_power_law(sizes, [n * (n.bit_length() - 1) for n in sizes])["best_fit"] == "O(n log n)"
+    assert fit_power_law(sizes, [0, 0, 0, 5]) is None
+
+
+def test_sweep_entry_measures_counts():
+    result = sweep_entry("bubble", [16, 32, 64], ["reversed", "sorted"], 1, 0, 30)
+    reversed_run = result["distributions"]["reversed"]
+    assert reversed_run["comparisons"] == [n * (n - 1) // 2 for n in (16, 32, 64)]
+    assert reversed_run["fits"]["comparisons"]["best_fit"] == "O(n²)"
+    assert result["distributions"]["sorted"]["fits"]["comparisons"]["best_fit"] == "O(n)"
+    assert result["distributions"]["sorted"]["fits"]["swaps"] is None
+    assert result["claimed"]["worst"] == "O(n²)" and "timed_out" not in result
+
+
+def test_complexity_sweep_api():
+    payload = {"algorithms": ["insertion", "merge"], "distributions": ["random"], "min_size": 8, "max_size": 64,
+               "points": 3, "repeat": 1}
+    res = client.post("/api/complexity-sweep", json=payload)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["sizes"] == [8, 23, 64]
+    assert [r["algorithm"] for r in body["results"]] == ["insertion", "merge"]
+    assert body["results"][1]["distributions"]["random"]["fits"]["comparisons"]["best_fit"] == "O(n log n)"
+
+    assert client.post("/api/complexity-sweep", json={**payload, "distributions": ["zigzag"]}).status_code == 400
+    assert client.post("/api/complexity-sweep", json={**payload, "min_size": 64}).status_code == 400
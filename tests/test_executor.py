@@ -0,0 +1,94 @@
+"""Unit tests for the bounded solve executor."""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.services import executor as executor_module
+from app.services.executor import PoolUnavailable, SolveExecutor, SolverSaturated, solve_executor
+from app.services.result_cache import result_cache
+from app.services.solvers import solve_graph, solve_sort
+
+client = TestClient(app)
+
+
+def test_solvers_match_registries():
+    solved = solve_sort("bubble", [3, 1, 2], "delta")
+    assert solved["trace"].array_at(len(solved["trace"]) - 1) == [1, 2, 3]
+    assert solved["summary"]["execution_time_us"] >= 0
+    steps = solve_graph("bfs", {"A": {"B": 1}, "B": {}}, "A", True)
+    assert steps
+
+
+@pytest.mark.parametrize("kind", ["thread", "inline"])
+def test_run_releases_slot(kind):
+    executor = SolveExecutor(kind=kind, workers=1, queue_size=0)
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+def test_run_trial_honors_inline_and_never_falls_back_to_threads(monkeypatch):
+    def no_pool():
+        raise OSError("cannot spawn")
+
+    monkeypatch.setattr(executor_module, "get_process_pool", no_pool)
+    inline = SolveExecutor(kind="inline", workers=1, queue_size=0)
+    caller = threading.current_thread()
+    assert asyncio.run(inline.run_trial(threading.current_thread, deadline_seconds=1, entries=1, grace=0)) is caller
+
+    executor = SolveExecutor(kind="thread", workers=1, queue_size=0)
+    with pytest.raises(PoolUnavailable):
+        asyncio.run(executor.run_trial(threading.current_thread, deadline_seconds=1, entries=1, grace=0))
+
+    # Refused up front, before the trial takes a slot or starts streaming
+    monkeypatch.setattr(executor_module.solve_executor, "kind", "thread")
+    res = client.post("/api/time-trial", json={"array": [3, 1, 2]})
+    assert res.status_code == 503 and "retry-after" in res.headers
+    assert client.post("/api/complexity-sweep?stream=1", json={}).status_code == 503
+    assert solve_executor.stats()["pending"] == 0
+
+
+def test_saturated_executor_rejects_with_retry_after():
+    executor = SolveExecutor(kind="thread", workers=1, queue_size=1)
+    gate = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(gate.wait))
+        second = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(SolverSaturated) as excinfo:
+            await executor.run(gate.wait)
+        gate.set()
+        await asyncio.gather(first, second)
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert error.headers["Retry-After"]
+    assert executor.stats()["pending"] == 0
+    executor.shutdown()
+
+
+def test_sort_endpoint_returns_429_when_saturated():
+    result_cache.clear()
+    for _ in range(solve_executor.capacity):
+        solve_executor.acquire()
+    try:
+        res = client.post("/api/sort", json={"array": [3, 1, 2], "algorithm": "bubble"})
+        assert res.status_code == 429
+        assert "retry-after" in res.headers
+    finally:
+        for _ in range(solve_executor.capacity):
+            solve_executor.release()
+    assert client.post("/api/sort", json={"array": [3, 1, 2], "algorithm": "bubble"}).status_code == 200
+
+
+def test_streamed_sort_releases_slot():
+    res = client.post("/api/sort?stream=1", json={"array": [3, 1, 2], "algorithm": "quick"})
+    assert res.status_code == 200
+    assert solve_executor.stats()["pending"] == 0
+    assert client.get("/api/health").json()["solver"]["pending"] == 0
@@ -1,7 +1,17 @@
 """Unit tests for graph algorithms."""
 
+import pickle
+
 import pytest
-from app.algorithms.graph import GraphAlgorithms, GRAPH_REGISTRY
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.graph import GraphAlgorithms, GRAPH_REGISTRY, TARGETED
+from app.algorithms.graph_csr import CSRGraph
+from app.algorithms.graph_trace import GraphState, GraphTrace
+from app.algorithms.trace import downsample_steps
+
+client = TestClient(app)
 
 
 SAMPLE_GRAPH = {
@@ -71,6 +81,20 @@ def test_prim_mst():
     assert done["total_weight"] > 0
 
 
+def test_dijkstra_and_prim_decrease_keys():
+    # A reaches B at 4 directly, then at 3 (Dijkstra) or by weight 1 (Prim) through D
+    dijkstra = GraphAlgorithms.dijkstra(SAMPLE_GRAPH, "A", False)
+    lowered = [s for s in dijkstra if s["type"] == "decrease_key"]
+    assert lowered[0]["neighbor"] == "B" and lowered[0]["distances"]["B"] == 3
+    prim = GraphAlgorithms.prim(SAMPLE_GRAPH, "A", False)
+    lowered = [s for s in prim if s["type"] == "decrease_key"]
+    assert [(s["current"], s["neighbor"], s["weight"]) for s in lowered][0] == ("D", "B", 1)
+    # Each node is queued once, so no visit repeats and Prim adds V - 1 edges
+    visits = [s["current"] for s in prim if s["type"] == "visit"]
+    assert sorted(visits) == sorted(SAMPLE_GRAPH)
+    assert len(prim[-1]["mst_edges"]) == len(SAMPLE_GRAPH) - 1
+
+
 def test_kruskal_mst():
     steps = GraphAlgorithms.kruskal(SAMPLE_GRAPH, "A", False)
     done = steps[-1]
@@ -86,5 +110,199 @@ def test_prim_kruskal_same_weight():
 
 
 def test_graph_registry_complete():
-    expected = {"bfs", "dfs", "dijkstra", "prim", "kruskal"}
+    expected = {"bfs", "dfs", "iddfs", "dijkstra", "astar", "bidirectional_dijkstra", "bidirectional_bfs", "prim",
+                "kruskal"}
     assert set(GRAPH_REGISTRY.keys()) == expected
+
+
+def test_downsampled_graph_trace():
+    steps = GraphAlgorithms.dijkstra(SAMPLE_GRAPH, "A", False)
+    small = downsample_steps(steps, 6)
+    assert len(small) == 6
+    assert small[-1]["distances"] == steps[-1]["distances"]
+    assert sum(s.get("coalesced", 1) for s in small) == len(steps)
+    assert all(s["type"] != "explore_edge" for s in small)
+    assert downsample_steps(steps, None) is steps
+
+
+def replay(steps, fields):
+    """State snapshots after each delta step, as a client rebuilds them."""
+    state = GraphState()
+    for step in steps:
+        state.apply(step)
+        yield state.snapshot(fields)
+
+
+@pytest.mark.parametrize("algo", list(GRAPH_REGISTRY))
+def test_delta_steps_replay_to_full_steps(algo):
+    trace = GRAPH_REGISTRY[algo](SAMPLE_GRAPH, "A", False, target="F")
+    full = trace.steps("full")
+    delta = trace.steps("delta")
+    assert [s["type"] for s in delta] == [s["type"] for s in full]
+    assert list(replay(delta, trace.fields)) == [{f: s[f] for f in trace.fields} for s in full]
+    # Keyframes only every trace.interval steps (iddfs rounds also reset visited)
+    keyframes = [i for i, s in enumerate(delta) if "visited" in s and s["type"] != "deepen"]
+    assert keyframes == [i for i in range(0, len(trace), trace.interval) if delta[i]["type"] != "deepen"]
+
+
+def test_graph_trace_is_columnar_and_compact():
+    graph = {f"N{i}": {f"N{(i * 7 + k) % 300}": k for k in range(1, 4)} for i in range(300)}
+    trace = GraphAlgorithms.dijkstra(graph, "N0", False)
+    assert pickle.loads(pickle.dumps(trace)).steps("delta") == trace.steps("delta")
+    # Only the start and done steps carry keys outside the columns
+    assert len(trace.extras) <= 2
+    column_bytes = sum(c.itemsize * len(c) for c in (trace.ops, trace.layout_ops, trace.id_offsets, trace.ids,
+                                                     trace.number_offsets, trace.numbers, trace.kinds))
+    # A few dozen bytes per step, plus the start step's distance for every node
+    assert column_bytes < 40 * len(trace) + 16 * len(graph)
+    step = {"type": "visit", "current": "A", "from_node": None, "weight": 2, "visited_add": ["A"],
+            "distances_set": {"A": 1.5, "B": "∞"}, "mst_add": [["B", "A"]], "description": "x", "depth": [1]}
+    recorded = GraphTrace(2, ("visited",))
+    recorded.append(step)
+    assert recorded.record(0) == step and list(recorded.record(0)) == list(step)
+    assert type(recorded.record(0)["weight"]) is int
+
+
+def test_downsampled_delta_trace_folds_changes():
+    trace = GraphAlgorithms.bfs(SAMPLE_GRAPH, "A", False)
+    small = trace.downsample(5)
+    assert len(small) == 5 and sum(s.get("coalesced", 1) for s in small) == len(trace)
+    assert list(replay(small.steps("delta"), trace.fields))[-1] == {"visited": trace[-1]["visited"], "queue": []}
+
+
+def test_delta_payload_grows_linearly():
+    sizes = {}
+    for n in (200, 800):
+        graph = {f"N{i}": {f"N{i + 1}": 1} for i in range(n - 1)}
+        graph[f"N{n - 1}"] = {}
+        payload = {"graph": graph, "algorithm": "dijkstra", "start": "N0"}
+        delta = client.post("/api/graph-solve", json={**payload, "trace_format": "delta"})
+        assert delta.json()["keyframe_interval"] == max(n, 200)
+        done = list(replay(delta.json()["steps"], ("distances",)))[-1]["distances"]
+        assert done[f"N{n - 1}"] == n - 1
+        sizes[n] = len(delta.content)
+    assert sizes[800] < 6 * sizes[200]
+    # Snapshotting every step, the same trace is too large to admit
+    assert client.post("/api/graph-solve", json=payload).status_code == 413
+
+
+def test_graph_session_windows_stand_alone():
+    data = client.post("/api/graph-solve", json={"graph": SAMPLE_GRAPH, "algorithm": "prim", "start": "A",
+                                                 "session": True}).json()
+    page = client.get(f"/api/traces/{data['trace_id']}/steps", params={"offset": 5, "limit": 4}).json()
+    first = page["steps"][0]
+    seek = client.get(f"/api/traces/{data['trace_id']}/seek", params={"frame": 5}).json()["step"]
+    assert first["mst_edges"] == seek["mst_edges"] and "mst_add" not in first
+    assert "mst_edges" not in page["steps"][1]
+    assert client.post("/api/graph-solve", json={"graph": SAMPLE_GRAPH, "start": "A",
+                                                 "trace_format": "sparse"}).status_code == 400
+
+
+def test_csr_ingestion():
+    csr = CSRGraph({"b": {"c": 2, "a": "1.5"}, "a": {"b": 1}})
+    assert csr.labels == ["a", "b", "c"] and list(csr.order) == [1, 0, 2]
+    b = csr.ids["b"]
+    assert list(csr.neighbors(b)) == [(2, 2.0), (0, 1.5)]
+    assert list(csr.sorted_neighbors(b)) == [0, 2]
+    assert list(csr.sorted_neighbors(csr.ids["c"])) == [] and list(csr.offsets) == [0, 1, 3, 3]
+    assert CSRGraph.of(csr) is csr
+
+
+@pytest.mark.parametrize("algo", list(GRAPH_REGISTRY))
+def test_nodes_only_named_as_neighbours(algo):
+    graph = {"A": {"B": 1, "C": 3}, "B": {"C": 1}}
+    done = GRAPH_REGISTRY[algo](graph, "A", True, target="C")[-1]
+    if algo in TARGETED:
+        # Point-to-point searches stop once start and target connect
+        assert done["path"][-1] == "C" and set(done["visited"]) <= {"A", "B", "C"}
+    else:
+        assert set(done["visited"]) == {"A", "B", "C"}
+
+
+def test_dfs_survives_deep_graphs():
+    n = 5000
+    graph = {f"N{i:04d}": {f"N{i + 1:04d}": 1} for i in range(n - 1)}
+    trace = GraphAlgorithms.dfs(graph, "N0000", True)
+    done = trace[-1]
+    assert len(done["visited"]) == n and len(trace) == 3 * n
+    # Pre/post-order timestamps nest like parentheses
+    assert done["pre_order"]["N0000"] == 0 and done["post_order"]["N0000"] == 2 * n - 1
+    assert done["pre_order"]["N4999"] == n - 1 and done["post_order"]["N4999"] == n
+
+
+def test_dfs_depth_limit():
+    steps = GraphAlgorithms.dfs(SAMPLE_GRAPH, "A", False, depth_limit=1)
+    done = steps[-1]
+    assert set(done["visited"]) == {"A", "B", "D"}
+    assert [s["current"] for s in steps if s["type"] == "cutoff"] == ["B", "D"]
+    assert "depth limit 1" in done["description"]
+
+
+def test_iddfs_finds_shallowest_target():
+    # Depth-first order reaches E through B and D first; the shorter path through C must still win
+    graph = {"A": {"B": 1, "C": 1}, "B": {"D": 1}, "C": {"E": 1}, "D": {"E": 1}, "E": {"F": 1}}
+    done = GraphAlgorithms.iddfs(graph, "A", True, target="F")[-1]
+    assert done["path"] == ["A", "C", "E", "F"] and done["depth_limit"] == 3
+    assert "Stopped at depth limit 1" in GraphAlgorithms.iddfs(graph, "A", True, target="F", depth_limit=1)[-1]["description"]
+    assert "unreachable" in GraphAlgorithms.iddfs(graph, "A", True, target="Z")[-1]["description"]
+
+
+def test_depth_limit_validation():
+    payload = {"graph": SAMPLE_GRAPH, "algorithm": "bfs", "start": "A", "depth_limit": 2}
+    assert client.post("/api/graph-solve", json=payload).status_code == 400
+    res = client.post("/api/graph-solve", json={**payload, "algorithm": "iddfs", "target": "F"})
+    assert res.status_code == 200 and res.json()["steps"][-1]["depth_limit"] == 2
+
+
+def grid(size):
+    """size × size grid, unit spacing and weights, labelled by row and column."""
+    label = "R{:02d}C{:02d}".format
+    graph = {label(r, c): {} for r in range(size) for c in range(size)}
+    positions = {label(r, c): (c * 50.0, r * 50.0) for r in range(size) for c in range(size)}
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                if 0 <= r + dr < size and 0 <= c + dc < size:
+                    graph[label(r, c)][label(r + dr, c + dc)] = 2
+    return graph, positions
+
+
+def test_targeted_searches_settle_fewer_nodes():
+    graph, positions = grid(12)
+    start, target = "R00C00", "R05C07"
+    dijkstra = GraphAlgorithms.dijkstra(graph, start, False, target=target)[-1]
+    astar = GraphAlgorithms.astar(graph, start, False, target=target, positions=positions)[-1]
+    manhattan = GraphAlgorithms.astar(graph, start, False, target=target, heuristic="manhattan",
+                                      positions=positions)[-1]
+    bidirectional = GraphAlgorithms.bidirectional_dijkstra(graph, start, False, target=target)[-1]
+    for done in (astar, manhattan, bidirectional):
+        assert done["final_distance"] == dijkstra["final_distance"] == 24
+        assert len(done["path"]) == 13 and done["settled"] < dijkstra["settled"]
+    # Either heuristic keeps A* inside the 6 × 8 box of nodes on some shortest path
+    assert astar["settled"] <= 48 and manhattan["settled"] <= 48
+    zero = GraphAlgorithms.astar(graph, start, False, target=target, heuristic="zero", positions=positions)[-1]
+    assert zero["settled"] == dijkstra["settled"]
+
+
+def test_bidirectional_searches_follow_edge_direction():
+    graph = {"A": {"B": 1, "C": 5}, "B": {"D": 1}, "C": {"D": 1}, "D": {"A": 1}, "E": {"D": 1}}
+    done = GraphAlgorithms.bidirectional_dijkstra(graph, "A", True, target="D")[-1]
+    assert done["path"] == ["A", "B", "D"] and done["final_distance"] == 2
+    assert GraphAlgorithms.bidirectional_bfs(graph, "A", True, target="D")[-1]["path"][-1] == "D"
+    trace = GraphAlgorithms.bidirectional_bfs(graph, "D", True, target="E")
+    assert "unreachable" in trace[-1]["description"]
+    assert {s["direction"] for s in trace if "direction" in s} == {"forward", "backward"}
+    assert GraphAlgorithms.bidirectional_bfs(graph, "A", True, target="A")[-1]["path"] == ["A"]
+
+
+def test_targeted_search_validation():
+    graph, positions = grid(3)
+    payload = {"graph": graph, "algorithm": "astar", "start": "R00C00", "target": "R02C02"}
+    assert client.post("/api/graph-solve", json={**payload, "target": None}).status_code == 400
+    assert client.post("/api/graph-solve", json={**payload, "target": "Z"}).status_code == 400
+    assert client.post("/api/graph-solve", json={**payload, "heuristic": "euclidean"}).status_code == 400
+    assert client.post("/api/graph-solve", json={**payload, "heuristic": "octile", "positions": positions}).status_code == 400
+    assert client.post("/api/graph-solve", json={**payload, "algorithm": "bidirectional_bfs",
+                                                 "positions": positions}).status_code == 400
+    res = client.post("/api/graph-solve", json={**payload, "positions": positions})
+    assert res.status_code == 200 and res.json()["steps"][-1]["final_distance"] == 8
@@ -0,0 +1,78 @@
+"""Tests for the graph engine's priority queues and their benchmark."""
+
+import random
+
+import pytest
+
+from app.algorithms.indexed_heap import QUEUES, IndexedHeap, LazyHeap, priority_queue
+from app.services.heap_benchmark import compare_arities, random_graph
+
+
+@pytest.mark.parametrize("queue,arity", [("indexed", 2), ("indexed", 3), ("indexed", 4), ("indexed", 8),
+                                         ("heapq", None)])
+def test_pops_in_key_then_id_order(queue, arity):
+    rng = random.Random(arity)
+    heap = priority_queue(queue, 200, arity)
+    keys = {}
+    for item in rng.sample(range(200), 150):
+        keys[item] = rng.randint(0, 50)
+        heap.push(item, keys[item])
+    for item in rng.sample(sorted(keys), 60):
+        keys[item] = max(keys[item] - rng.randint(0, 30), 0)
+        assert heap.push_or_decrease(item, keys[item]) == ("push" if queue == "heapq" else "decrease_key")
+    popped = [heap.pop() for _ in range(len(heap))]
+    # Ties on key break on the smaller id, as heapq does with (key, id) tuples
+    assert popped == sorted((key, item) for item, key in keys.items())
+    assert not heap and all(item not in heap for item in keys)
+
+
+@pytest.mark.parametrize("queue", list(QUEUES))
+def test_position_tracking_and_errors(queue):
+    heap = priority_queue(queue, 4, 4)
+    assert heap.push_or_decrease(2, 5) == "push"
+    heap.push(1, 7)
+    assert 2 in heap and 3 not in heap and heap.key(1) == 7
+    heap.decrease_key(1, 3)
+    assert heap.pop() == (3, 1)
+    with pytest.raises(ValueError):
+        heap.push(2, 1)
+    with pytest.raises(ValueError):
+        heap.decrease_key(2, 9)
+    with pytest.raises(KeyError):
+        heap.decrease_key(1, 0)
+    with pytest.raises(ValueError):
+        IndexedHeap(4, 1)
+    with pytest.raises(ValueError):
+        priority_queue("fibonacci", 4, 4)
+
+
+def test_lazy_heap_skips_stale_entries():
+    heap = LazyHeap(3)
+    heap.push(0, 9)
+    heap.push(1, 5)
+    # A duplicate entry, reported as the push it is
+    assert heap.push_or_decrease(0, 2) == "push"
+    heap.decrease_key(0, 2)
+    assert len(heap) == 2 and len(heap.heap) == 4
+    assert heap.peek() == (2, 0) and heap.pop() == (2, 0)
+    assert heap.pop() == (5, 1) and not heap
+    # Re-queued after its pop, 0 matches its old (9, 0) entry; one equal entry is left over
+    heap.push(0, 9)
+    assert heap.pop() == (9, 0) and not heap and heap.heap == [(9, 0)]
+
+
+def test_arity_benchmark_rows():
+    rows = compare_arities(nodes=60, degree=4, repeat=2, min_sample_seconds=0.001)
+    assert [(r["algorithm"], r["queue"]) for r in rows] == [
+        (algorithm, queue) for algorithm in ("dijkstra", "prim") for queue in ("heapq", "d=2", "d=4", "d=8")
+    ]
+    for row in rows:
+        assert row["median_us"] > 0 and row["ci95_us"][0] <= row["ci95_us"][1]
+    # Each row runs the shipped solver: one step per edge whatever the queue, but only the indexed heap
+    # lowers keys in place, where heapq pushes duplicates
+    for algorithm in ("dijkstra", "prim"):
+        runs = [r for r in rows if r["algorithm"] == algorithm]
+        assert len({r["steps"] for r in runs}) == 1
+        assert runs[0]["decrease_keys"] == 0
+        assert len({r["decrease_keys"] for r in runs[1:]}) == 1 and runs[1]["decrease_keys"] > 0
+    assert len(random_graph(60, 4).labels) == 60
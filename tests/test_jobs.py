@@ -0,0 +1,117 @@
+"""Unit tests for background jobs and cooperative cancellation."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.graph import GRAPH_REGISTRY
+from app.algorithms.progress import Cancelled, Progress, checkpointed
+from app.algorithms.sorting import SORTING_EVENTS
+from app.services.executor import SolverSaturated
+from app.services.jobs import JobManager
+
+client = TestClient(app)
+
+GRAPH = {"A": {"B": 1, "C": 4}, "B": {"C": 2, "D": 5}, "C": {"D": 1}, "D": {}}
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def spin(progress=None):
+    while True:
+        progress.checkpoint()
+        time.sleep(0.001)
+
+
+def test_checkpointed_events_stop_when_cancelled():
+    progress = Progress()
+    events = checkpointed(SORTING_EVENTS["bubble"](list(range(50, 0, -1))), progress)
+    next(events), next(events)
+    assert progress.steps == 2
+    progress.cancel()
+    with pytest.raises(Cancelled):
+        next(events)
+
+
+@pytest.mark.parametrize("algo", list(GRAPH_REGISTRY))
+def test_graph_steps_are_checkpoints(algo):
+    progress = Progress()
+    steps = GRAPH_REGISTRY[algo](GRAPH, "A", True, progress=progress)
+    assert progress.steps == len(steps)
+    progress.cancel()
+    with pytest.raises(Cancelled):
+        GRAPH_REGISTRY[algo](GRAPH, "A", True, progress=progress)
+
+
+def test_job_runs_and_reports_result():
+    manager = JobManager(workers=1, queue_size=0)
+    job = manager.submit("test", "sum", lambda values, progress=None: sum(values), [1, 2, 3], estimated_steps=3)
+    wait_for(lambda: job["status"] == "done")
+    view = manager.view(job)
+    assert view["result"] == 6 and view["elapsed_seconds"] >= 0
+    manager.shutdown()
+
+
+def test_running_job_cancels_at_checkpoint():
+    manager = JobManager(workers=1, queue_size=1)
+    running = manager.submit("test", "spin", spin, estimated_steps=10_000)
+    queued = manager.submit("test", "spin", spin)
+    wait_for(lambda: running["progress"].steps > 0)
+    view = manager.view(running)
+    assert view["status"] == "running" and view["estimated_remaining_steps"] < 10_000
+    with pytest.raises(SolverSaturated):
+        manager.submit("test", "spin", spin)
+
+    assert manager.cancel(queued["job_id"])["status"] == "cancelled"
+    assert manager.cancel(running["job_id"])["status"] == "cancelling"
+    wait_for(lambda: running["status"] == "cancelled")
+    manager.shutdown()
+
+
+def test_failed_job_reports_error():
+    manager = JobManager(workers=1, queue_size=0)
+
+    def fail(progress=None):
+        raise ValueError("boom")
+
+    job = manager.submit("test", "fail", fail)
+    wait_for(lambda: job["status"] == "failed")
+    assert manager.view(job)["error"] == "boom"
+    manager.shutdown()
+
+
+def test_sort_job_api():
+    res = client.post("/api/jobs", json={"array": [5, 2, 4, 1], "algorithm": "insertion"})
+    assert res.status_code == 202
+    assert res.headers["Location"] == f"/api/jobs/{res.json()['job_id']}"
+    assert res.json()["estimated_steps"] == int(res.headers["X-Estimated-Steps"])
+    wait_for(lambda: client.get(res.headers["Location"]).json()["status"] == "done")
+    result = client.get(res.headers["Location"]).json()["result"]
+    trace = client.get(f"/api/traces/{result['trace_id']}/steps").json()
+    assert trace["total_steps"] == result["total_steps"]
+    assert client.post("/api/jobs", json={"array": [1], "mode": "metrics"}).status_code == 400
+
+
+def test_graph_job_api():
+    res = client.post("/api/jobs", json={"graph": GRAPH, "algorithm": "dijkstra", "start": "A", "target": "D"})
+    assert res.status_code == 202
+    job_url = res.headers["Location"]
+    wait_for(lambda: client.get(job_url).json()["status"] == "done")
+    result = client.get(job_url).json()["result"]
+    assert client.get(f"/api/traces/{result['trace_id']}").json()["kind"] == "graph"
+
+
+def test_cancel_job_api():
+    payload = {"array": list(range(3000, 0, -1)), "algorithm": "insertion", "trace_format": "delta"}
+    job_url = client.post("/api/jobs", json=payload).headers["Location"]
+    wait_for(lambda: client.get(job_url).json()["steps"] > 0)
+    assert client.delete(job_url).json()["status"] in ("cancelling", "cancelled")
+    wait_for(lambda: client.get(job_url).json()["status"] == "cancelled")
+    assert client.get("/api/jobs/missing").status_code == 404
@@ -0,0 +1,204 @@
+"""Unit tests for server-paced playback over /ws/play and /ws/race."""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app import app
+from app.algorithms.sorting import sort_events
+from app.algorithms.trace import Trace
+from app.routes import play
+from app.services.executor import solve_executor
+from app.services.playback import Playback, RacePlayback, SortPlayback
+
+client = TestClient(app)
+
+GRAPH = {"A": {"B": 1, "C": 4}, "B": {"C": 2, "D": 5}, "C": {"D": 1}, "D": {}}
+ARRAY = list(range(40, 0, -1))
+
+
+def test_sort_playback_computes_only_watched_frames():
+    playback = SortPlayback("bubble", ARRAY)
+    full = Trace.record(ARRAY, sort_events("bubble", ARRAY))
+    frames = [playback.next_frame() for _ in range(5)]
+    assert frames == full.steps("delta", 0, 5)
+    assert len(playback.trace) == 5 and playback.total_steps is None
+
+    step = playback.seek(300)
+    assert step["array"] == full.array_at(300) and len(playback.trace) == 301
+    assert playback.next_frame() == full.steps("delta", 301, 302)[0]
+    assert playback.seek(0)["array"] == full.array_at(0)
+
+
+def test_sort_playback_runs_to_the_end():
+    playback = SortPlayback("insertion", [3, 1, 2], "full")
+    steps = iter(playback.next_frame, None)
+    assert list(steps) == Trace.record([3, 1, 2], sort_events("insertion", [3, 1, 2])).steps("full")
+    assert playback.total_steps == len(playback.trace)
+    assert playback.seek(10 ** 6)["type"] == "done"
+
+
+def test_ws_play_sort():
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"array": [3, 1, 2], "algorithm": "insertion", "trace_format": "delta", "speed": 1000})
+        start = ws.receive_json()
+        assert start["type"] == "start" and start["initial"] == [3, 1, 2]
+        messages = []
+        while not messages or messages[-1]["type"] != "end":
+            messages.append(ws.receive_json())
+        frames = [m for m in messages if m["type"] == "frame"]
+        assert [m["frame"] for m in frames] == list(range(len(frames)))
+        assert frames[-1]["step"]["array"] == [1, 2, 3]
+        assert messages[-1]["frames"] == len(frames)
+
+
+def test_ws_play_controls():
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"array": ARRAY, "algorithm": "bubble", "paused": True})
+        assert ws.receive_json()["paused"] is True
+
+        ws.send_json({"action": "seek", "value": 100})
+        seek = ws.receive_json()
+        assert seek["seek"] and seek["frame"] == 100
+        assert seek["step"]["array"] == Trace.record(ARRAY, sort_events("bubble", ARRAY)).array_at(100)
+        assert ws.receive_json() == {"type": "state", "paused": True, "speed": 10.0, "frame": 100}
+
+        ws.send_json({"action": "speed", "value": 10 ** 6})
+        assert ws.receive_json()["speed"] == 1000
+        ws.send_json({"action": "resume"})
+        assert ws.receive_json()["paused"] is False
+        assert ws.receive_json()["frame"] == 101
+        ws.send_json({"action": "rewind"})
+        message = ws.receive_json()
+        while message["type"] == "frame":
+            message = ws.receive_json()
+        assert message["type"] == "error" and message["status"] == 400
+
+
+def test_ws_play_graph():
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"graph": GRAPH, "algorithm": "dijkstra", "start": "A", "target": "D", "speed": 1000})
+        start = ws.receive_json()
+        assert start["kind"] == "graph"
+        message = ws.receive_json()
+        while message["type"] == "frame":
+            message = ws.receive_json()
+        assert message["type"] == "end" and message["frames"] > 0
+
+
+def test_ws_play_rejects_bad_payload():
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"array": [1, 2], "algorithm": "nope"})
+        assert ws.receive_json() == {"type": "error", "status": 400, "detail": "Unknown algorithm: nope"}
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"array": []})
+        assert ws.receive_json()["status"] == 422
+
+
+def test_ws_play_is_admitted_and_holds_a_solve_slot(monkeypatch):
+    monkeypatch.setattr(play, "ADMISSION_MAX_RECORDED_STEPS", 10)
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"array": ARRAY, "algorithm": "bubble"})
+        error = ws.receive_json()
+        assert error["status"] == 413 and "too long to play" in error["detail"]
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1008
+    monkeypatch.undo()
+
+    for _ in range(solve_executor.capacity):
+        solve_executor.acquire()
+    try:
+        with client.websocket_connect("/ws/play") as ws:
+            ws.send_json({"array": [3, 1, 2], "algorithm": "bubble"})
+            assert ws.receive_json()["status"] == 429
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_json()
+            assert closed.value.code == 1008
+    finally:
+        for _ in range(solve_executor.capacity):
+            solve_executor.release()
+
+    with client.websocket_connect("/ws/play") as ws:
+        ws.send_json({"array": [3, 1, 2], "algorithm": "bubble", "paused": True})
+        assert ws.receive_json()["type"] == "start"
+        assert solve_executor.stats()["pending"] == 1
+    assert solve_executor.stats()["pending"] == 0
+
+
+def test_playback_is_abstract():
+    with pytest.raises(TypeError):
+        Playback()
+
+
+def test_race_playback_keeps_lanes_in_step():
+    playback = RacePlayback(["bubble", "merge"], ARRAY, lookahead=8)
+    first = playback.next_frame()
+    assert set(first) == {"bubble", "merge"}
+    assert all(len(lane.trace) <= 9 for lane in playback.lanes.values())
+
+    runs = {a: Trace.record(ARRAY, sort_events(a, ARRAY)) for a in ("bubble", "merge")}
+    frames = [first] + list(iter(playback.next_frame, None))
+    assert len(frames) == max(len(t) for t in runs.values()) == playback.total_steps
+    assert [f["merge"] for f in frames if "merge" in f] == runs["merge"].steps("delta")
+    assert playback.footer()["steps"] == {a: len(t) for a, t in runs.items()}
+
+    seek = playback.seek(len(runs["merge"]) + 10)
+    assert seek["merge"]["type"] == "done" and seek["bubble"]["array"] == runs["bubble"].array_at(playback.position)
+
+
+def test_ws_race():
+    with client.websocket_connect("/ws/race") as ws:
+        ws.send_json({"array": [4, 3, 2, 1], "algorithms": ["bubble", "quick", "bubble"], "speed": 1000})
+        start = ws.receive_json()
+        assert start["kind"] == "race" and start["algorithms"] == ["bubble", "quick"]
+        assert set(start["estimated_steps"]) == {"bubble", "quick"}
+        messages = [ws.receive_json()]
+        while messages[-1]["type"] != "end":
+            messages.append(ws.receive_json())
+        finals = {}
+        for message in messages[:-1]:
+            finals.update(message["steps"])
+        assert all(step["array"] == [1, 2, 3, 4] for step in finals.values())
+        assert messages[-1]["frames"] == max(messages[-1]["steps"].values()) == len(messages) - 1
+
+    with client.websocket_connect("/ws/race") as ws:
+        ws.send_json({"array": [2, 1], "algorithms": ["bubble", "nope"]})
+        assert ws.receive_json()["detail"] == "Unknown algorithm: nope"
+
+
+def test_ws_race_is_admitted_per_lane(monkeypatch):
+    def first_reply(payload):
+        with client.websocket_connect("/ws/race") as ws:
+            ws.send_json(payload)
+            reply = ws.receive_json()
+            if reply["type"] == "error":
+                with pytest.raises(WebSocketDisconnect) as closed:
+                    ws.receive_json()
+                assert closed.value.code == 1008
+            return reply
+
+    race = {"array": ARRAY, "algorithms": ["merge", "bubble"]}
+    assert first_reply({**race, "max_frames": 10})["status"] == 422
+    assert first_reply({**race, "session": True})["status"] == 422
+    assert first_reply({**race, "algorithms": ["bubble", "quick", "merge", "heap", "insertion"]})["status"] == 422
+
+    # bubble fits only coarse (80 steps against 1601 fine), so the whole race plays coarse
+    monkeypatch.setattr(play, "ADMISSION_MAX_RECORDED_STEPS", 400)
+    start = first_reply({**race, "paused": True})
+    assert start["granularity"] == "coarse" and start["estimated_steps"] == {"merge": 280, "bubble": 80}
+    monkeypatch.setattr(play, "ADMISSION_MAX_RECORDED_STEPS", 50)
+    error = first_reply(race)
+    assert error["status"] == 413 and "merge" in error["detail"]
+    monkeypatch.undo()
+
+    # One slot short of one per lane
+    for _ in range(solve_executor.capacity - 1):
+        solve_executor.acquire()
+    try:
+        assert first_reply(race)["status"] == 429
+        assert first_reply({**race, "paused": True, "algorithms": ["merge"]})["status"] == 422
+    finally:
+        for _ in range(solve_executor.capacity - 1):
+            solve_executor.release()
+    assert first_reply({**race, "paused": True})["type"] == "start"
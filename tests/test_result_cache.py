@@ -0,0 +1,102 @@
+"""Unit tests for the content-addressed result cache."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app import app
+from app.services.result_cache import ResultCache, canonical_key, result_cache
+
+client = TestClient(app)
+
+GRAPH = {"A": {"B": 1, "C": 4}, "B": {"C": 2}, "C": {}}
+
+
+def test_canonical_key_ignores_field_order():
+    assert canonical_key("sort", algorithm="quick", array=[1, 2]) == canonical_key("sort", array=[1, 2], algorithm="quick")
+    assert canonical_key("sort", algorithm="quick", array=[1, 2]) != canonical_key("sort", algorithm="quick", array=[2, 1])
+
+
+def test_cache_evicts_by_bytes():
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
+    assert cache.stats()["bytes"] == 10
+
+
+def test_sort_cache_hit_and_etag():
+    result_cache.clear()
+    payload = {"array": [5, 2, 9, 1], "algorithm": "merge", "trace_format": "delta"}
+    first = client.post("/api/sort", json=payload)
+    second = client.post("/api/sort", json=payload)
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert first.content == second.content
+    assert second.json()["steps"][-1]["array"] == [1, 2, 5, 9]
+
+    etag = second.headers["etag"]
+    revalidated = client.post("/api/sort", json=payload, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+    other = client.post("/api/sort", json={**payload, "trace_format": "full"})
+    assert other.headers["x-cache"] == "MISS"
+
+
+def test_graph_cache_keeps_neighbour_order():
+    result_cache.clear()
+    payload = {"graph": GRAPH, "algorithm": "bfs", "start": "A"}
+    assert client.post("/api/graph-solve", json=payload).headers["x-cache"] == "MISS"
+    assert client.post("/api/graph-solve", json=payload).headers["x-cache"] == "HIT"
+    reordered = {"A": {"C": 4, "B": 1}, "B": {"C": 2}, "C": {}}
+    assert client.post("/api/graph-solve", json={**payload, "graph": reordered}).headers["x-cache"] == "MISS"
+    stats = client.get("/api/health").json()["cache"]
+    assert stats["hits"] >= 1 and stats["misses"] >= 2
+
+
+def test_sessions_bypass_cache():
+    result_cache.clear()
+    payload = {"array": [3, 1, 2], "algorithm": "bubble", "session": True}
+    first = client.post("/api/sort", json=payload).json()
+    second = client.post("/api/sort", json=payload).json()
+    assert first["trace_id"] != second["trace_id"]
+    assert len(result_cache) == 0
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = ResultCache(max_bytes=1000)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"[1,2,3]"
+
+    async def burst():
+        return await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(10)])
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert sorted(status for _, status in results) == ["MISS"] + ["SHARED"] * 9
+    assert all(entry["body"] == b"[1,2,3]" for entry, _ in results)
+    assert cache.stats()["coalesced"] == 9 and cache.stats()["inflight"] == 0
+    assert asyncio.run(cache.get_or_compute("k", compute))[1] == "HIT"
+
+
+def test_failed_computation_is_not_cached():
+    cache = ResultCache(max_bytes=1000)
+
+    async def compute():
+        raise RuntimeError("boom")
+
+    async def burst():
+        return await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(burst()))
+    assert len(cache) == 0 and cache.stats()["inflight"] == 0
@@ -1,7 +1,22 @@
 """Unit tests for sorting algorithms."""
 
+import json
+import pickle
+from itertools import islice
+
 import pytest
-from app.algorithms.sorting import SortingAlgorithms, SORTING_REGISTRY
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.descriptions import DESCRIPTION_TEMPLATES, render
+from app.algorithms.sorting import SortingAlgorithms, SORTING_REGISTRY, SORTING_EVENTS, sort_events
+from app.algorithms.sorting_metrics import SORTING_METRICS
+from app.algorithms.trace import (
+    SORT_DROP_ORDER, Trace, delta_sort_steps, expand_sort_steps, iter_sort_steps, iter_ndjson, plan_frames,
+    sort_array_at,
+)
+
+client = TestClient(app)
 
 
 # ---- Parametrize across all algorithms ----
@@ -63,3 +78,173 @@ def test_steps_have_required_keys():
     for step in steps:
         assert "type" in step
         assert "array" in step or step["type"] in ("done",)
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_delta_trace_replays_to_full_snapshots(algo):
+    arr = [5, 3, 8, 1, 2, 8, 0, 7]
+    full = SORTING_REGISTRY[algo](arr)
+    delta = delta_sort_steps(arr, SORTING_EVENTS[algo](arr), interval=4)
+    assert len(delta) == len(full)
+
+    display = list(arr)
+    for step, expected in zip(delta, full):
+        if "array" in step:
+            display = list(step["array"])
+        else:
+            for idx, value in step["writes"]:
+                display[idx] = value
+        assert display == expected["array"]
+        assert step["type"] == expected["type"]
+
+
+def test_delta_trace_keyframes():
+    arr = list(range(20, 0, -1))
+    delta = delta_sort_steps(arr, SortingAlgorithms.bubble_events(arr), interval=10)
+    keyframes = [i for i, s in enumerate(delta[:-1]) if "array" in s]
+    assert keyframes == list(range(0, len(delta) - 1, 10))
+
+
+def test_quick_sort_presorted_large():
+    # Deeper than the default recursion limit
+    arr = list(range(1200))
+    *_, done = SORTING_EVENTS["quick"](arr)
+    assert done[0] == "done"
+
+
+def test_step_stream_is_lazy():
+    arr = list(range(5000, 0, -1))
+    steps = iter_sort_steps(arr, SORTING_EVENTS["bubble"](arr))
+    first = list(islice(steps, 3))
+    assert [s["type"] for s in first] == ["compare", "swapping", "compare"]
+
+
+def test_ndjson_stream():
+    arr = [3, 1, 2]
+    chunks = iter_ndjson({"algorithm": "insertion"}, iter_sort_steps(arr, SORTING_EVENTS["insertion"](arr)), batch_size=2)
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert lines[0] == {"algorithm": "insertion"}
+    assert lines[-1]["type"] == "done"
+    assert lines[-1]["array"] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_trace_renders_same_steps(algo):
+    arr = [5, 3, 8, 1, 2, 8, 0, 7, 4, 4, 9]
+    trace = Trace.record(arr, SORTING_EVENTS[algo](arr))
+    assert trace.steps("full") == SORTING_REGISTRY[algo](arr)
+    assert trace.steps("delta") == delta_sort_steps(arr, SORTING_EVENTS[algo](arr))
+    assert trace.total_comparisons == trace.steps()[-1]["total_comparisons"]
+
+
+def test_trace_seek_and_slices():
+    arr = list(range(150, 0, -1))
+    trace = Trace.record(arr, SORTING_EVENTS["bubble"](arr))
+    full = trace.steps("full")
+    for frame in (0, 1, 149, 150, 151, 5000, len(trace) - 1):
+        assert trace.array_at(frame) == full[frame]["array"]
+    assert trace.array_at(-1) == arr
+    assert trace[300:305] == trace.steps("delta")[300:305]
+    assert trace[-1]["type"] == "done"
+
+
+def test_trace_is_picklable_and_compact():
+    arr = list(range(100, 0, -1))
+    trace = Trace.record(arr, SORTING_EVENTS["insertion"](arr))
+    assert pickle.loads(pickle.dumps(trace)).steps() == trace.steps()
+    # Columns cost a few bytes per step on top of the description strings
+    column_bytes = sum(c.itemsize * len(c) for c in (trace.ops, trace.indices, trace.write_index, trace.write_value))
+    assert column_bytes < 40 * len(trace)
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_downsampled_trace_keeps_kept_frames_exact(algo):
+    arr = list(range(60, 0, -1))
+    trace = Trace.record(arr, SORTING_EVENTS[algo](arr))
+    small = trace.downsample(50)
+    assert len(small) <= 50
+    assert sum(small.spans) == len(trace)
+    assert small.steps("full")[-1]["array"] == sorted(arr)
+    keep = plan_frames(trace.step_types, 50, SORT_DROP_ORDER)
+    full = trace.steps("full")
+    assert [s["array"] for s in small.steps("full")] == [full[i]["array"] for i in keep]
+
+
+def test_plan_frames_drops_compares_before_swaps():
+    types = ["compare"] * 90 + ["swapping"] * 8 + ["pivot"] * 2 + ["done"]
+    keep = plan_frames(types, 20, SORT_DROP_ORDER)
+    kept = [types[i] for i in keep]
+    assert len(keep) == 20
+    assert kept.count("pivot") == 2 and kept.count("swapping") == 8 and kept[-1] == "done"
+    assert plan_frames(types, 5, SORT_DROP_ORDER)[-3:] == [98, 99, 100]
+
+
+def test_sort_api_max_frames():
+    arr = list(range(80, 0, -1))
+    res = client.post("/api/sort", json={"array": arr, "algorithm": "bubble", "trace_format": "delta", "max_frames": 100})
+    data = res.json()
+    assert len(data["steps"]) <= 100
+    assert data["source_steps"] > 100
+    assert data["total_comparisons"] == 80 * 79 // 2
+    assert sort_array_at(arr, data["steps"], len(data["steps"]) - 1) == sorted(arr)
+
+    streamed = client.post("/api/sort?stream=1", json={"array": arr, "algorithm": "bubble", "trace_format": "delta", "max_frames": 100})
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert lines[1:] == data["steps"]
+
+
+@pytest.mark.parametrize("algo", ["bubble", "selection"])
+def test_coarse_trace_is_linear_and_counts_match(algo):
+    arr = list(range(300, 0, -1))
+    steps = expand_sort_steps(arr, sort_events(algo, arr, "coarse"))
+    assert steps[-1]["array"] == sorted(arr)
+    assert len(steps) <= 3 * len(arr) + 1
+    metrics = SORTING_METRICS[algo](arr)
+    assert steps[-1]["total_comparisons"] == metrics["comparisons"]
+    assert steps[-1]["total_swaps"] == metrics["swaps"]
+    ranges = [s for s in steps if "range" in s]
+    assert all(s["comparisons"] == s["range"][1] - s["range"][0] for s in ranges)
+
+
+def test_coarse_selection_scan_winner():
+    steps = expand_sort_steps([4, 9, 1, 7], sort_events("selection", [4, 9, 1, 7], "coarse"))
+    scan = steps[0]
+    assert scan["type"] == "scan"
+    assert scan["range"] == [0, 3] and scan["winner"] == 2 and scan["indices"] == [2]
+
+
+def test_coarse_granularity_api():
+    arr = list(range(40, 0, -1))
+    res = client.post("/api/sort", json={"array": arr, "algorithm": "bubble", "trace_format": "delta", "granularity": "coarse"})
+    data = res.json()
+    assert data["granularity"] == "coarse"
+    assert {s["type"] for s in data["steps"]} == {"pass", "sorted", "done"}
+    assert sort_array_at(arr, data["steps"], len(data["steps"]) - 1) == sorted(arr)
+    # Algorithms without coarse events fall back to the fine trace
+    merge = client.post("/api/sort", json={"array": arr, "algorithm": "merge", "granularity": "coarse"}).json()
+    assert merge["steps"] == SORTING_REGISTRY["merge"](arr)
+    assert client.post("/api/sort", json={"array": arr, "granularity": "medium"}).status_code == 400
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_summary_descriptions_render_to_full(algo):
+    arr = [5, 3, 8, 1, 2, 8]
+    full = list(iter_sort_steps(arr, sort_events(algo, arr), "delta"))
+    summary = list(iter_sort_steps(arr, sort_events(algo, arr), "delta", verbosity="summary"))
+    assert [render((s["template"], *s["params"])) for s in summary] == [s["description"] for s in full]
+    assert Trace.record(arr, sort_events(algo, arr)).steps(verbosity="summary") == summary
+    assert all(s["template"] in DESCRIPTION_TEMPLATES for s in summary)
+
+
+def test_sort_api_verbosity():
+    arr = [4, 2, 3, 1]
+    for verbosity in ("none", "summary"):
+        data = client.post("/api/sort", json={"array": arr, "verbosity": verbosity}).json()
+        assert data["verbosity"] == verbosity
+        assert not any("description" in s for s in data["steps"])
+        assert all(("template" in s) == (verbosity == "summary") for s in data["steps"])
+    assert client.post("/api/sort", json={"array": arr, "verbosity": "loud"}).status_code == 400
+
+    templates = client.get("/api/description-templates").json()
+    assert templates["templates"] == DESCRIPTION_TEMPLATES
+    assert templates["verbosities"] == ["none", "summary", "full"]
@@ -0,0 +1,47 @@
+"""Unit tests for the counting-only sorting implementations."""
+
+import random
+
+import pytest
+from app.algorithms.sorting import SORTING_REGISTRY
+from app.algorithms.sorting_metrics import SORTING_METRICS
+
+
+ALGORITHMS = list(SORTING_METRICS.keys())
+
+
+def test_metrics_registry_matches_sorting_registry():
+    assert set(SORTING_METRICS.keys()) == set(SORTING_REGISTRY.keys())
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_metrics_sort_correctly(algo):
+    rng = random.Random(7)
+    for n in (1, 2, 5, 31, 200):
+        arr = [rng.randint(-50, 50) for _ in range(n)]
+        original = arr.copy()
+        result = SORTING_METRICS[algo](arr)
+        assert result["array"] == sorted(arr)
+        assert arr == original
+
+
+@pytest.mark.parametrize("algo", ["bubble", "quick"])
+def test_metrics_match_trace_counts(algo):
+    # Both paths count one comparison per compare step for these algorithms
+    arr = [9, 2, 7, 4, 4, 1, 8, 3]
+    done = SORTING_REGISTRY[algo](arr)[-1]
+    metrics = SORTING_METRICS[algo](arr)
+    assert metrics["comparisons"] == done["total_comparisons"]
+    assert metrics["swaps"] >= done["total_swaps"]
+
+
+def test_metrics_counts():
+    assert SORTING_METRICS["insertion"]([1, 2, 3, 4])["comparisons"] == 3
+    assert SORTING_METRICS["bubble"]([4, 3, 2, 1])["swaps"] == 6
+    assert SORTING_METRICS["merge"]([2, 1])["writes"] == 2
+
+
+def test_metrics_large_input():
+    arr = list(range(20000, 0, -1))
+    assert SORTING_METRICS["heap"](arr)["array"] == sorted(arr)
+    assert SORTING_METRICS["quick"](list(range(3000)))["comparisons"] == 3000 * 2999 // 2
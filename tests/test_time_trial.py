@@ -0,0 +1,150 @@
+"""Unit tests for parallel time trials and worker deadlines."""
+
+import asyncio
+import gc
+import random
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.sorting_metrics import SORTING_METRICS
+from app.services.benchmark import autorange, benchmark, median_interval, peak_allocation, summarize, time_loops
+from app.services.executor import DeadlineExceeded, deadline
+from app.services.time_trial import (
+    fastest_is_significant, iter_time_trial, metrics_entry, rank_results, time_trial_entry,
+)
+
+client = TestClient(app)
+
+
+def test_deadline_interrupts_block():
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.05):
+            while True:
+                pass
+    assert time.perf_counter() - start < 1
+
+
+def test_time_trial_entry_respects_deadline():
+    with pytest.raises(DeadlineExceeded):
+        time_trial_entry("bubble", list(range(20000, 0, -1)), 0.05)
+
+
+def test_metrics_entry_respects_deadline():
+    with pytest.raises(DeadlineExceeded):
+        metrics_entry("bubble", list(range(20000, 0, -1)), 0.05)
+    assert metrics_entry("insertion", [3, 1, 2], 5)[1]["array"] == [1, 2, 3]
+
+
+def test_time_trial_skips_counting_sort_over_wide_ranges():
+    with pytest.raises(ValueError, match="value range"):
+        time_trial_entry("counting", [0, 10**9], 5)
+    results = client.post("/api/time-trial", json={"array": [0, 10**9, 7]}).json()["results"]
+    by_name = {r["algorithm"]: r for r in results}
+    assert "value range" in by_name["counting"]["error"]
+    assert by_name["merge"]["comparisons"] > 0
+
+
+def test_time_trial_entry_reports_counts():
+    result = time_trial_entry("insertion", [3, 1, 2], 5)
+    assert result["algorithm"] == "insertion"
+    assert result["total_steps"] > 0
+    assert result["comparisons"] == 3
+
+
+def test_parallel_time_trial_returns_every_algorithm():
+    async def collect():
+        return [r async for r in iter_time_trial([5, 3, 8, 1, 2], deadline_seconds=10)]
+
+    results = rank_results(asyncio.run(collect()))
+    assert {r["algorithm"] for r in results} == set(SORTING_METRICS)
+    assert all("execution_time_us" in r for r in results)
+    times = [r["execution_time_us"] for r in results]
+    assert times == sorted(times)
+
+
+def test_time_loops_disables_gc_while_timing():
+    seen = []
+    time_loops(lambda: seen.append(gc.isenabled()), 3)
+    assert seen == [False] * 3 and gc.isenabled()
+
+
+def test_autorange_reaches_min_time():
+    loops, elapsed = autorange(lambda: sum(range(100)), 0.005)
+    assert elapsed >= 0.005 and str(loops)[0] in "125"
+
+
+def test_summarize_and_median_interval():
+    samples = [10.0, 11.0, 9.0, 10.5, 30.0, 10.2, 9.8, 10.1, 9.9, 10.3]
+    stats = summarize(samples)
+    assert stats["median_us"] == 10.15 and stats["min_us"] == 9.0 and stats["max_us"] == 30.0
+    assert stats["ci95_us"] == list(median_interval(samples))
+    assert stats["ci95_us"][0] <= stats["median_us"] <= stats["ci95_us"][1]
+    assert stats["p95_us"] > stats["median_us"] and stats["stddev_us"] > 0
+
+
+def test_benchmark_entry_reports_stats():
+    result = time_trial_entry("insertion", [3, 1, 2], 5, mode="benchmark", repeat=5, warmup=2)
+    stats = result["stats"]
+    assert stats["samples"] == 5 and stats["warmup"] == 2 and stats["loops"] >= 1
+    assert result["execution_time_us"] == pytest.approx(stats["median_us"], abs=0.01)
+    assert result["comparisons"] == 3
+
+
+def test_benchmark_without_warmup_measures_cold(monkeypatch):
+    runs = []
+
+    def counting_insertion(arr, in_place=False):
+        runs.append(len(runs))
+        return {"comparisons": len(runs)}
+
+    monkeypatch.setitem(SORTING_METRICS, "insertion", counting_insertion)
+    stats, metrics = benchmark("insertion", [3, 1, 2], repeat=3, warmup=0)
+    # Three single-run samples, the first of them the very first run; the counting run comes last
+    assert stats["warmup"] == 0 and stats["loops"] == 1 and len(runs) == 4 and metrics["comparisons"] == 4
+
+    runs.clear()
+    stats, metrics = benchmark("insertion", [3, 1, 2], repeat=3, warmup=2, min_sample_seconds=0)
+    assert stats["warmup"] == 2 and metrics["comparisons"] == 1
+
+
+def test_fastest_is_significant():
+    fast = {"stats": {"ci95_us": [1.0, 2.0]}}
+    assert fastest_is_significant([fast, {"stats": {"ci95_us": [3.0, 4.0]}}]) is True
+    assert fastest_is_significant([fast, {"stats": {"ci95_us": [1.5, 4.0]}}]) is False
+    assert fastest_is_significant([fast, {"timed_out": True}]) is None
+
+
+def test_time_trial_api_benchmark_mode():
+    res = client.post("/api/time-trial", json={"array": [5, 3, 8, 1, 2], "mode": "benchmark", "repeat": 3})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["mode"] == "benchmark" and body["repeat"] == 3
+    assert isinstance(body["fastest_significant"], bool)
+    assert all(r["stats"]["samples"] == 3 for r in body["results"])
+    assert client.post("/api/time-trial", json={"array": [1], "mode": "fast"}).status_code == 400
+
+
+def test_peak_allocation_counts_transient_memory():
+    result, peak = peak_allocation(lambda: len(list(range(100_000))))
+    assert result == 100_000 and peak >= 100_000 * 8
+
+
+@pytest.mark.parametrize("algo", ["selection", "heap", "quick"])
+def test_in_place_sorts_report_no_input_copy(algo):
+    array = list(range(1000))
+    random.Random(3).shuffle(array)
+    # A copy of the input alone would be at least 8 bytes per element
+    assert time_trial_entry(algo, array, 5)["peak_bytes"] < 8 * len(array) // 4
+    assert time_trial_entry("merge", array, 5)["peak_bytes"] >= 8 * len(array) // 2
+
+
+def test_time_trial_entry_reports_peak_memory():
+    result = time_trial_entry("merge", list(range(200, 0, -1)), 5)
+    assert 0 < result["peak_bytes"] < result["trace_peak_bytes"]
+    # Past the trace-memory step limit only the algorithm itself is measured
+    result = time_trial_entry("bubble", list(range(400, 0, -1)), 5)
+    assert result["trace_peak_bytes"] is None and result["peak_bytes"] > 0 and result["total_steps"] > 0
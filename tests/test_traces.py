@@ -0,0 +1,76 @@
+"""Unit tests for trace sessions (store, paging and seek)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from app.algorithms.sorting import SORTING_REGISTRY
+from app.routes import traces
+from app.services.trace_store import TraceStore
+
+client = TestClient(app)
+
+
+def test_store_evicts_least_recently_used():
+    store = TraceStore(max_entries=2, max_steps=100, ttl_seconds=60)
+    a = store.put("sort", [{}])
+    b = store.put("sort", [{}])
+    store.get(a)
+    c = store.put("sort", [{}])
+    assert store.get(b) is None
+    assert store.get(a) is not None and store.get(c) is not None
+
+
+def test_store_step_budget():
+    store = TraceStore(max_entries=10, max_steps=5, ttl_seconds=60)
+    a = store.put("sort", [{}] * 3)
+    b = store.put("sort", [{}] * 3)
+    assert store.get(a) is None
+    assert store.get(b) is not None
+    with pytest.raises(ValueError):
+        store.put("sort", [{}] * 6)
+
+
+def test_store_ttl():
+    store = TraceStore(max_entries=10, max_steps=100, ttl_seconds=0)
+    trace_id = store.put("graph", [{}])
+    assert store.get(trace_id) is None
+
+
+def test_sort_session_paging_and_seek():
+    arr = [9, 4, 7, 1, 8, 2, 6, 3, 5]
+    full = SORTING_REGISTRY["quick"](arr)
+    resp = client.post("/api/sort", json={"array": arr, "algorithm": "quick", "trace_format": "delta", "session": True})
+    data = resp.json()
+    assert "steps" not in data
+    assert data["total_steps"] == len(full)
+
+    page = client.get(f"/api/traces/{data['trace_id']}/steps", params={"offset": 5, "limit": 4}).json()
+    assert len(page["steps"]) == 4
+    assert page["steps"][0]["array"] == full[5]["array"]
+
+    seek = client.get(f"/api/traces/{data['trace_id']}/seek", params={"frame": 7}).json()
+    assert seek["array"] == full[7]["array"]
+
+
+def test_graph_session():
+    graph = {"A": {"B": 1}, "B": {"A": 1}}
+    data = client.post("/api/graph-solve", json={"graph": graph, "algorithm": "bfs", "start": "A", "session": True}).json()
+    page = client.get(f"/api/traces/{data['trace_id']}/steps").json()
+    assert page["steps"][-1]["type"] == "done"
+    assert client.get("/api/traces/missing/steps").status_code == 404
+
+
+def test_session_rendering_runs_off_the_event_loop(monkeypatch):
+    offloaded = []
+    run_in_threadpool = traces.run_in_threadpool
+
+    async def recording(fn, *args):
+        offloaded.append(fn.__name__)
+        return await run_in_threadpool(fn, *args)
+
+    monkeypatch.setattr(traces, "run_in_threadpool", recording)
+    data = client.post("/api/sort", json={"array": [3, 1, 2], "algorithm": "bubble", "session": True}).json()
+    client.get(f"/api/traces/{data['trace_id']}/steps")
+    client.get(f"/api/traces/{data['trace_id']}/seek", params={"frame": 1})
+    assert offloaded == ["render_window", "render_frame"]